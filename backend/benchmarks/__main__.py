@@ -0,0 +1,61 @@
+"""
+Runs the benchmarks and writes the results as JSON, so results from different commits or data can be compared.
+
+Run with python -m benchmarks --output results.json
+Engine benchmarks call Game and Area directly, see benchmarks/engine.py.
+HTTP benchmarks load-test the FastAPI routes in the same process, see benchmarks/endpoints.py; skip them with --no-http.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import numpy as np
+from benchmarks import endpoints, engine
+
+def describe(snapshot):
+    """
+    Docstring for describe
+
+    :param snapshot: Snapshot object the benchmarks ran on.
+
+    Returns a dictionary of the size of the data, so a slower result can be told apart from more data.
+    """
+    return {
+        "version": snapshot.version,
+        "compiled": snapshot.tables is not None,
+        "areas": len(snapshot.alphabetical),
+        "rows": sum(len(area.pokemon) for area in snapshot.alphabetical.values()),
+        "pokedex": len(snapshot.links),
+        "families": snapshot.pokedex.family_count,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the encounter engine and the HTTP routes.")
+    parser.add_argument("--repeat", type=int, default=1000, help="Timed calls of every engine benchmark")
+    parser.add_argument("--cold-repeat", type=int, default=3, help="Loads of every cold load benchmark, 0 to skip them")
+    parser.add_argument("--requests", type=int, default=500, help="Requests of every HTTP benchmark")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8], help="Requests sent at the same time; every route is run at each level")
+    parser.add_argument("--no-http", action="store_true", help="Skip the HTTP benchmarks")
+    parser.add_argument("--output", default=None, help="File to write the JSON to, instead of printing it")
+    args = parser.parse_args()
+
+    import main as server # Loads the Snapshot, the same as the server
+    results = engine.run(server.snapshot, args.repeat, args.cold_repeat)
+    if not args.no_http:
+        results += endpoints.run(server, args.requests, args.concurrency)
+
+    report = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(), "cpu_count": os.cpu_count()},
+        "data": describe(server.snapshot),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as f1:
+            f1.write(text + "\n")
+        print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
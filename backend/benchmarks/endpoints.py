@@ -0,0 +1,98 @@
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from models.area import Area
+from benchmarks.engine import DAYPARTS, QUERIES, box_text
+from benchmarks.timing import summarize
+
+def load(client, name: str, method: str, path: str, bodies: list, requests: int, concurrency: int, params=None):
+    """
+    Docstring for load
+
+    :param client: FastAPI TestClient object, already started.
+    :param name: String object that identifies the benchmark.
+    :param method: String object, the HTTP method, such as "POST".
+    :param path: String object, the route, such as "/generate".
+    :param bodies: List of JSON bodies, sent in turn.
+    :param requests: Integer object, the number of requests.
+    :param concurrency: Integer object, the number of requests sent at the same time.
+    :param params: Dictionary of the arguments that describe the benchmark, or None.
+
+    Sends the requests from concurrency threads, and returns the dictionary of timing.summarize() with the count of every status code.
+    Requests go through the whole app in the same process (validation, the worker pool, and the response), without a network.
+    """
+    def send(index):
+        started = time.perf_counter_ns()
+        response = client.request(method, path, json=bodies[index % len(bodies)])
+        return time.perf_counter_ns() - started, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        responses = list(executor.map(send, range(requests)))
+    wall_time = time.perf_counter() - started
+
+    params = dict(params if params is not None else {}, concurrency=concurrency)
+    result = summarize(name, [duration for duration, status in responses], wall_time, params)
+    result["status_codes"] = {str(status): count for status, count in Counter(status for duration, status in responses).items()}
+    return result
+
+def check_generate(client, bodies: list):
+    """
+    Docstring for check_generate
+
+    :param client: FastAPI TestClient object, already started.
+    :param bodies: List of /generate JSON bodies.
+
+    Sends every body to /generate and to /generate/batch with n 1 and start 0, with the same seed, and raises ValueError if they give different Pokemon.
+    Draw 0 of a seed is the same draw in both routes, so a benchmark of either route measures the same work.
+    Encounter Power levels are cycled through, so the value of a draw that decides the Encounter Power is checked as well as the one that chooses the Pokemon.
+    """
+    for index, body in enumerate(bodies):
+        body = dict(body, seed=index, power=str(index % 4))
+        single = client.post("/generate", json=body).json()["pkmn_name"]
+        batch = client.post("/generate/batch", json=dict(body, n=1, start=0)).json()["pkmn_names"][0]
+        if single != batch:
+            raise ValueError(f"/generate gave {single} and /generate/batch gave {batch} for seed {index} in {body['area']} ({body['time']}).")
+
+def run(server, requests: int, concurrency_levels: list):
+    """
+    Docstring for run
+
+    :param server: The main module, whose app and Snapshot are used.
+    :param requests: Integer object, the number of requests of every benchmark.
+    :param concurrency_levels: List of Integers; every route is load-tested once at each level.
+
+    Load-tests the four routes used by the website: /generate, /distribution, /locate, and /subset.
+    Bodies cycle through every area and daypart, and through boxes of 0 and 15 Pokemon.
+    /distribution answers repeated bodies from its cache, so the cache statistics of the run are included with its results.
+    Before any route is timed, /generate and /generate/batch are checked to give the same Pokemon for a seed, see check_generate().
+    """
+    from fastapi.testclient import TestClient
+
+    box = box_text(server.snapshot, 15)
+    bodies = []
+    for area_name in Area.route_order():
+        for daypart in DAYPARTS:
+            for shared_text in ["", box]:
+                bodies.append({"game": "Scarlet", "area": area_name, "time": daypart, "pkmnType": "Normal", "power": "0", "dupes": "Yes", "sharedText": shared_text, "specificPkmn": False})
+    pkmn_names = [{"name": pkmn_name} for pkmn_name in sorted(server.snapshot.habitats)]
+    queries = [{"name": query} for query in QUERIES]
+
+    results = []
+    with TestClient(server.app) as client:
+        # Starts the worker pool, so the first benchmark does not include starting it
+        client.post("/generate", json=bodies[0])
+        check_generate(client, bodies)
+
+        for concurrency in concurrency_levels:
+            results.append(load(client, "http.generate", "POST", "/generate", bodies, requests, concurrency))
+
+            before = server.distribution_cache.stats()
+            result = load(client, "http.distribution", "POST", "/distribution", bodies, requests, concurrency)
+            after = server.distribution_cache.stats()
+            result["cache"] = {"hits": after["hits"] - before["hits"], "misses": after["misses"] - before["misses"]}
+            results.append(result)
+
+            results.append(load(client, "http.locate", "POST", "/locate", pkmn_names, requests, concurrency))
+            results.append(load(client, "http.subset", "POST", "/subset", queries, requests, concurrency))
+    return results
@@ -0,0 +1,90 @@
+import subprocess
+import sys
+from models.area import Area
+from models.game import Game
+from models.snapshot import Snapshot
+from benchmarks.timing import measure
+
+DAYPARTS = ["Dawn", "Day", "Dusk", "Night"]
+BOX_SIZES = [0, 15, 60, 150]
+QUERIES = ["a", "pi", "char", "ur", "saur", "on", "tauros", "mime"]
+
+def box_text(snapshot: Snapshot, size: int):
+    """
+    Docstring for box_text
+
+    :param snapshot: Snapshot object.
+    :param size: Integer object, the number of Pokemon in the box.
+
+    Returns the textbox contents of a box with size Pokemon, separated by ",".
+    The Pokemon are spread evenly over the ones that can be encountered, so the Dupes Clause removes Pokemon from most areas,
+    and the same size always gives the same box.
+    """
+    pkmn_names = sorted(snapshot.habitats)
+    if size > len(pkmn_names):
+        pkmn_names = sorted(snapshot.links)
+    step = len(pkmn_names) / size if size > 0 else 1
+    return ", ".join(pkmn_names[int(index * step)] for index in range(min(size, len(pkmn_names))))
+
+def cold_load(repeat: int):
+    """
+    Docstring for cold_load
+
+    :param repeat: Integer object, the number of loads of each kind.
+
+    Returns the results of loading the data from nothing:
+    - snapshot: Snapshot(), from the compiled tables if they are up to date (see compile_data.py), otherwise from the CSV files
+    - load_areas_csv: Area.load_areas() from the CSV files, the slowest part of loading without compiled tables
+    - game: Game() without a Snapshot, which loads its own
+    - process: a new Python process importing Game and creating one, which includes importing NumPy and every module
+    """
+    results = []
+    results.append(measure("engine.cold_load.snapshot", lambda index: Snapshot(), repeat))
+    results.append(measure("engine.cold_load.load_areas_csv", lambda index: Area.load_areas(), repeat))
+    results.append(measure("engine.cold_load.game", lambda index: Game("Scarlet"), repeat))
+    command = [sys.executable, "-c", "from models.game import Game; Game('Scarlet')"]
+    results.append(measure("engine.cold_load.process", lambda index: subprocess.run(command, check=True, stdout=subprocess.DEVNULL), repeat))
+    return results
+
+def run(snapshot: Snapshot, repeat: int, cold_repeat: int):
+    """
+    Docstring for run
+
+    :param snapshot: Snapshot object already loaded, shared by every benchmark except the cold loads.
+    :param repeat: Integer object, the number of timed calls of every warm benchmark.
+    :param cold_repeat: Integer object, the number of loads of every cold load benchmark. If 0, cold loads are skipped.
+
+    Returns a list of the results of every engine benchmark, see timing.summarize().
+    Calls cycle through every area and daypart, so the results are an average over the data rather than one area.
+    Each warm benchmark first makes one call per area and daypart without timing, so the caches it would always hit in a server are built.
+    """
+    results = cold_load(cold_repeat) if cold_repeat > 0 else []
+
+    areas = Area.route_order()
+    combinations = [(area_name, daypart) for area_name in areas for daypart in DAYPARTS]
+    warmup = len(combinations)
+    g = Game("Scarlet", snapshot)
+
+    for pkmn_type, power in [("Normal", 0), ("Water", 2)]:
+        params = {"pkmn_type": pkmn_type, "power": power}
+        results.append(measure("engine.generate", lambda index: g.generate(*combinations[index % warmup], pkmn_type, power, False, set(), False, index), repeat, warmup, params))
+        results.append(measure("engine.distribution", lambda index: g.distribution(*combinations[index % warmup], pkmn_type, power, False), repeat, warmup, params))
+
+    # With the Dupes Clause and a box, distributions are calculated instead of looked up, see Game.distribution()
+    g.box = [pkmn_name.strip() for pkmn_name in box_text(snapshot, 15).split(",")]
+    g.populate_dupes()
+    results.append(measure("engine.distribution", lambda index: g.distribution(*combinations[index % warmup], "Normal", 0, True), repeat, warmup, {"pkmn_type": "Normal", "power": 0, "box_size": 15}))
+
+    pkmn_names = sorted(snapshot.habitats)
+    results.append(measure("engine.locate", lambda index: g.locate(pkmn_names[index % len(pkmn_names)]), repeat))
+    results.append(measure("engine.pkmn_substring", lambda index: g.pkmn_substring(QUERIES[index % len(QUERIES)]), repeat, len(QUERIES)))
+
+    # A new Game for every request, the same as a worker process, see worker_pool.process_request()
+    for size in BOX_SIZES:
+        text = box_text(snapshot, size)
+        for request_type in ["generate", "distribution"]:
+            def request(index):
+                area_name, daypart = combinations[index % warmup]
+                return Game("Scarlet", snapshot).process_generate_distribution_request(request_type, text, area_name, daypart, "Normal", 0, "Yes", False, False, 1, index)
+            results.append(measure("engine.process_request", request, repeat, warmup, {"request_type": request_type, "box_size": size}))
+    return results
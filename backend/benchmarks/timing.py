@@ -0,0 +1,56 @@
+import statistics
+import time
+
+def summarize(name: str, durations: list, wall_time: float, params=None):
+    """
+    Docstring for summarize
+
+    :param name: String object that identifies the benchmark, such as "engine.generate".
+    :param durations: List of Integers, the time of every call in nanoseconds.
+    :param wall_time: Float object, the seconds from the first call starting to the last call finishing.
+    :param params: Dictionary of the arguments that describe the benchmark, such as the box size, or None.
+
+    Returns a dictionary that can be written as JSON. Times are in microseconds, and ops_per_second is calls over wall_time,
+    so calls that run at the same time (see endpoints.load()) count towards it together.
+    """
+    ordered = sorted(durations)
+    count = len(ordered)
+    def percentile(fraction):
+        return ordered[min(count - 1, int(fraction * count))] / 1000
+
+    return {
+        "name": name,
+        "params": params if params is not None else {},
+        "count": count,
+        "wall_seconds": wall_time,
+        "ops_per_second": count / wall_time if wall_time > 0 else None,
+        "mean_us": statistics.fmean(ordered) / 1000,
+        "median_us": statistics.median(ordered) / 1000,
+        "p95_us": percentile(0.95),
+        "p99_us": percentile(0.99),
+        "min_us": ordered[0] / 1000,
+        "max_us": ordered[-1] / 1000,
+    }
+
+def measure(name: str, function, repeat: int, warmup=0, params=None):
+    """
+    Docstring for measure
+
+    :param name: String object that identifies the benchmark.
+    :param function: Function that takes the Integer index of the call, so calls can use different arguments.
+    :param repeat: Integer object, the number of timed calls.
+    :param warmup: Integer object, the number of calls made before timing, so caches that every later call hits are already built.
+    :param params: Dictionary of the arguments that describe the benchmark, or None.
+
+    Calls function one after another, and returns the dictionary of summarize().
+    """
+    for index in range(warmup):
+        function(index)
+
+    durations = []
+    started = time.perf_counter()
+    for index in range(repeat):
+        call_started = time.perf_counter_ns()
+        function(index)
+        durations.append(time.perf_counter_ns() - call_started)
+    return summarize(name, durations, time.perf_counter() - started, params)
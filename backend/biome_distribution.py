@@ -1,6 +1,20 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from backend.modules.pixel_counter import count_colour_pixels as ccp
+import cv2
+import numpy as np
+import modules.pixel_counter as pc
 import modules.nc as nc
+from modules.spatial_index import SpatialIndex
+
+# Records the images every distribution CSV was counted from, see rebuild().
+MANIFEST_PATH = "data/distribution/manifest.json"
+# Increase when the way pixels are counted changes, so every area is counted again.
+MANIFEST_VERSION = 2
 
 class Area:
     """
@@ -34,8 +48,9 @@ class Area:
         Within an image file, purple pixels mark square area which the biome covers.
 
         For every area, rather than hard-coding which biomes will be loading, every area will check if it contains every biome.
-        If a biome exists and is not yet recorded, it is added to self.biome. If a biome does not exist, a counter is incremented by 1.
-        For every biome in self.biome, its respective image file is opened, the purple pixels are counted and that number is recorded and added to sum of total pixels.
+        The area's folder is listed once (see biome_images()), and every biome with an image file in it that is not yet recorded is added to self.biome.
+        The image files of those biomes are decoded once each and counted together, see pixel_counter.count_colour_pixels_many().
+        The purple pixels of every biome are recorded and added to sum of total pixels.
         
         If for an area no biomes are found, then there are no biome image files for the area.
         These are special cases, which within the base game are two areas:
@@ -43,37 +58,69 @@ class Area:
         - Great Crater of Paldea, a mysterious area where visual map data is not included (and datamined images of biome coverage are not publicly available)
         In these cases, there is no influence from biome size, and the calculated distribution is almost certainly different from what is true within the game.
         """
-        # For every biome, check if it exists in the region
-        image_folder = "data/image"
-        area_folder = f"{image_folder}/{self.image_name}"
-        biomes_list = ["Bamboo_Forest","Beach","Cave","Desert","Flower","Forest","Lake","Mine","Mountain",
-                       "Ocean","Olive","Prairie","Riverside","Rocky_Area","Ruins","Snowfield","Swamp","Town"]
-        missing_biome_count = 0
-        
-        for biome in biomes_list:
-            file_name = f"{self.image_name}_Map_{biome}.png"
-            file_path = f"{area_folder}/{file_name}"
-            # Test if the region exists, if yes, add biome to existing biomes in region, and count pixels.
-            try:
-                with open(file_path, 'r') as f:
-                    pass # Don't actually need to try reading anything; this is to check if the file exists
-                biome_name = biome.replace("_", " ")
-                if biome_name not in self.biomes:
-                    self.biomes.append(biome_name)
-                    b_pixels = ccp(file_path, self.target_colour_rgb)
-                    self.biome_pixels[biome_name] = b_pixels
-                    self.pixel_total += b_pixels
-            except FileNotFoundError:
-                missing_biome_count += 1
+        # For every biome, check if it exists in the region, and add the ones not yet recorded to existing biomes in region.
+        biome_images = self.biome_images()
+        new_biomes = []
+        file_paths = []
+        for biome_name, file_path in biome_images:
+            if biome_name not in self.biomes:
+                new_biomes.append(biome_name)
+                file_paths.append(file_path)
+
+        # Count pixels of every new biome, decoding every image once.
+        for biome_name, b_pixels in zip(new_biomes, pc.count_colour_pixels_many(file_paths, self.target_colour_rgb)):
+            self.biomes.append(biome_name)
+            self.biome_pixels[biome_name] = b_pixels
+            self.pixel_total += b_pixels
         
         # If none of the traditional biomes are present, create a special biome.
         # Only applies to Cabo Poco and Great Crater of Paldea.
-        if missing_biome_count == len(biomes_list):
+        if len(biome_images) == 0:
             biome_name = "Special"
             self.biomes.append(biome_name)
             self.biome_pixels[biome_name] = 100
             self.pixel_total += 100
 
+    def biome_images(self):
+        """
+        Docstring for biome_images
+        
+        :param self: Area object.
+
+        Returns a list of tuples of (biome name, image file path) for every biome that has an image file for this area, see count() for the file names.
+        The area's folder is listed once, instead of trying to open every possible biome image.
+        """
+        image_folder = "data/image"
+        area_folder = f"{image_folder}/{self.image_name}"
+        biomes_list = ["Bamboo_Forest","Beach","Cave","Desert","Flower","Forest","Lake","Mine","Mountain",
+                       "Ocean","Olive","Prairie","Riverside","Rocky_Area","Ruins","Snowfield","Swamp","Town"]
+
+        try:
+            with os.scandir(area_folder) as entries:
+                file_names = {entry.name for entry in entries if entry.is_file()}
+        except FileNotFoundError:
+            file_names = set()
+
+        return [(biome.replace("_", " "), f"{area_folder}/{self.image_name}_Map_{biome}.png") for biome in biomes_list if f"{self.image_name}_Map_{biome}.png" in file_names]
+
+    def input_hashes(self):
+        """
+        Docstring for input_hashes
+        
+        :param self: Area object.
+
+        Returns a dictionary of K: image file name, V: SHA-256 of its contents, for every biome image of this area, see biome_images().
+        The CSV of an area only has to be written again if this dictionary changes.
+        """
+        hashes = {}
+        for biome_name, file_path in self.biome_images():
+            digest = hashlib.sha256()
+            with open(file_path, "rb") as f1:
+                for block in iter(lambda: f1.read(1 << 20), b""):
+                    digest.update(block)
+            hashes[os.path.basename(file_path)] = digest.hexdigest()
+        return hashes
+
     def calculate_distribution(self):
         """
         Docstring for calculate_distribution
@@ -112,17 +159,167 @@ class Area:
                 line = f"{biome},{self.distribution[biome]}\n"
                 f1.write(line)
 
+    def spatial_index(self):
+        """
+        Docstring for spatial_index
+        
+        :param self: Area object.
+
+        Returns a SpatialIndex of where every biome is within this area, or None if the area has no biome images.
+
+        The biome images of an area show the same map, but each one is cropped and scaled on its own, so their pixels do not line up.
+        Every image is lined up by the box around its map (every pixel that is not the black background, see pixel_counter.content_box()):
+        the box is cut out, and scaled to the most common box size of the area if it differs, so (0, 0) is the top left corner of the map in every biome.
+        The index is in pixels of this box, not of the area's _Map.png image, which is drawn at another size and does not always show the same part of Paldea;
+        for example, Poco Path is indexed at 75x38, while its _Map.png is 225x165 and wider.
+        Images whose box has a different shape (more than 10% off in width / height) do not show the same map, and are left out with a warning;
+        for example, the Town image of Dalizapa Passage shows all of Paldea.
+        The purple pixels of every image are marked the same as count().
+        """
+        images = []
+        for biome_name, file_path in self.biome_images():
+            img_bgr = cv2.imread(file_path)
+            if img_bgr is None:
+                print(f"Error: Could not open or find the image at {file_path}")
+                continue
+            box = pc.content_box(img_bgr)
+            if box is not None:
+                images.append((biome_name, pc.colour_mask(img_bgr, self.target_colour_rgb), box))
+        if len(images) == 0:
+            return None
+
+        sizes = [(width, height) for biome_name, mask, (x, y, width, height) in images]
+        map_width, map_height = max(set(sizes), key=sizes.count)
+        masks = {}
+        for biome_name, mask, (x, y, width, height) in images:
+            if abs((width / height) / (map_width / map_height) - 1) > 0.1:
+                print(f"Warning: The {biome_name} image of {self.name} does not line up with its other images, and is left out of the spatial index.")
+                continue
+            cropped = mask[y:y+height, x:x+width]
+            if (width, height) != (map_width, map_height):
+                cropped = cv2.resize(cropped.astype(np.uint8), (map_width, map_height), interpolation=cv2.INTER_NEAREST) > 0
+            masks[biome_name] = cropped
+        return SpatialIndex.from_masks(masks)
+
+    def index_path(self):
+        """
+        Docstring for index_path
+        
+        :param self: Area object.
+
+        Returns the path of the spatial index file of this area, for example "data/spatial/alfornada_cavern.npz".
+        """
+        return f"data/spatial/{self.snake_case_name}.npz"
+
+    def write_spatial_index(self):
+        """
+        Docstring for write_spatial_index
+        
+        :param self: Area object.
+
+        Writes the spatial index of this area, see spatial_index(). Nothing is written for areas without biome images, such as Cabo Poco.
+        """
+        index = self.spatial_index()
+        if index is not None:
+            index.save(self.index_path())
+
     def run(self):
         """
         Docstring for run
         
         :param self: Area object.
 
-        Executes count, calculate_distribution, and csv methods for this area.
+        Executes count, calculate_distribution, csv, and write_spatial_index methods for this area.
         """
         self.count()
         self.calculate_distribution()
         self.csv()
+        self.write_spatial_index()
+
+def run_area(area: Area):
+    """
+    Docstring for run_area
+    
+    :param area: Area object that has not been counted yet.
+
+    Runs in a worker process of rebuild(). Counts the area and writes its CSV, and returns its name.
+    """
+    area.run()
+    return area.name
+
+def load_manifest(path=MANIFEST_PATH):
+    """
+    Docstring for load_manifest
+    
+    :param path: Path of the manifest file.
+
+    Returns the manifest written by save_manifest(), or an empty one if it does not exist, or was written for another way of counting pixels.
+    """
+    empty = {"version": MANIFEST_VERSION, "areas": {}}
+    try:
+        with open(path, "r") as f1:
+            manifest = json.load(f1)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return empty
+    if manifest.get("version") != MANIFEST_VERSION:
+        return empty
+    return manifest
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """
+    Docstring for save_manifest
+    
+    :param manifest: Dictionary with the format: {"version": MANIFEST_VERSION, "areas": {K: image name of an area, V: dictionary returned by Area.input_hashes()}}
+    :param path: Path of the manifest file.
+
+    The file is written next to the old one and then renamed over it, so an interrupted rebuild never leaves a partial manifest.
+    """
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as f1:
+        json.dump(manifest, f1, indent=2, sort_keys=True)
+        f1.write("\n")
+    os.replace(temporary_path, path)
+
+def rebuild(areas, processes=None, force=False):
+    """
+    Docstring for rebuild
+    
+    :param areas: List of Area objects that have not been counted yet.
+    :param processes: Integer object, the number of worker processes. If None, one per CPU core.
+    :param force: Boolean object; if True, every area is counted again, even if its images did not change.
+
+    Counts and writes the CSV and spatial index of every area whose images changed since the last rebuild, or whose files are missing, using a pool of processes.
+    Areas are compared by the SHA-256 of their images, which is kept in the manifest (see MANIFEST_PATH), so moving or touching an image does not count it again.
+    The manifest is only updated for areas that were written, so areas that failed are counted again next time.
+    Returns the list of names of the areas that were written.
+    """
+    manifest = load_manifest()
+    hashes = {area.image_name: area.input_hashes() for area in areas}
+    changed = [area for area in areas
+               if force
+               or manifest["areas"].get(area.image_name) != hashes[area.image_name]
+               or not os.path.exists(f"data/distribution/{area.snake_case_name}.csv")
+               or (len(hashes[area.image_name]) > 0 and not os.path.exists(area.index_path()))]
+
+    written = []
+    if len(changed) > 0:
+        context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+            futures = {executor.submit(run_area, area): area for area in changed}
+            for future in as_completed(futures):
+                area = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error: Could not rebuild {area.name}: {e}")
+                    continue
+                manifest["areas"][area.image_name] = hashes[area.image_name]
+                written.append(area.name)
+
+    # Areas that no longer exist are forgotten
+    manifest["areas"] = {image_name: manifest["areas"][image_name] for image_name in hashes if image_name in manifest["areas"]}
+    save_manifest(manifest)
+    return written
 
 list = []
 cabo_poco = Area(1, "Cabo Poco")
@@ -189,7 +386,13 @@ list.append(dalizapa_passage)
 list.append(pokemon_league)
 list.append(great_crater_of_paldea)
 
-"""
-for area in list:
-    area.run()
-"""
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Count the biome images of every area, and write the CSV files in data/distribution.")
+    parser.add_argument("--processes", type=int, default=None, help="Number of worker processes (default: one per CPU core)")
+    parser.add_argument("--force", action="store_true", help="Count every area, even if its images did not change")
+    args = parser.parse_args()
+
+    written = rebuild(list, args.processes, args.force)
+    print(f"Wrote {len(written)} of {len(list)} areas" + (f": {', '.join(written)}" if written else ""))
+    if written:
+        print("Run compile_data.py again if the compiled encounter tables are used.")
\ No newline at end of file
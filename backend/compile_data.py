@@ -0,0 +1,15 @@
+from models.area import Area
+from modules import encounter_tables as et
+
+"""
+Compiles data/probability_insert and data/distribution into a single binary file, data/compiled/encounters.bin.
+Snapshot objects memory-map this file at startup instead of parsing every CSV file.
+If a CSV file is edited after compiling, the compiled file is ignored until this is run again.
+
+Run with: python compile_data.py
+"""
+
+if __name__ == "__main__":
+    areas = Area.load_areas()
+    et.write_tables(et.DEFAULT_PATH, areas)
+    print(f"Compiled {len(areas)} areas into {et.DEFAULT_PATH}")
@@ -1,9 +1,30 @@
+import asyncio
+import json
+import os
+import signal
+import traceback
+import numpy as np
 import uvicorn
-from fastapi import FastAPI
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from models.area import Area as Area
+from models.box import Box as Box
+from models.box import BoxChanged as BoxChanged
+from models.box import BoxStore as BoxStore
 from models.game import Game as Game
+from models.pokedex import Pokedex as Pokedex
+from models.simulator import Simulator as Simulator
+from models.snapshot import Snapshot as Snapshot
+from modules.reloader import Reloader as Reloader
+from modules.response_cache import ResponseCache as ResponseCache
+from modules import rng as rng
+from modules import worker_pool as wp
 
 class Pokemon(BaseModel):
     name: str
@@ -43,8 +64,9 @@ class Distribution_Input(BaseModel):
     pkmnType: str
     power: str
     dupes: str
-    sharedText: str
+    sharedText: str = ""
     specificPkmn: bool
+    boxId: Optional[str] = None # If given, the stored Box is used instead of sharedText
 
 class Distribution(BaseModel):
     pkmn_name: str
@@ -54,6 +76,72 @@ class Distributions(BaseModel):
     location_name: str
     distributions: List[Distribution]
 
+class Cache_Stats(BaseModel):
+    size: int
+    max_size: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+class Readiness(BaseModel):
+    ready: bool # True if the data is loaded, the worker processes are started, and the pool has room for another request
+    version: int # Version of the data snapshot being served
+    pid: int # Server process that answered, as there can be several, see serve.py
+    pool_started: bool
+    accepting: bool # False while every worker is busy and the queue is full, so new requests get 503
+    reloading: bool # True while this process loads new data; the old data is served until it is loaded
+
+class Pool_Stats(BaseModel):
+    max_workers: int
+    max_queue: int
+    in_flight: int
+    rejected: int
+
+class Pokedex_Stats(BaseModel):
+    size: int
+    families: int
+    hits: int # Names found, in this server process and its worker processes
+    misses: int
+
+class Box_Input(BaseModel):
+    sharedText: str
+
+class Box_Update(BaseModel):
+    add: str = "" # Pokémon separated by ",", the same as sharedText
+    remove: str = ""
+
+class Box_Output(BaseModel):
+    boxId: str
+    etag: str
+    pkmn_names: List[str]
+
+def convert_box(box):
+    pkmn_names, dupes, etag = box.state()
+    return Box_Output(boxId=box.box_id, etag=etag, pkmn_names=pkmn_names)
+
+async def find_box(box_id: Optional[str]):
+    if box_id is None:
+        return None
+    # The store is read in another thread, so waiting on another process's write does not hold up the event loop
+    box = await asyncio.to_thread(boxes.get, snapshot.pokedex, box_id) # Made with the Pokedex being served, so boxes saved before the data was reloaded use the new family IDs
+    if box is None:
+        raise HTTPException(status_code=404, detail="Box not found.")
+    return box
+
+def distribution_key(dist_input: Distribution_Input, box):
+    # Normalized the same way Game cleans its inputs, so requests that differ only in case, whitespace, or box order share a key
+    dupes = dist_input.dupes == "Yes"
+    box_key = []
+    if dupes or dist_input.specificPkmn: # The box is ignored unless Dupes Clause or a specific subset is used
+        if box is not None:
+            box_key = "etag:" + box.state()[2]
+        else:
+            box_key = sorted({pkmn.strip().lower() for pkmn in dist_input.sharedText.split(",") if pkmn.strip() != ""})
+    return ResponseCache.key(dist_input.game.strip().lower().capitalize(), dist_input.area.strip().title(), dist_input.time.strip().title(),
+                             dist_input.pkmnType.strip().title(), int(dist_input.power), dupes, box_key, dist_input.specificPkmn)
+
 def str_to_distribution(pkmn_name: str, percentage: float):
     return Distribution(pkmn_name=pkmn_name, percentage=percentage)
 
@@ -72,24 +160,191 @@ class Generation_Input(BaseModel):
     pkmnType: str
     power: str
     dupes: str
-    sharedText: str
+    sharedText: str = ""
     specificPkmn: bool
+    boxId: Optional[str] = None # If given, the stored Box is used instead of sharedText
+    seed: Optional[int] = Field(default=None, ge=0, lt=rng.MAX_SEED) # If given, the same request generates the same Pokémon; otherwise a new seed is used
 
 class Generation_Output(BaseModel):
     area: str
     time: str
     pkmn_name: str
+    seed: int # Seed used, so the result can be reproduced
 
-class Test_Model(BaseModel):
-    string: str
+class Generation_Batch_Input(Generation_Input):
+    n: int = Field(gt=0, le=10000)
+    start: int = Field(default=0, ge=0) # Index of the first draw; draw i of a seed is the same in every batch that includes it
+    histogram: bool = False
 
-def convert_generation(old_generation: List):
-    return Generation_Output(area=old_generation[0],time=old_generation[1],pkmn_name=old_generation[2])
+class Generation_Count(BaseModel):
+    pkmn_name: str
+    count: int
 
+class Generation_Batch_Output(BaseModel):
+    area: str
+    time: str
+    pkmn_names: List[str] # Every generated Pokémon in order; empty if histogram was requested
+    counts: List[Generation_Count] # How many times each Pokémon was generated, from most to least; empty unless histogram was requested
+    seed: int
+    start: int
 
+class Simulation_Input(BaseModel):
+    game: str
+    time: str
+    dupes: str
+    sharedText: str = "" # Pokémon already owned when every run starts
+    boxId: Optional[str] = None
+    runs: int = Field(gt=0, le=10000000)
+    seed: Optional[int] = Field(default=None, ge=0, lt=rng.MAX_SEED) # If given, the same request simulates the same runs; otherwise a new seed is used
 
+class Simulation_Species(BaseModel):
+    pkmn_name: str
+    probability: float # Chance that the Pokémon is caught in a run
 
-app = FastAPI()
+class Simulation_Area(BaseModel):
+    area: str
+    expected_skips: float # Average dupes skipped in the area
+    no_encounter: float # Chance that nothing in the area can be caught
+
+class Simulation_Output(BaseModel):
+    runs: int # Runs simulated so far
+    done: bool
+    species: List[Simulation_Species]
+    type_coverage: Dict[str, float]
+    expected_types: float
+    expected_skips: float
+    areas: List[Simulation_Area]
+    seed: int # Seed used, so the simulation can be reproduced
+    error: Optional[str] = None # Set on the last line if the simulation stopped before every run was simulated
+
+def convert_simulation(summary: dict, done: bool, seed: int, error=None):
+    species = [Simulation_Species(pkmn_name=pkmn_name, probability=probability) for pkmn_name, probability in summary["species"]]
+    areas = [Simulation_Area(area=area, expected_skips=skips, no_encounter=no_encounter) for area, skips, no_encounter in summary["areas"]]
+    return Simulation_Output(runs=summary["runs"], done=done, species=species, type_coverage=summary["type_coverage"],
+                             expected_types=summary["expected_types"], expected_skips=summary["expected_skips"], areas=areas, seed=seed, error=error)
+
+class Route_Input(BaseModel):
+    game: str
+    time: str
+    areas: List[str] = Field(min_length=1, max_length=100) # Areas in the order they are visited
+    sharedText: str = "" # Pokémon already owned before the first area
+    boxId: Optional[str] = None
+    minProbability: float = Field(default=1e-9, ge=0, lt=1)
+    maxStates: int = Field(default=5000, gt=0, le=100000)
+
+class Route_Pokemon(BaseModel):
+    pkmn_name: str
+    probability: float
+
+class Route_Area(BaseModel):
+    area: str
+    encounters: List[Route_Pokemon] # Chance of catching each Pokémon in this area, accounting for every earlier capture
+    no_encounter: float # Chance that every Pokémon in the area is a dupe
+    expected_skips: float # Average dupes skipped in the area
+
+class Route_Output(BaseModel):
+    areas: List[Route_Area]
+    species: List[Route_Pokemon] # Chance of catching each Pokémon anywhere on the route
+    pruned: float # Chance dropped to bound the calculation; every probability is exact to within this
+    states: int
+
+def convert_route(result: dict):
+    areas = []
+    for area, encounters, no_encounter, expected_skips in result["areas"]:
+        encounters = [Route_Pokemon(pkmn_name=pkmn_name, probability=probability) for pkmn_name, probability in encounters]
+        areas.append(Route_Area(area=area, encounters=encounters, no_encounter=no_encounter, expected_skips=expected_skips))
+    species = [Route_Pokemon(pkmn_name=pkmn_name, probability=probability) for pkmn_name, probability in result["species"]]
+    return Route_Output(areas=areas, species=species, pruned=result["pruned"], states=result["states"])
+
+MAX_BIOME_COORDINATE = 65535 # Larger than any biome map, see Biome_Input
+
+class Biome_Input(BaseModel):
+    # Points are in pixels of the area's biome map: the map as drawn in its biome images, with the black border cut off,
+    # and scaled to the same size for every biome image of the area (see Area.spatial_index() in biome_distribution.py).
+    # It is usually smaller than the area's _Map.png image and is not lined up with it; its size is the width and height of Biome_Output.
+    area: str
+    x: int = Field(ge=0, le=MAX_BIOME_COORDINATE) # Column of the point, or of one corner of the rectangle (0 is the left edge)
+    y: int = Field(ge=0, le=MAX_BIOME_COORDINATE) # Row of the point, or of one corner of the rectangle (0 is the top edge)
+    radius: Optional[int] = Field(default=None, ge=0, le=MAX_BIOME_COORDINATE) # If given, the circle around (x, y)
+    x1: Optional[int] = Field(default=None, ge=0, le=MAX_BIOME_COORDINATE) # If given with y1 instead of radius, the rectangle from (x, y) to (x1, y1), corners included
+    y1: Optional[int] = Field(default=None, ge=0, le=MAX_BIOME_COORDINATE)
+
+class Biome_Weight(BaseModel):
+    biome: str
+    pixels: int
+    weight: float # Share of the counted pixels, the same as the biome percentages of a whole area
+
+class Biome_Output(BaseModel):
+    area: str
+    width: int # Size of the area's biome map that x and y are in (see Biome_Input), so regions can be chosen within it
+    height: int
+    pixels: int
+    biomes: List[Biome_Weight]
+
+class Test_Model(BaseModel):
+    string: str
+
+def convert_generation(old_generation: List, seed: int):
+    return Generation_Output(area=old_generation[0],time=old_generation[1],pkmn_name=old_generation[2],seed=seed)
+
+def convert_generation_batch(area: str, time: str, pkmn_names: List[str], histogram: bool, seed: int, start: int):
+    if not histogram:
+        return Generation_Batch_Output(area=area, time=time, pkmn_names=pkmn_names, counts=[], seed=seed, start=start)
+    counts = [Generation_Count(pkmn_name=pkmn_name, count=count) for pkmn_name, count in Counter(pkmn_names).most_common()]
+    return Generation_Batch_Output(area=area, time=time, pkmn_names=[], counts=counts, seed=seed, start=start)
+
+
+
+snapshot = Snapshot() # Held in server memory such that the data files are only read once; every request shares it through a lightweight Game
+wp.preload(snapshot) # Forked worker processes start with this snapshot instead of loading their own
+pool = wp.WorkerPool(int(os.environ["SV_POOL_WORKERS"]) if "SV_POOL_WORKERS" in os.environ else None,
+                     int(os.environ["SV_POOL_QUEUE"]) if "SV_POOL_QUEUE" in os.environ else None) # Generation and distribution run in these worker processes
+
+async def run_request(*args):
+    # Returns a tuple of (version of the data used, result), see worker_pool.versioned()
+    try:
+        return await pool.run(wp.versioned, wp.process_request, *args)
+    except wp.PoolFull:
+        raise HTTPException(status_code=503, detail="Server is busy, try again.", headers={"Retry-After": "1"})
+
+def data_version(response: Response, version: int):
+    # Every response calculated from the data says which version of it was used, as the data can be reloaded while the server runs
+    response.headers["X-Data-Version"] = str(version)
+
+def swap_snapshot(new_snapshot: Snapshot):
+    # Requests that already started keep the old snapshot (and the old worker processes), and every later request uses the new one
+    global snapshot
+    new_snapshot.pokedex.hits += snapshot.pokedex.hits # Counted since the server started, see /pokedex
+    new_snapshot.pokedex.misses += snapshot.pokedex.misses
+    snapshot = new_snapshot
+    Pokedex.shared_pokedex = new_snapshot.pokedex # Only replaced once the new snapshot is served, so a failed reload leaves it as it was
+    wp.preload(new_snapshot)
+    pool.restart()
+
+def box_state(box):
+    if box is None:
+        return None
+    pkmn_names, dupes, etag = box.state()
+    return (pkmn_names, dupes, dict(box.family_counts))
+
+reloader = Reloader(snapshot.version, interval=float(os.environ.get("SV_RELOAD_INTERVAL", "5"))) # Reloads the data when its files change; 0 turns reloading off
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    pool.start() # Forks the worker processes before the first request, see /ready
+    watcher = None
+    if reloader.interval > 0:
+        watcher = asyncio.create_task(reloader.watch(swap_snapshot))
+        try: # kill -HUP reloads at once, without waiting for the next check
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, lambda: asyncio.create_task(reloader.reload(swap_snapshot)))
+        except (AttributeError, NotImplementedError, RuntimeError):
+            pass # No SIGHUP on Windows, and signals can only be handled when the server runs in the main thread
+    yield
+    if watcher is not None:
+        watcher.cancel()
+    pool.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "https://localhost:5173", # origin for testing 
@@ -103,36 +358,232 @@ app.add_middleware(
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=["X-Data-Version"]
                    )
 
-
-game_file = ""
-base_scarlet = Game("Scarlet") # Held in server memory such that games are not recompiled every request, only copied
-base_violet = Game("Violet")   # Held in server memory such that games are not recompiled every request, only copied
 memory = {"s1" : [Pokemon(name="Bulbasaur")]}
+boxes = BoxStore(os.environ.get("SV_BOX_STORE", ":memory:")) # Boxes kept between requests, so a session can send its box ID instead of its whole box; serve.py shares one file between its processes
+distribution_cache = ResponseCache(max_size=1024, ttl=600.0, version=snapshot.version) # Repeated /distribution requests are answered without recalculating
 
 @app.get("/", response_model=Pokemons)
-def get_pokemons():
+async def get_pokemons():
     empty_pkmns = [Pokemon(name="Placeholder")]
     return Pokemons(pokemons=empty_pkmns)
 
 @app.post("/generate", response_model=Generation_Output)
-def generate(gen_input: Generation_Input):
-    g = Game(gen_input.game)
-    generated_pkmn = g.process_generate_distribution_request("generate",gen_input.sharedText, gen_input.area, gen_input.time, gen_input.pkmnType, int(gen_input.power), gen_input.dupes, gen_input.specificPkmn, False)
-    return convert_generation(generated_pkmn)
+async def generate(gen_input: Generation_Input, response: Response):
+    box = await find_box(gen_input.boxId)
+    seed = gen_input.seed if gen_input.seed is not None else rng.new_seed() # Chosen here, so it can be sent back
+    version, generated_pkmn = await run_request(gen_input.game, "generate", gen_input.sharedText, gen_input.area, gen_input.time, gen_input.pkmnType, int(gen_input.power), gen_input.dupes, gen_input.specificPkmn, 1, seed, box_state(box))
+    if generated_pkmn is False:
+        raise HTTPException(status_code=400, detail="Generate arguments invalid.")
+    data_version(response, version)
+    return convert_generation(generated_pkmn, seed)
+
+@app.post("/generate/batch", response_model=Generation_Batch_Output)
+async def generate_batch(gen_input: Generation_Batch_Input, response: Response):
+    box = await find_box(gen_input.boxId)
+    seed = gen_input.seed if gen_input.seed is not None else rng.new_seed()
+    version, generated_pkmns = await run_request(gen_input.game, "generate_many", gen_input.sharedText, gen_input.area, gen_input.time, gen_input.pkmnType, int(gen_input.power), gen_input.dupes, gen_input.specificPkmn, gen_input.n, seed, box_state(box), gen_input.start)
+    if generated_pkmns is False:
+        raise HTTPException(status_code=400, detail="Generate arguments invalid.")
+    data_version(response, version)
+    return convert_generation_batch(gen_input.area, gen_input.time, generated_pkmns, gen_input.histogram, seed, gen_input.start)
 
 @app.post("/distribution", response_model=Distributions)
-def distribution(dist_input: Distribution_Input):
-    g = Game(dist_input.game)
-    calculated_dist = g.process_generate_distribution_request("distribution",dist_input.sharedText, dist_input.area, dist_input.time, dist_input.pkmnType, int(dist_input.power), dist_input.dupes, dist_input.specificPkmn, False)
-    return Distributions(location_name=dist_input.area, distributions=convert_distributions(calculated_dist))
-
+async def distribution(dist_input: Distribution_Input, response: Response):
+    box = await find_box(dist_input.boxId)
+    distribution_cache.check_version(snapshot.version)
+    key = distribution_key(dist_input, box)
+    cached_distributions = distribution_cache.get(key)
+    if cached_distributions is not None:
+        data_version(response, distribution_cache.version)
+        return Distributions(location_name=dist_input.area, distributions=cached_distributions)
+
+    version, calculated_dist = await run_request(dist_input.game, "distribution", dist_input.sharedText, dist_input.area, dist_input.time, dist_input.pkmnType, int(dist_input.power), dist_input.dupes, dist_input.specificPkmn, 1, None, box_state(box))
+    if calculated_dist is False:
+        raise HTTPException(status_code=400, detail="Distribution arguments invalid.")
+    distributions = convert_distributions(calculated_dist)
+    if version == distribution_cache.version: # Not kept if the data was reloaded while it was calculated
+        distribution_cache.put(key, distributions)
+    data_version(response, version)
+    return Distributions(location_name=dist_input.area, distributions=distributions)
+
+SIMULATION_CHUNK_RUNS = 20000 # Runs simulated by a worker at once
+SIMULATION_UPDATES = 20 # Most progress lines streamed before the final one
+
+async def stream_simulation(simulator: Simulator, sim_input: Simulation_Input, box_dupes: int, version: int):
+    # Chunks are simulated by the worker pool in parallel, each with its own random stream; their counters are added up as they finish
+    # If the data is reloaded part way, no more chunks are started, and the last line has the runs simulated with the data the simulation started with
+    chunk_runs = [SIMULATION_CHUNK_RUNS] * (sim_input.runs // SIMULATION_CHUNK_RUNS)
+    if sim_input.runs % SIMULATION_CHUNK_RUNS != 0:
+        chunk_runs.append(sim_input.runs % SIMULATION_CHUNK_RUNS)
+    seeds = np.random.SeedSequence(sim_input.seed).spawn(len(chunk_runs))
+    update_every = max(1, len(chunk_runs) // SIMULATION_UPDATES)
+
+    # A chunk whose worker died is run once more by new workers; if it fails again, the simulation stops and the last line has the error
+    totals = simulator.new_totals()
+    waiting = list(range(len(chunk_runs))) # Chunks to start, in order
+    pending = {} # K: Task, V: chunk index
+    retried = set()
+    finished = 0
+    error = None
+    try:
+        while len(waiting) > 0 or len(pending) > 0:
+            while snapshot.version == version and error is None and len(waiting) > 0 and len(pending) < pool.max_workers:
+                chunk = waiting[0]
+                task = pool.submit(wp.simulate_chunk, simulator.game, sim_input.time, simulator.check_dupes, box_dupes, chunk_runs[chunk], seeds[chunk], version)
+                if task is None:
+                    break # Leave room for other requests, and wait for a chunk to finish
+                pending[task] = waiting.pop(0)
+            if len(pending) == 0:
+                if snapshot.version != version or error is not None:
+                    break
+                await asyncio.sleep(0.05)
+                continue
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                chunk = pending.pop(task)
+                try:
+                    counters = task.result()
+                except BrokenProcessPool:
+                    if chunk in retried:
+                        error = "A worker process stopped while simulating."
+                    else:
+                        retried.add(chunk)
+                        waiting.insert(0, chunk)
+                    continue
+                except Exception:
+                    traceback.print_exc()
+                    error = "Simulation failed."
+                    continue
+                if counters is not None: # None if a worker with reloaded data ran the chunk
+                    Simulator.merge(totals, counters)
+                finished += 1
+                if finished % update_every == 0 and finished < len(chunk_runs):
+                    yield convert_simulation(simulator.summary(totals), False, sim_input.seed).model_dump_json() + "\n"
+    finally:
+        for task in pending: # Stopped early, such as when the client went away, so the chunks still running are not needed
+            task.cancel()
+    yield convert_simulation(simulator.summary(totals), True, sim_input.seed, error).model_dump_json() + "\n"
+
+@app.post("/simulate")
+async def simulate(sim_input: Simulation_Input):
+    # Streams one JSON line (Simulation_Output) after every few chunks of runs, and a last one with done set to True
+    sim_input.game = sim_input.game.strip().lower().capitalize()
+    sim_input.time = sim_input.time.strip().title()
+    if sim_input.game not in ["Scarlet", "Violet"] or not Area.validate_daypart(sim_input.time):
+        raise HTTPException(status_code=400, detail="Simulation arguments invalid.")
+    if not pool.accepting():
+        raise HTTPException(status_code=503, detail="Server is busy, try again.", headers={"Retry-After": "1"})
+
+    box = await find_box(sim_input.boxId)
+    box_dupes = box.state()[1] if box is not None else snapshot.pokedex.family_bitset(Box.parse(snapshot.pokedex, sim_input.sharedText))
+    if sim_input.seed is None:
+        sim_input.seed = rng.new_seed() # Chosen here, so it can be sent back
+    simulator = Simulator(snapshot, sim_input.game, sim_input.time, sim_input.dupes == "Yes", box_dupes)
+    return StreamingResponse(stream_simulation(simulator, sim_input, box_dupes, snapshot.version), media_type="application/x-ndjson",
+                             headers={"X-Data-Version": str(snapshot.version)})
+
+@app.post("/route", response_model=Route_Output)
+async def route(route_input: Route_Input, response: Response):
+    # Exact chances of every encounter along the route under Dupes Clause, see models/route.py
+    game = route_input.game.strip().lower().capitalize()
+    daypart = route_input.time.strip().title()
+    area_names = [area_name.strip().title() for area_name in route_input.areas]
+    if game not in ["Scarlet", "Violet"] or not Area.validate_daypart(daypart) or not all(Area.validate_area(area_name) for area_name in area_names):
+        raise HTTPException(status_code=400, detail="Route arguments invalid.")
+
+    box = await find_box(route_input.boxId)
+    box_dupes = box.state()[1] if box is not None else snapshot.pokedex.family_bitset(Box.parse(snapshot.pokedex, route_input.sharedText))
+    try:
+        version, result = await pool.run(wp.versioned, wp.route_probabilities, game, daypart, area_names, box_dupes, route_input.minProbability, route_input.maxStates)
+    except wp.PoolFull:
+        raise HTTPException(status_code=503, detail="Server is busy, try again.", headers={"Retry-After": "1"})
+    data_version(response, version)
+    return convert_route(result)
+
+@app.post("/biomes", response_model=Biome_Output)
+async def biomes(biome_input: Biome_Input, response: Response):
+    # Biome weights of part of an area, answered from its spatial index, see modules/spatial_index.py
+    area_name = biome_input.area.strip().title()
+    if not Area.validate_area(area_name):
+        raise HTTPException(status_code=400, detail="Biome arguments invalid.")
+    index = snapshot.spatial.get(area_name)
+    if index is None:
+        raise HTTPException(status_code=404, detail="This area has no biome map.")
+
+    if biome_input.radius is not None:
+        counts = index.circle(biome_input.x, biome_input.y, biome_input.radius)
+    elif biome_input.x1 is not None and biome_input.y1 is not None:
+        counts = index.rectangle(biome_input.x, biome_input.y, biome_input.x1, biome_input.y1)
+    else:
+        raise HTTPException(status_code=400, detail="Either radius, or x1 and y1, is required.")
+    weights = [Biome_Weight(biome=biome, pixels=pixels, weight=weight) for biome, pixels, weight in index.weights(counts)]
+    data_version(response, snapshot.version)
+    return Biome_Output(area=area_name, width=index.width, height=index.height, pixels=int(counts.sum()), biomes=weights)
+
+@app.get("/distribution/cache", response_model=Cache_Stats)
+async def distribution_cache_stats():
+    return Cache_Stats(**distribution_cache.stats())
+
+@app.get("/ready", response_model=Readiness)
+async def ready(response: Response):
+    pool_started = pool.executor is not None
+    accepting = pool.accepting()
+    is_ready = len(snapshot.alphabetical) > 0 and pool_started and accepting
+    if not is_ready:
+        response.status_code = 503
+    return Readiness(ready=is_ready, version=snapshot.version, pid=os.getpid(), pool_started=pool_started, accepting=accepting, reloading=reloader.lock.locked())
+
+@app.get("/pool", response_model=Pool_Stats)
+async def pool_stats():
+    return Pool_Stats(**pool.stats())
+
+@app.get("/pokedex", response_model=Pokedex_Stats)
+async def pokedex_stats():
+    # Lookups in this process (such as parsing a box) are counted by its own Pokedex, and lookups in the worker processes by the pool
+    pokedex = snapshot.pokedex.stats()
+    return Pokedex_Stats(size=pokedex["size"], families=pokedex["families"], hits=pokedex["hits"] + pool.pokedex_hits, misses=pokedex["misses"] + pool.pokedex_misses)
+
+
+@app.post("/box", response_model=Box_Output)
+async def create_box(box_input: Box_Input, response: Response):
+    box = await asyncio.to_thread(boxes.create, snapshot.pokedex, box_input.sharedText)
+    box_output = convert_box(box)
+    response.headers["ETag"] = box_output.etag
+    return box_output
+
+@app.get("/box/{box_id}", response_model=Box_Output)
+async def get_box(box_id: str, response: Response):
+    box_output = convert_box(await find_box(box_id))
+    response.headers["ETag"] = box_output.etag
+    return box_output
+
+@app.patch("/box/{box_id}", response_model=Box_Output)
+async def update_box(box_id: str, box_update: Box_Update, response: Response, if_match: Optional[str] = Header(default=None)):
+    try:
+        box = await asyncio.to_thread(boxes.update, snapshot.pokedex, box_id, box_update.remove, box_update.add, if_match)
+    except BoxChanged: # The box was changed by another request since the client last saw it
+        raise HTTPException(status_code=412, detail="Box has changed.")
+    if box is None:
+        raise HTTPException(status_code=404, detail="Box not found.")
+    box_output = convert_box(box)
+    response.headers["ETag"] = box_output.etag
+    return box_output
+
+@app.delete("/box/{box_id}")
+async def delete_box(box_id: str):
+    if not await asyncio.to_thread(boxes.delete, box_id):
+        raise HTTPException(status_code=404, detail="Box not found.")
+    return {"deleted": box_id}
 
 @app.post("/locate", response_model=Locations)
-def locate_pokemon(pokemon: Pokemon):
-    g = Game("Scarlet") # Does not check for dupes or version exclusives, just need this to initialize a game
+async def locate_pokemon(pokemon: Pokemon, response: Response):
+    data_version(response, snapshot.version)
+    g = Game("Scarlet", snapshot) # Does not check for dupes or version exclusives, just need this to initialize a game
     habitats = g.locate(pokemon.name, False) # habitats[last index] = Pokémon name
     
     real_pkmn_name = pokemon.name.title()
@@ -143,9 +594,10 @@ def locate_pokemon(pokemon: Pokemon):
     return Locations(pkmn_name=real_pkmn_name, locations=convert_locations(habitats))
 
 @app.post("/subset", response_model=Pokemons)
-def pkmn_substring(pokemon: Pokemon):
-    g = Game("Scarlet") # Does not check for dupes or version exclusives, just need this to initialize a game
-    possible_matches = g.pkmn_substring(pokemon.name) # habitats[last index] = Pokémon name
+async def pkmn_substring(pokemon: Pokemon, response: Response, limit: Optional[int] = Query(default=None, gt=0)):
+    data_version(response, snapshot.version)
+    g = Game("Scarlet", snapshot) # Does not check for dupes or version exclusives, just need this to initialize a game
+    possible_matches = g.pkmn_substring(pokemon.name, limit) # Names starting with pokemon.name are listed first
     returnable_list = []
     for pkmn in possible_matches:
         returnable_list.append(Pokemon(name=pkmn))
@@ -156,7 +608,10 @@ Testing
     Run backend with ./main.py
     Run frontend with npm run dev
 Production
-    Run backend with python .\main.py
+    Compile data with python .\compile_data.py (optional; must be rerun after editing data CSV files)
+    Data files are reloaded without restarting when they change (checked every SV_RELOAD_INTERVAL seconds, default 5, 0 turns it off), or at once with kill -HUP
+    Run backend with python .\serve.py to load the data once and fork several server processes (SV_WORKERS sets how many), or python .\main.py for a single process (SV_POOL_WORKERS and SV_POOL_QUEUE set the worker processes and queue depth; defaults are one worker per core and two queued requests per worker)
+    Boxes are kept in memory, or in the SQLite file SV_BOX_STORE if it is set; serve.py always uses a file, so every server process has the same boxes
     Deploy frontend with npm run build
 """
 # sample change
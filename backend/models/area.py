@@ -1,36 +1,75 @@
 import random
+import numpy as np
 from modules import nc as nc
+from modules import encounter_tables as et
+from modules.alias import AliasCache, AliasTable
+from models.pokedex import Pokedex
+
+class Wild:
+    def __init__(self, name: str, percentage: float, truncated_percentage: float):
+        """
+        Docstring for __init__
+        
+        :param self: Wild object.
+        :param name: String value representing Pokémon identifier, such as "Dugtrio_Ground".
+        :param percentage: Float value representing percentage chance that a Pokémon could be chosen, from 0.0 to 1.0.
+        :param truncated_percentage: Float value of percentage as a percent truncated to 2 decimal places, such as 15.75.
+
+        Returned by Area.distribution().
+        """
+        self.name = name
+        self.percentage = percentage
+        self.truncated_percentage = truncated_percentage
 
 class Area:
-    def __init__(self, name):
+    # Areas are loaded once per Snapshot and never gain attributes afterwards, so slots keep every worker's copy small.
+    __slots__ = ("name", "snake_case_name", "pokemon", "rows", "types", "weights", "biome_multipliers", "alias_tables", "version_masks", "type_masks", "families", "pokedex")
+
+    def __init__(self, name, tables=None, pokedex=None):
         """
         Docstring for __init__
         
         :param self: Area object.
         :param name: String representation of the area name with format: "Alfornada Cavern".
+        :param tables: EncounterTables object holding compiled data. If None, the area is loaded from the CSV files instead.
+        :param pokedex: Pokedex object used to find the family of every Pokemon, typically Snapshot.pokedex. If None, the shared Pokedex is used, see Pokedex.shared().
 
         The name will be standardized such that as long as the name input are words separated by a space, it will become format "Alfornada Cavern".
         snake_case_name will be of format "alfornada cavern".
 
         pokemon is list of Strings representing Pokemon present in the area.
+        rows is a dictionary with the format: K: lowercase identifier, V: Integer row of that Pokemon in pokemon, types, and weights.
+        types is a NumPy vector with the Types of every Pokemon packed as a bitmask, see encounter_tables.type_mask().
 
-        The dayparts (dawn, day, dusk, and night) are dictionaries that have the format: K: Pokemon name as str, V: float.
-        -  values within the daypart dictionaries are float values such as 11.7306, calculated by an integer value multiplied by biome_multiplier.
+        weights is a NumPy matrix with one row per Pokemon in pokemon and one column per daypart (Dawn, Day, Dusk, Night).
+        -  values within weights are float values such as 11.7306, calculated by an integer value multiplied by biome_multiplier.
         - For example with daypart value calculation: (50 * 0.234612) = 11.7306.
         biome_multipliers is a dictionary that has the format: K: biome name as str, V: float.
         - The values in biome_multipliers represent the amount of percentage that a certain biome covers in comparison to all covered biome square area.
+        alias_tables holds the AliasTable objects used by generate(), keyed by the filters they were built with.
+        version_masks and type_masks are boolean vectors over the rows of weights, keyed by game version and by Type.
+        families is a NumPy vector with the family ID of every row of weights, see Pokedex.load_families(). Pokemon without a family get Pokedex.family_count.
+        Family IDs are only comparable within one Pokedex, so an area keeps the one it was loaded with, and dupes given to it must come from the same one.
         """
         self.name = nc.standard(name)
         self.snake_case_name = nc.snake_case(name)
         self.pokemon = []
-        self.dawn = {}
-        self.day = {}
-        self.dusk = {}
-        self.night = {}
+        self.rows = {}
+        self.types = None
+        self.weights = None
         self.biome_multipliers = {}
-
-        self.load_biome_multipliers()
-        self.load_inserts()
+        self.alias_tables = AliasCache()
+        self.version_masks = {}
+        self.type_masks = {}
+        self.families = None
+        self.pokedex = pokedex if pokedex is not None else Pokedex.shared()
+
+        if tables is not None:
+            self.load_compiled(tables)
+        else:
+            self.load_biome_multipliers()
+            self.load_inserts()
+            self.build_arrays()
 
     def load_biome_multipliers(self):
         """
@@ -73,7 +112,8 @@ class Area:
 
         Biome is used to return the biome_multiplier value, a float ranging from 0.0 to 1.0, representing percentage that a certain biome covers in comparison to all covered biome square area within an Area.
         The integer values marked by Dawn, Day, etc., are multiplied by biome_multiplier, for example (20 * 1.0 = 20.0).
-        Identifier is also as a key value in daypart dictionaries such as dawn["Dugtrio_Ground"] = float value.
+        If the identifier already has a row (the Pokemon appears in more than one biome), the values are added to that row.
+        While the area is loading, weights is a list of [Dawn, Day, Dusk, Night] rows and types is a list of Integers; build_arrays() turns them into NumPy arrays.
         """
 
         line = insert_string.split(",")
@@ -94,18 +134,17 @@ class Area:
         # identifier will end up looking something like: Dugtrio_Ground
         identifier = f"{name}_{type_string}"
 
-        
         if self.find_key(identifier) == False:
+            self.rows[identifier.lower()] = len(self.pokemon)
             self.pokemon.append(identifier)
-            self.dawn[identifier] = dawn
-            self.day[identifier] = day
-            self.dusk[identifier] = dusk
-            self.night[identifier] = night
+            self.types.append(et.type_mask([type1, type2]))
+            self.weights.append([dawn, day, dusk, night])
         else:
-            self.dawn[identifier] = self.dawn[identifier] + dawn
-            self.day[identifier] = self.day[identifier] + day
-            self.dusk[identifier] = self.dusk[identifier] + dusk
-            self.night[identifier] = self.night[identifier] + night
+            row = self.weights[self.rows[identifier.lower()]]
+            row[0] = row[0] + dawn
+            row[1] = row[1] + day
+            row[2] = row[2] + dusk
+            row[3] = row[3] + night
 
     def load_inserts(self):
         """
@@ -115,17 +154,41 @@ class Area:
         
         This function will open a CSV file with headers: "Name", "Type1", "Type2", "Biome", "Dawn", "Day", "Dusk", and "Night".
         Every line will be read, and passed to the parse_insert() function.
+        Rows are gathered in lists, then build_arrays() is called once every line has been read.
         """
         file_path = f"data/probability_insert/{self.snake_case_name}.csv"
         lines = ""
         with open(file_path, 'r') as f:
             lines = f.readlines()
 
+        self.types = []
+        self.weights = []
         for x in range(len(lines)-1):
             line = lines[x+1]
             line = line[:len(line)-1]
             self.parse_insert(line)
 
+    def load_compiled(self, tables):
+        """
+        Docstring for load_compiled
+        
+        :param self: Area object.
+        :param tables: EncounterTables object, see modules/encounter_tables.py.
+
+        Loads the same values as load_biome_multipliers() and load_inserts(), but from the compiled encounter tables.
+        The identifiers are already interned and the biome multipliers already applied, so no text is parsed.
+        """
+        count, offset, biome_multipliers = tables.areas[self.name]
+        ids, masks, weights = tables.rows(self.name)
+        self.biome_multipliers = dict(biome_multipliers)
+        self.pokemon = [tables.identifiers[id] for id in ids]
+        self.rows = {identifier.lower(): row for row, identifier in enumerate(self.pokemon)}
+        self.types = np.frombuffer(masks, dtype=np.uint32)
+
+        # The compiled weights are stored one daypart after another, so the transposed view has one row per Pokemon without copying.
+        self.weights = np.frombuffer(weights, dtype=np.float64).reshape(4, count).T
+        self.build_masks()
+
     def find_key(self, pkmn_to_check):
         """
         Docstring for find_key
@@ -134,23 +197,19 @@ class Area:
         :param pkmn_to_check: String representing the Pokemon that is being checked if it already exists.
 
         This function will check if this self.pokemon being inquired has already been recorded in this area.
-        This function is used because dictionaries are used in the case of sum + addend.
-        Dictionaries will throw an error in the case above if the key does not already exist.
-        Hence, the need for this function.
+        This function is used because a Pokemon that is already recorded has its values added to its existing row (sum + addend).
+        The rows dictionary is checked instead of every recorded Pokemon, so loading an area is linear in its number of lines.
         """
-        # Compare the Pokemon to be checked to every Pokemon recorded in the area
-        # Return whether or not the Pokemon was found
         # Names are compared in lowercase in case of any strange case input errors. 
-        found = any(pkmn_to_check.lower() == recorded_pkmn.lower() for recorded_pkmn in self.pokemon)
-        return found
+        return pkmn_to_check.lower() in self.rows
     
     def find_dupe(self, dupes, pkmn_to_check, rule_enabled):
         """
         Docstring for find_dupe
         
         :param self: Area object.
-        :param dupes: Set of Strings representing Pokemon in the form "Name_Typestring" such as "Pikachu_Electric" or "Charizard_Fire_Flying". Typically, argument will be "dupes" set recorded by Game object.
-        :param pkmn_to_check: String representing the Pokemon that is being checked if it already exists.
+        :param dupes: Integer bitset of the family IDs of captured Pokemon, see Pokedex.family_bitset(). Typically, argument will be "dupes" recorded by Game object.
+        :param pkmn_to_check: String representing the Pokemon that is being checked if it already exists, such as "Pikachu".
         :param rule_enabled: Boolean that signifies if the function will perform any operations. 
 
         "Dupe" is short for "duplication", and is in reference to a Pokemon (or evolutionary related Pokemon) that you already have CAPTURED before.
@@ -174,12 +233,14 @@ class Area:
         if rule_enabled == False:
             return False
 
-        # Compare the Pokemon to be checked to every Pokemon in the dupes list
-        # Return whether or not the Pokemon is a dupe
-        # Names are compared in lowercase in case of any strange case input errors.
-        return any(pkmn_to_check.lower() == dupe.lower() for dupe in dupes)
+        # A Pokemon is a dupe if the bit of its family is set
+        # Pokemon without a family can never be dupes
+        family = self.pokedex.family_id(pkmn_to_check)
+        if family is None:
+            return False
+        return (dupes >> family) & 1 == 1
            
-    def generate(self, game: str, daypart: str, type: str , encounter_power: int, dupes: set, check_dupes: bool, specific_pkmn: set, print_boolean: bool):
+    def generate(self, game: str, daypart: str, type: str , encounter_power: int, dupes: int, check_dupes: bool, specific_pkmn: set, print_boolean: bool, rng=random):
         """
         Docstring for generate
         
@@ -188,103 +249,163 @@ class Area:
         :param daypart: Precleaned string object that represents the daypart, possible values are: "Dawn", "Day", "Dusk", and "Night".
         :param type: String object that represents a Pokemon Type, possible values are "Grass", "Water", etc.
         :param encounter_power: Integer object ranging from 0, 1, 2, or 3; represents an Encounter Power which increases likelihood of a Pokemon of a specific Type (Water-type Pokemon, etc.).
-        :param dupes: Set object storing String representations of Pokemon names; typically Game.dupes object. Set contains Pokemon that are considered "duplicates" and should be excluded, see Area.find_dupe(). 
+        :param dupes: Integer bitset of family IDs; typically Game.dupes object. Pokemon whose family bit is set are considered "duplicates" and should be excluded, see Area.find_dupe(). 
         :param check_dupes: Boolean flag that represents whether or not to exclude duplicate Pokemon.
         :param specific_pkmn: Set object that if greater than one signifies that instead of calculating for all Pokemon in an area, only calculate for the ones in the set. Ignores check_dupes if non-empty set.
         :param print_boolean: Boolean object that checks whether or not to print.
+        :param rng: Object with a random() method, such as the NumPy Generator of the request (see modules/rng.py) or the random module.
         
 
-        This function is only meant to be used within the Game.distribution() function.
+        This function is only meant to be used within the Game.generate() function.
+        Exactly two random values are used, in this order: one for the Encounter Power, and one to sample the alias table.
 
         This function will do the following:
         1) Select daypart based on time value.
-        2) Check if type value and power value are valid, if so, set multiplier. multiplier increases the chance of specific Type Pokemon of appearing, and decreases chance of other Type Pokemon of appearing.
-        3) Filter out Pokemon in the daypart based on Dupes Clause, version exclusivity, and Encounter Power; and create number ranges that will consider a Pokemon "chosen" or "encountered".
-        4) Generate a random value, and check which Pokemon was "chosen"/"encountered"
+        2) Check if the Encounter Power is activated, if so, only Pokemon of the specific Type can be chosen.
+        3) Find the alias table for the Pokemon left after filtering by Dupes Clause, version exclusivity, and Encounter Power; it is only built if these filters have not been seen recently, see build_alias_table().
+        4) Sample the alias table to choose which Pokemon was "encountered".
         """
-        # Short lived class for the purpose of this function.
-        class Range:
-            def __init__(self, name, lower, upper):
-                self.name = name
-                self.lower = lower
-                self.upper = upper
-
-            def enclosed(self, number):
-                return (self.lower <= number and number <= self.upper)             
-
-
         # Select a day part
-        daypart_selected = {}
-        if daypart == "Dawn":
-            daypart_selected = self.dawn
-        elif daypart == "Day":
-            daypart_selected = self.day
-        elif daypart == "Dusk":
-            daypart_selected = self.dusk
-        elif daypart == "Night":
-            daypart_selected = self.night
+        daypart_index = ["Dawn", "Day", "Dusk", "Night"].index(daypart)
+        daypart_selected = self.weights[:, daypart_index]
         
         # Use random number generator to decide if Encounter Power is activated
-        encounter_power_activated = Area.activate_encounter_power(encounter_power)
+        encounter_power_activated = Area.activate_encounter_power(encounter_power, rng)
+        forced_type = type if encounter_power_activated else None
+
+        table = self.find_alias_table(game, daypart, daypart_selected, forced_type, dupes, check_dupes, specific_pkmn)
+
+        # If no Pokémon are eligible due to a combination of Dupes Clause and Encounter Power for example, return that for the Area, Daypart, no Pokémon were selected.
+        if table is None:
+            return [self.name, daypart, "None"]
         
-        sum = 0.0
-        pkmn_keys = daypart_selected.keys() # Keys are possible wild Pokemon present in the daypart selected.
-        ranges = []
+        # Otherwise, generate a Pokémon
+        pkmn_name = table.sample(rng).split("_")[0]
+        if print_boolean:
+            print(f"{self.name} ({daypart}): {pkmn_name}")
+        return [self.name, daypart, pkmn_name]
 
-        # Normal operations, do not calculate for specific Pokemon only 
-        if len(specific_pkmn) == 0:
-            for key in pkmn_keys:
-                is_dupe = self.find_dupe(dupes, key.split("_")[0], check_dupes) # Boolean
-                correct_version_exclusive = Area.validate_compatible_version(game, key) # Boolean
-                correct_type = (key.find(type) != -1) # Boolean
+    def find_alias_table(self, game: str, daypart: str, daypart_selected, forced_type, dupes: int, check_dupes: bool, specific_pkmn: set):
+        """
+        Docstring for find_alias_table
 
-                # Check if Pokémon is not considered a duplicate, and that the Pokémon is compatible with the game version; if not, continue to next Pokémon
-                if not (not is_dupe and correct_version_exclusive):
-                    continue
+        :param self: Area object.
+        :param game: String object representing game version, possible values are: "Scarlet" or "Violet"
+        :param daypart: Precleaned string object that represents the daypart, possible values are: "Dawn", "Day", "Dusk", and "Night".
+        :param daypart_selected: Column of self.weights for daypart.
+        :param forced_type: String object that represents the Pokemon Type forced by an activated Encounter Power, or None if no Encounter Power was activated.
+        :param dupes: Integer bitset of family IDs, see Area.find_dupe().
+        :param check_dupes: Boolean flag that represents whether or not to exclude duplicate Pokemon.
+        :param specific_pkmn: Set object that if non-empty, only the Pokemon in the set are included. Ignores check_dupes if non-empty set.
 
-                # Check if an Encounter Power was activated, and if the Pokémon is not of the specified type; if so, continue to next Pokémon
-                if encounter_power_activated and not correct_type: # Second filter
-                    continue
+        Returns the AliasTable of these filters from self.alias_tables, building it if these filters have not been seen recently, or None if no Pokemon is eligible.
+        Used by generate() and generate_many(), so a draw chooses the same Pokemon in both.
+        """
+        # The alias table only depends on these filters. Dupes are ignored if the rule is disabled, or if a specific subset is used.
+        dupes_key = dupes if (check_dupes == True and len(specific_pkmn) == 0) else None
+        key = (game, daypart, forced_type, dupes_key, frozenset(specific_pkmn))
+        return self.alias_tables.get(key, lambda: self.build_alias_table(game, daypart_selected, forced_type, dupes, check_dupes, specific_pkmn))
 
-                # If those filters are passed, create ranges with bounds like: [(0, 15.7563), (15.7563, 26.0), etc.]
-                ranges.append(Range(key, sum, sum + daypart_selected[key])) 
-                sum = sum + daypart_selected[key]
+    def build_alias_table(self, game: str, daypart_selected: dict, forced_type, dupes: int, check_dupes: bool, specific_pkmn: set):
+        """
+        Docstring for build_alias_table
         
+        :param self: Area object.
+        :param game: String object representing game version, possible values are: "Scarlet" or "Violet"
+        :param daypart_selected: Column of self.weights for the selected daypart.
+        :param forced_type: String object that represents the Pokemon Type forced by an activated Encounter Power, or None if no Encounter Power was activated.
+        :param dupes: Integer bitset of family IDs, see Area.find_dupe().
+        :param check_dupes: Boolean flag that represents whether or not to exclude duplicate Pokemon.
+        :param specific_pkmn: Set object that if non-empty, only the Pokemon in the set are included. Ignores check_dupes if non-empty set.
+
+        This function is only meant to be used within the find_alias_table() function.
+        Returns an AliasTable of the Pokemon that pass the filters, or None if no Pokemon with a weight above 0 passes them.
+        """
+        allowed = self.eligible_mask(game, daypart_selected, forced_type, dupes, check_dupes, specific_pkmn)
+        names = [key for key, is_allowed in zip(self.pokemon, allowed) if is_allowed]
+        weights = daypart_selected[allowed].tolist()
+        if len(names) == 0:
+            return None
+        return AliasTable(names, weights)
+
+    def eligible_mask(self, game: str, daypart_selected, forced_type, dupes: int, check_dupes: bool, specific_pkmn: set):
+        """
+        Docstring for eligible_mask
+        
+        :param self: Area object.
+        :param game: String object representing game version, possible values are: "Scarlet" or "Violet"
+        :param daypart_selected: Column of self.weights for the selected daypart.
+        :param forced_type: String object that represents the Pokemon Type forced by an activated Encounter Power, or None if no Encounter Power was activated.
+        :param dupes: Integer bitset of family IDs, see Area.find_dupe().
+        :param check_dupes: Boolean flag that represents whether or not to exclude duplicate Pokemon.
+        :param specific_pkmn: Set object that if non-empty, only the Pokemon in the set are included. Ignores check_dupes if non-empty set.
+
+        Returns a boolean vector that is True for every row of self.weights that can be generated under these filters.
+        Used by build_alias_table().
+        """
+        # Filter the Pokémon based on version exclusivity, and either Dupes Clause or the specific subset, see distribution().
+        allowed = self.version_mask(game)
+
+        # Normal operations, do not calculate for specific Pokemon only 
+        if len(specific_pkmn) == 0:
+            allowed = allowed & ~self.dupe_mask(dupes, check_dupes)
+
         # If length of specific_pkmn is greater than 0, then calculate for specific Pokemon only
         # No need to check for dupes, as this specific Pokemon set is already filtering out Pokemon
-        if len(specific_pkmn) > 0: 
-            for key in pkmn_keys:
-                correct_version_exclusive = Area.validate_compatible_version(game, key) # Boolean
-                correct_type = (key.find(type) != -1) # Boolean
-                contained_in_specific_subset = any(False if key.strip().lower().find(subset_pkmn.strip().lower()) == -1 else True for subset_pkmn in specific_pkmn) # Boolean
+        else:
+            allowed = allowed & self.subset_mask(specific_pkmn)
 
-                # Check if Pokémon is compatible with game's version, and check if Pokémon is in specific subset; if not, immediately go to next Pokémon
-                if not (correct_version_exclusive and contained_in_specific_subset): 
-                    continue
+        # If an Encounter Power was activated, only Pokémon of the specified type are allowed
+        if forced_type is not None:
+            allowed = allowed & self.type_mask(forced_type)
 
-                # Check if Encounter Power is active, and check if Pokémon is not the specific type; if so, immediately go to next Pokémon
-                if encounter_power_activated and not correct_type:
-                    continue
-        
-                # Otherwise, create ranges with bounds like: [(0, 15.7563), (15.7563, 26.0), etc.]
-                ranges.append(Range(key, sum, sum + daypart_selected[key])) 
-                sum = sum + daypart_selected[key]
+        # Pokémon that do not spawn in this daypart (weight of 0) can never be chosen.
+        allowed = allowed & (daypart_selected > 0)
 
+        return allowed
 
-        # If no Pokémon are eligible due to a combination of Dupes Clause and Encounter Power for example, return that for the Area, Daypart, no Pokémon were selected.
-        if len(ranges) == 0:
-            return [self.name, daypart, "None"]
+    def generate_many(self, game: str, daypart: str, type: str, encounter_power: int, n: int, dupes: int, check_dupes: bool, specific_pkmn: set, uniforms):
+        """
+        Docstring for generate_many
         
-        # Otherwise, generate a Pokémon
-        rng = random.uniform(0, sum) # Generate a value
-        for r in ranges: # For every range created...; r is used because range in Python is defined to have functionality.
-            if r.enclosed(rng): # Proceed if the value falls within the range
-                pkmn_name = r.name.split("_")[0]
-                if print_boolean:
-                    print(f"{self.name} ({daypart}): {pkmn_name}")
-                return [self.name, daypart, pkmn_name]
+        :param self: Area object.
+        :param game: String object representing game version, possible values are: "Scarlet" or "Violet"
+        :param daypart: Precleaned string object that represents the daypart, possible values are: "Dawn", "Day", "Dusk", and "Night".
+        :param type: String object that represents a Pokemon Type, possible values are "Grass", "Water", etc.
+        :param encounter_power: Integer object ranging from 0, 1, 2, or 3, see generate().
+        :param n: Integer object, the number of Pokemon to generate.
+        :param dupes: Integer bitset of family IDs, see Area.find_dupe().
+        :param check_dupes: Boolean flag that represents whether or not to exclude duplicate Pokemon.
+        :param specific_pkmn: Set object that if non-empty, only the Pokemon in the set are included. Ignores check_dupes if non-empty set.
+        :param uniforms: NumPy array of n rows of random floats in [0, 1), one row per draw, see rng.draws(). Column 0 decides the Encounter Power, and column 1 chooses the Pokemon.
+
+        This function is only meant to be used within the Game.generate_many() function.
+
+        Generates n Pokemon with the same filters, as if generate() was called n times, and returns a list of n Pokemon names.
+        "None" is returned for a draw where no Pokémon is eligible.
+        Random numbers for all n draws are given at once, and each draw only uses its own row, so a draw does not depend on the draws before it.
+        A draw uses its values the same way generate() uses the values of its random stream, so draw i of a seed is the Pokemon generate() gives for that draw:
+        1) For each draw, decide if the Encounter Power is activated.
+        2) Draws where it is activated choose from the Pokemon of the specific Type, the other draws choose from every eligible Pokemon.
+        3) A draw is chosen by sampling the same alias table as generate() with its value, see AliasTable.sample_many().
+        """
+        daypart_index = ["Dawn", "Day", "Dusk", "Night"].index(daypart)
+        daypart_selected = self.weights[:, daypart_index]
 
-    def distribution(self, game: str, daypart: str, type: str, encounter_power: int, dupes: set, check_dupes: bool, specific_pkmn: set, print_boolean: bool):
+        activated = uniforms[:n, 0] * 100 < Area.encounter_power_chance(encounter_power)
+        pkmn_names = np.full(n, "None", dtype=object)
+
+        for forced_type, draws in [(None, ~activated), (type, activated)]:
+            if not draws.any():
+                continue
+            table = self.find_alias_table(game, daypart, daypart_selected, forced_type, dupes, check_dupes, specific_pkmn)
+            if table is None:
+                continue
+            pkmn_names[draws] = table.sample_many(uniforms[:n, 1][draws])
+
+        return [pkmn_name.split("_")[0] for pkmn_name in pkmn_names]
+
+    def distribution(self, game: str, daypart: str, type: str, encounter_power: int, dupes: int, check_dupes: bool, specific_pkmn: set, print_boolean: bool):
         """
         Docstring for distribution
         
@@ -293,7 +414,7 @@ class Area:
         :param daypart: Precleaned string object that represents the daypart, possible values are: "Dawn", "Day", "Dusk", and "Night".
         :param type: String object that represents a Pokemon Type, possible values are "Grass", "Water", etc.
         :param encounter_power: Integer object ranging from 0, 1, 2, or 3; represents an Encounter Power which increases likelihood of a Pokemon of a specific Type (Water-type Pokemon, etc.).
-        :param dupes: Set object storing String representations of Pokemon names; typically Game.dupes object. Set contains Pokemon that are considered "duplicates" and should be excluded, see Area.find_dupe(). 
+        :param dupes: Integer bitset of family IDs; typically Game.dupes object. Pokemon whose family bit is set are considered "duplicates" and should be excluded, see Area.find_dupe(). 
         :param check_dupes: Boolean flag that represents whether or not to exclude duplicate Pokemon.
         :param specific_pkmn: Set object that if greater than one signifies that instead of calculating for all Pokemon in an area, only calculate for the ones in the set. Ignores check_dupes if non-empty set.
         :param print_boolean: Boolean object that checks whether or not to print.
@@ -304,22 +425,17 @@ class Area:
         1) Select daypart based on time value.
         2) Check if type value and power value are valid, if so, set multiplier. multiplier increases the chance of specific Type Pokemon of appearing, and decreases chance of other Type Pokemon of appearing.
         3a) Filter out Pokemon in the daypart based on Dupes Clause, and version exclusivity, these is what normally happens
-        3b) If specific_pkmn is a
+        3b) If specific_pkmn is a non-empty set, filter out Pokemon not in the set instead of Dupes Clause
         4) Calculate float sum of Pokemon values
         5) Calculate each Pokemon's percentage chance of appearing
         6) Print list of Pokemon in descending order of percentage value
 
+        The filters are boolean vectors over the rows of self.weights, so every step is done on whole arrays at once.
+
         """
-        # Choosing all possible wild Pokemon that are present within the daypart selected.
-        daypart_selected = {}
-        if daypart == "Dawn":
-            daypart_selected = self.dawn
-        elif daypart == "Day":
-            daypart_selected = self.day
-        elif daypart == "Dusk":
-            daypart_selected = self.dusk
-        elif daypart == "Night":
-            daypart_selected = self.night
+        # Choosing the column of the weights matrix for the daypart selected.
+        daypart_index = ["Dawn", "Day", "Dusk", "Night"].index(daypart)
+        daypart_selected = self.weights[:, daypart_index]
 
         """
         I am under the assumption that the way Encounter Powers works is: 
@@ -336,133 +452,185 @@ class Area:
             upper_bound = 1
         demultiplier = (1-upper_bound) # demultipler will be used to reduce likelihood of Pokémon that do not match the specified type when an Encounter Power is active.
 
-        # Short lived class for the purpose of the following section
-        class Wild:
-            def __init__(self, name: str, percentage: float, matching_type: bool):
-                """
-                Docstring for __init__
-                
-                :param self: Description
-                :param name: String value representing Pokémon name.
-                :param percentage: Float value representing percentage chance that a Pokémon could be chosen.
-                :param matching_type: Boolean value representing whether or not the Pokémon matches the specified type.
-                """
-                self.name = name
-                self.percentage = percentage
-                self.truncated_percentage = 0.0
-                self.matching_type = matching_type
-
-            def set_percentage(self, new_percentage: float):
-                    self.percentage = new_percentage 
-                    new_percentage = new_percentage * 10000 # Multiplying to 5 whole digits
-                    new_percentage = new_percentage // 1 # Truncating
-                    new_percentage = new_percentage / 100 # Dividing down to 5 decimal places
-                    self.truncated_percentage = new_percentage
-                
-
-
-        # Filter the Pokémon to calculate for based on Dupes Clause, version exclusivity, Encounter Power, and whether a specific subset was called for.
-        pkmn_keys = daypart_selected.keys()
-        allowed_pkmn = []
+        # Filter the Pokémon to calculate for based on Dupes Clause, version exclusivity, and whether a specific subset was called for.
+        # Every filter is a boolean vector with one value per row of self.weights.
+        allowed = self.version_mask(game)
 
         # Normal operations, do not calculate for specific Pokemon only 
         if len(specific_pkmn) == 0:
-            for key in pkmn_keys:
-                is_dupe = self.find_dupe(dupes, key.split("_")[0], check_dupes)
-                correct_version_exclusive = Area.validate_compatible_version(game, key)
+            allowed = allowed & ~self.dupe_mask(dupes, check_dupes)
 
-                if is_dupe == False and correct_version_exclusive == True:
-                    correct_type = (key.find(type) != -1) # Check if Pokemon is equal to Encounter Power type
-                    allowed_pkmn.append(Wild(key, 0.0, correct_type))
-        
         # If length of specific_pkmn is greater than 0, then calculate for specific Pokemon only
         # No need to check for dupes, as this specific Pokemon set is already filtering out Pokemon
-        if len(specific_pkmn) > 0: 
-            for key in pkmn_keys:
-                contained_in_specific_subset = any(False if key.strip().lower().find(subset_pkmn.strip().lower()) == -1 else True for subset_pkmn in specific_pkmn)
-                correct_version_exclusive = Area.validate_compatible_version(game, key)
-
-                if correct_version_exclusive and contained_in_specific_subset:
-                    correct_type = (key.find(type) != -1) # Check if Pokemon is equal to Encounter Power type
-                    allowed_pkmn.append(Wild(key, 0.0, correct_type))
+        else:
+            allowed = allowed & self.subset_mask(specific_pkmn)
 
-        
+        # If Encounter Power is active, Pokémon that do not match the specified type have their weight reduced
+        # Only the allowed rows of the one daypart are reduced, instead of keeping reduced weights for every Type and level.
+        values = daypart_selected[allowed]
+        if demultiplier != 1:
+            matching_type = self.type_mask(type)[allowed]
+            values = np.where(matching_type, values, values*demultiplier)
 
         # First, calculate sum of all probability weight
-        sum = 0.0
-        for allowed in allowed_pkmn:
-            val = 0.0
-            if demultiplier != 1 and not allowed.matching_type: # If Encounter Power is active and Pokémon does not match specified type
-                val = daypart_selected[allowed.name]*demultiplier
-            else:
-                val = daypart_selected[allowed.name]
-            sum = sum + val
-
-        # Second, calculate each Pokémon
-        for allowed in allowed_pkmn:
-            val = 0.0
-            if demultiplier != 1 and not allowed.matching_type: # If Encounter Power is active and Pokémon does not match specified type
-                val = daypart_selected[allowed.name]*demultiplier
-            else:
-                val = daypart_selected[allowed.name]
-
-            if (sum == 0.0): # Prevents division by 0
-                allowed.percentage = 0.0
-            else:
-                allowed.set_percentage(val/sum)
-
-        # Third, filter out Pokémon where the percentage is 0.0, not much reason to show Pokémon if you cannot catch them under set of parameters
-        allowed_pkmn = list(map(lambda pkmn: pkmn if pkmn.percentage > 0.0 else False, allowed_pkmn))
-        allowed_pkmn = [pkmn for pkmn in allowed_pkmn if pkmn] # Filters out False
-
-        # Sort based on percentage values starting from largest to smallest
-        allowed_pkmn = sorted(allowed_pkmn, key=lambda pkmn: pkmn.percentage, reverse=True)
+        # cumsum adds the values one after another, unlike sum(), so the result does not depend on how NumPy splits the addition.
+        sum = np.cumsum(values)[-1] if len(values) > 0 else 0.0
+        if sum == 0.0: # Prevents division by 0, no Pokémon can be chosen
+            return []
+
+        # Second, calculate each Pokémon's percentage, and filter out Pokémon where the percentage is 0.0, not much reason to show Pokémon if you cannot catch them under set of parameters
+        percentages = values / sum
+        names = np.array(self.pokemon, dtype=object)[allowed]
+        shown = percentages > 0.0
+        percentages = percentages[shown]
+        names = names[shown]
+
+        # Sort based on percentage values starting from largest to smallest, keeping the original order of equal percentages
+        order = np.argsort(-percentages, kind="stable")
+        truncated = (percentages * 10000) // 1 / 100 # Multiplying to 5 whole digits, truncating, then dividing down to 5 decimal places
+        allowed_pkmn = [Wild(names[i], float(percentages[i]), float(truncated[i])) for i in order]
 
         if print_boolean:
             for allowed in allowed_pkmn:
                 pkmn_name = allowed.name.split("_")[0]
                 print(f"{pkmn_name}: {allowed.percentage}%")
         return allowed_pkmn # list object
- 
-    def load_areas():
+
+    def version_mask(self, game: str):
+        """
+        Docstring for version_mask
+        
+        :param self: Area object.
+        :param game: String object representing game version, either "Scarlet" or "Violet".
+
+        Returns a boolean vector that is True for every row of self.weights that is compatible with the game version, see validate_compatible_version().
+        The vectors for Scarlet and Violet are calculated when the area is loaded.
+        """
+        if game in self.version_masks:
+            return self.version_masks[game]
+        return np.array([Area.validate_compatible_version(game, key) for key in self.pokemon], dtype=bool)
+
+    def dupe_mask(self, dupes: int, check_dupes: bool):
+        """
+        Docstring for dupe_mask
+        
+        :param self: Area object.
+        :param dupes: Integer bitset of family IDs, see find_dupe().
+        :param check_dupes: Boolean flag that represents whether or not to exclude duplicate Pokemon.
+
+        Returns a boolean vector that is True for every row of self.weights that is a dupe, see find_dupe().
+        The bitset is unpacked once, then every row only needs a single lookup of its family's bit.
+        """
+        if check_dupes != True or dupes == 0:
+            return np.zeros(len(self.pokemon), dtype=bool)
+        # One extra bit for the family ID given to Pokemon without a family, which is never set.
+        bit_count = self.pokedex.family_count + 1
+        dupe_bits = np.unpackbits(np.frombuffer(dupes.to_bytes((bit_count + 7) // 8, "little"), dtype=np.uint8), bitorder="little")
+        return dupe_bits[self.families].astype(bool)
+
+    def subset_mask(self, specific_pkmn: set):
+        """
+        Docstring for subset_mask
+        
+        :param self: Area object.
+        :param specific_pkmn: Set of Strings representing the specific Pokemon to include.
+
+        Returns a boolean vector that is True for every row of self.weights that contains the name of a Pokemon in specific_pkmn.
+        """
+        lowered_subset = [subset_pkmn.strip().lower() for subset_pkmn in specific_pkmn]
+        return np.array([any(key.strip().lower().find(subset_pkmn) != -1 for subset_pkmn in lowered_subset) for key in self.pokemon], dtype=bool)
+
+    def type_mask(self, type: str):
+        """
+        Docstring for type_mask
+        
+        :param self: Area object.
+        :param type: String object that represents a Pokemon Type, possible values are "Grass", "Water", etc.
+
+        Returns a boolean vector that is True for every row of self.weights that has the type, using the Type bitmasks in self.types.
+        The vectors of all 18 types are calculated by build_masks(); anything that is not a Type matches no row.
+        """
+        if type not in self.type_masks:
+            return np.zeros(len(self.pokemon), dtype=bool)
+        return self.type_masks[type]
+
+    def build_arrays(self):
+        """
+        Docstring for build_arrays
+        
+        :param self: Area object.
+
+        Builds the arrays used by distribution() after the area is loaded from the CSV files.
+        weights is a matrix with one row per Pokemon in self.pokemon, and one column per daypart: Dawn, Day, Dusk, and Night.
+        types is a vector with the Type bitmask of every Pokemon in self.pokemon.
+        """
+        self.weights = np.array(self.weights, dtype=np.float64).reshape(len(self.pokemon), 4)
+        self.types = np.array(self.types, dtype=np.uint32)
+        self.build_masks()
+
+    def build_masks(self):
+        """
+        Docstring for build_masks
+        
+        :param self: Area object.
+
+        Calculates the version exclusive boolean vectors used by version_mask(), and the family IDs used by dupe_mask().
+
+        For every Type, the boolean vector of the Pokemon with that Type is taken from the Type bitmasks.
+        Encounter Power weights are not kept; distribution() reduces the weights of the other Types of a request when it is calculated.
+        """
+        for game in ["Scarlet", "Violet"]:
+            self.version_masks[game] = np.array([Area.validate_compatible_version(game, key) for key in self.pokemon], dtype=bool)
+
+        pokedex = self.pokedex
+        families = [pokedex.family_id(key.split("_")[0]) for key in self.pokemon]
+        self.families = np.array([pokedex.family_count if family is None else family for family in families], dtype=np.intp)
+
+        for bit, type in enumerate(et.TYPES):
+            self.type_masks[type] = (self.types >> bit) & 1 == 1
+
+    def load_areas(tables=None, pokedex=None):
         """
         Docstring for load_areas
 
-        Static method meant to be used by Game objects.
+        :param tables: EncounterTables object holding compiled data. If None, the areas are loaded from the CSV files instead.
+        :param pokedex: Pokedex object given to every Area. If None, the shared Pokedex is used, see Pokedex.shared().
+
+        Static method meant to be used by Snapshot objects.
         Loads the areas, and returns them as a dictionary.
         The areas in the dictionary are listed in alphabetical order.
         """
-        alfornada_cavern = Area("Alfornada Cavern")
-        asado_desert = Area("Asado Desert")
-        cabo_poco = Area("Cabo Poco")
-        casseroya_lake = Area("Casseroya Lake")
-        dalizapa_passage = Area("Dalizapa Passage")
-        east_paldean_sea = Area("East Paldean Sea")
-        east_province_area_one = Area("East Province (Area One)")
-        east_province_area_two = Area("East Province (Area Two)")
-        east_province_area_three = Area("East Province (Area Three)")
-        glaseado_mountain = Area("Glaseado Mountain")
-        great_crater_of_paldea = Area("Great Crater of Paldea")
-        inlet_grotto = Area("Inlet Grotto")
-        north_paldean_sea = Area("North Paldean Sea")
-        north_province_area_one = Area("North Province (Area One)")
-        north_province_area_two = Area("North Province (Area Two)")
-        north_province_area_three = Area("North Province (Area Three)")
-        poco_path = Area("Poco Path")
-        pokemon_league = Area("Pokemon League")
-        socarrat_trail = Area("Socarrat Trail")
-        south_paldean_sea = Area("South Paldean Sea")
-        south_province_area_one = Area("South Province (Area One)")
-        south_province_area_two = Area("South Province (Area Two)")
-        south_province_area_three = Area("South Province (Area Three)")
-        south_province_area_four = Area("South Province (Area Four)")
-        south_province_area_five = Area("South Province (Area Five)")
-        south_province_area_six = Area("South Province (Area Six)")
-        tagtree_thicket = Area("Tagtree Thicket")
-        west_paldean_sea = Area("West Paldean Sea")
-        west_province_area_one = Area("West Province (Area One)")
-        west_province_area_two = Area("West Province (Area Two)")
-        west_province_area_three = Area("West Province (Area Three)")
+        alfornada_cavern = Area("Alfornada Cavern", tables, pokedex)
+        asado_desert = Area("Asado Desert", tables, pokedex)
+        cabo_poco = Area("Cabo Poco", tables, pokedex)
+        casseroya_lake = Area("Casseroya Lake", tables, pokedex)
+        dalizapa_passage = Area("Dalizapa Passage", tables, pokedex)
+        east_paldean_sea = Area("East Paldean Sea", tables, pokedex)
+        east_province_area_one = Area("East Province (Area One)", tables, pokedex)
+        east_province_area_two = Area("East Province (Area Two)", tables, pokedex)
+        east_province_area_three = Area("East Province (Area Three)", tables, pokedex)
+        glaseado_mountain = Area("Glaseado Mountain", tables, pokedex)
+        great_crater_of_paldea = Area("Great Crater of Paldea", tables, pokedex)
+        inlet_grotto = Area("Inlet Grotto", tables, pokedex)
+        north_paldean_sea = Area("North Paldean Sea", tables, pokedex)
+        north_province_area_one = Area("North Province (Area One)", tables, pokedex)
+        north_province_area_two = Area("North Province (Area Two)", tables, pokedex)
+        north_province_area_three = Area("North Province (Area Three)", tables, pokedex)
+        poco_path = Area("Poco Path", tables, pokedex)
+        pokemon_league = Area("Pokemon League", tables, pokedex)
+        socarrat_trail = Area("Socarrat Trail", tables, pokedex)
+        south_paldean_sea = Area("South Paldean Sea", tables, pokedex)
+        south_province_area_one = Area("South Province (Area One)", tables, pokedex)
+        south_province_area_two = Area("South Province (Area Two)", tables, pokedex)
+        south_province_area_three = Area("South Province (Area Three)", tables, pokedex)
+        south_province_area_four = Area("South Province (Area Four)", tables, pokedex)
+        south_province_area_five = Area("South Province (Area Five)", tables, pokedex)
+        south_province_area_six = Area("South Province (Area Six)", tables, pokedex)
+        tagtree_thicket = Area("Tagtree Thicket", tables, pokedex)
+        west_paldean_sea = Area("West Paldean Sea", tables, pokedex)
+        west_province_area_one = Area("West Province (Area One)", tables, pokedex)
+        west_province_area_two = Area("West Province (Area Two)", tables, pokedex)
+        west_province_area_three = Area("West Province (Area Three)", tables, pokedex)
 
         alpha = {}
         alpha["Alfornada Cavern"] = alfornada_cavern
@@ -499,15 +667,46 @@ class Area:
         
         return alpha
 
-    def activate_encounter_power(encounter_power_number):
+    def route_order():
+        """
+        Docstring for route_order
+
+        Returns the area names in roughly chronological order in-game, the same numbering as the image files used by biome_distribution.py.
+        Names are the keys of the dictionary returned by load_areas().
+        """
+        return ["Cabo Poco", "Poco Path", "Inlet Grotto", "South Province (Area One)", "South Province (Area Two)", "South Province (Area Three)",
+                "West Province (Area One)", "South Paldean Sea", "South Province (Area Four)", "South Province (Area Five)", "East Province (Area One)",
+                "East Province (Area Two)", "East Province (Area Three)", "West Province (Area Two)", "Tagtree Thicket", "West Province (Area Three)",
+                "East Paldean Sea", "West Paldean Sea", "Glaseado Mountain", "Alfornada Cavern", "South Province (Area Six)", "Asado Desert",
+                "North Province (Area Three)", "North Province (Area Two)", "North Province (Area One)", "North Paldean Sea", "Casseroya Lake",
+                "Socarrat Trail", "Dalizapa Passage", "Pokemon League", "Great Crater Of Paldea"]
+
+    def activate_encounter_power(encounter_power_number, rng=random):
         """
         Docstring for power_int
         
         :param self: Area object.
         :param power_int: An Integer intended to 1, 2, or 3. Depending on power_int level, it has a greater chance of forcing a specific Type (Grass, Water, etc.) Pokemon to spawn.
+        :param rng: Object with a random() method returning a float in [0, 1), such as a NumPy Generator or the random module.
+        
+        upper_bound represents the percentage chance that a specific Type Pokemon is forced to spawn, see encounter_power_chance().
+        Generates a random number from 0 to 100 (exclusive), if it is less than the upper_bound, then the specific Type is forced.
+        The random number is used even without an Encounter Power, so the random values used after it do not depend on the Encounter Power level.
+        """
+        upper_bound = Area.encounter_power_chance(encounter_power_number)
+        value = rng.random() * 100
+        if upper_bound == 0:
+            return False
+        
+        return value < upper_bound
+
+    def encounter_power_chance(encounter_power_number):
+        """
+        Docstring for encounter_power_chance
         
-        upper_bound represents the percentage chance that a specific Type Pokemon is forced to spawn.
-        Generates a random number from 1 to 100 (inclusive), if it is less than or equal to the upper_bound, then the specific Type is forced.
+        :param encounter_power_number: An Integer intended to 1, 2, or 3.
+
+        Returns the percentage chance (0 to 100) that an Encounter Power of this level forces a specific Type Pokemon to spawn.
         """
         upper_bound = 0
         if encounter_power_number == 1:
@@ -516,25 +715,18 @@ class Area:
             upper_bound = 75
         elif encounter_power_number == 3: 
             upper_bound = 100
-        else:
-            return False
-        
-        return random.randint(1,100) <= upper_bound
+        return upper_bound
 
     def add_version_exclusive_tag(pkmn_name: str):
-        pokedex = list()
-        with open(r"data/pokedex/links.txt","r") as f1:
-            lines = f1.readlines()
-        pokedex = list(map(lambda x: x.split(",")[0], lines))
-
-        for pkmn in pokedex:
-            pkmn_full_name = pkmn.split("_")[0]
-            if pkmn.find("Scarlet") != -1 or pkmn.find("Violet") != -1:
-                if Area.remove_version_exclusive_tag(pkmn_full_name) == Area.remove_version_exclusive_tag(pkmn_name):
-                    return pkmn_full_name
+        """
+        Docstring for add_version_exclusive_tag
         
-        # Otherwise, simply return a reformatted name
-        return pkmn_name.strip().title()
+        :param pkmn_name: String object that represents the Pokémon's name; should be in a form such as "Deino"
+
+        This function will transform a value such as "Deino" to "Deino (Scarlet)" if the Pokémon is version exclusive, see Pokedex.add_version_exclusive_tag().
+        Otherwise, it will return a reformatted name.
+        """
+        return Pokedex.shared().add_version_exclusive_tag(pkmn_name)
         
     def remove_version_exclusive_tag(pkmn_name: str):
         """
@@ -545,12 +737,7 @@ class Area:
         This function will transform a value such as "Deino (Scarlet)" to "Deino".
         Otherwise, it will return a value such as "Deino", "Bagon", "Pikachu", "Whateverinputisenteredbecausethisdoesnotcheckpokemonname"
         """
-        pkmn_name = pkmn_name.strip().lower()
-        if pkmn_name.find("scarlet") != -1 or pkmn_name.find("violet") != -1:
-            pkmn_name = pkmn_name.replace("(scarlet)", " ")
-            pkmn_name = pkmn_name.replace("(violet)", " ")
-            pkmn_name = pkmn_name.strip()
-        return pkmn_name.title() # Converts something like Deino 
+        return Pokedex.normalize(pkmn_name)
 
     def validate_area(area_name):
         areas = {
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from models.pokedex import Pokedex
+
+class Box:
+    def __init__(self, pokedex: Pokedex, box_id=None):
+        """
+        Docstring for __init__
+
+        :param self: Box object.
+        :param pokedex: Pokedex object used to validate, tag, and find the family of every Pokemon; typically Snapshot.pokedex.
+        :param box_id: String object that identifies the Box in a BoxStore. If None, a new ID is made.
+
+        A Box holds the Pokemon that a user owns across many requests, so the box text does not have to be parsed again for every request.
+        Pokemon are added and removed one at a time, and the Dupes Clause bitset is kept up to date with each change instead of being rebuilt.
+
+        pkmn is the list of Pokemon names in the box, tagged the same way as Game.box, such as "Larvitar (Scarlet)".
+        family_counts is a dictionary with the format: K: family ID, V: Integer number of Pokemon in the box with that family.
+        dupes is the Integer bitset of the families in the box, the same as Game.dupes after Game.populate_dupes().
+        """
+        self.pokedex = pokedex
+        self.box_id = box_id if box_id is not None else uuid.uuid4().hex
+        self.pkmn = []
+        self.family_counts = {}
+        self.dupes = 0
+        self.lock = threading.Lock()
+
+    def parse(pokedex: Pokedex, global_text: str):
+        """
+        Docstring for parse
+
+        :param pokedex: Pokedex object.
+        :param global_text: String object of Pokemon names separated by ",", such as " pikachu, larvitar".
+
+        Returns the list of real Pokemon names with version exclusive tags added to applicable Pokemon, such as ["Pikachu", "Larvitar (Scarlet)"].
+        Names that are not real Pokemon are left out.
+        """
+        # For parsing the textbox, the operations are applied in the following order:
+        # 1) Split into an array by "," to get each Pokémon
+        # 2) Remove whitespace from each Pokémon
+        # 3) Check if the Pokémon names are real, if not, replace with False. For the remaining real ones, remove version exclusive tags "(Scarlet)" or "(Violet)"
+        # 4) Remove False values from previous step
+        # 5) For the Pokémon left, add version exclusive tags to applicable Pokémon
+        pkmn_list = global_text.split(",")
+        pkmn_list = list(map(lambda x: x.strip(), pkmn_list)) # Remove whitespace
+        pkmn_list = list(map(lambda x: Pokedex.normalize(x) if pokedex.validate(x) else False, pkmn_list)) # Checks Pokemon name, filters out fake names, and removes version exclusive tags from remaining
+        pkmn_list = [pkmn for pkmn in pkmn_list if pkmn] # Filters out False
+        return list(map(lambda x: pokedex.add_version_exclusive_tag(x), pkmn_list))
+
+    def add(self, global_text: str):
+        """
+        Docstring for add
+
+        :param self: Box object.
+        :param global_text: String object of Pokemon names separated by ",", see parse().
+
+        Adds every real Pokemon in global_text to the box, and sets the bits of their families in dupes.
+        Returns the list of Pokemon names that were added.
+        """
+        added = Box.parse(self.pokedex, global_text)
+        with self.lock:
+            for pkmn in added:
+                self.pkmn.append(pkmn)
+                family = self.pokedex.family_id(pkmn)
+                if family is None:
+                    continue
+                self.family_counts[family] = self.family_counts.get(family, 0) + 1
+                self.dupes |= 1 << family
+        return added
+
+    def remove(self, global_text: str):
+        """
+        Docstring for remove
+
+        :param self: Box object.
+        :param global_text: String object of Pokemon names separated by ",", see parse().
+
+        Removes one copy of every Pokemon in global_text that is in the box.
+        The bit of a family is only cleared from dupes once no Pokemon of that family is left in the box.
+        Returns the list of Pokemon names that were removed.
+        """
+        removed = []
+        with self.lock:
+            for pkmn in Box.parse(self.pokedex, global_text):
+                if pkmn not in self.pkmn:
+                    continue
+                self.pkmn.remove(pkmn)
+                removed.append(pkmn)
+                family = self.pokedex.family_id(pkmn)
+                if family is None:
+                    continue
+                self.family_counts[family] -= 1
+                if self.family_counts[family] == 0:
+                    del self.family_counts[family]
+                    self.dupes &= ~(1 << family)
+        return removed
+
+    def load_state(self, pkmn: list, dupes: int, family_counts=None):
+        """
+        Docstring for load_state
+
+        :param self: Box object.
+        :param pkmn: List of Pokemon names, as returned by state().
+        :param dupes: Integer bitset of families, as returned by state().
+        :param family_counts: Dictionary of the family counts of pkmn, see __init__. If None, it is rebuilt so the box can still be changed.
+
+        Sets the box to a state copied from another Box, such as one sent to a worker process or saved in a BoxStore.
+        """
+        with self.lock:
+            self.pkmn = list(pkmn)
+            self.dupes = dupes
+            if family_counts is not None:
+                self.family_counts = dict(family_counts)
+                return
+            self.family_counts = {}
+            for pkmn_name in self.pkmn:
+                family = self.pokedex.family_id(pkmn_name)
+                if family is not None:
+                    self.family_counts[family] = self.family_counts.get(family, 0) + 1
+
+    def state(self):
+        """
+        Docstring for state
+
+        :param self: Box object.
+
+        Returns a tuple of (list of Pokemon names, dupes bitset, ETag) that are consistent with each other, even while the box is being changed.
+        """
+        with self.lock:
+            return list(self.pkmn), self.dupes, self.etag()
+
+    def etag(self):
+        """
+        Docstring for etag
+
+        :param self: Box object.
+
+        Returns a hash of the Pokemon in the box, regardless of their order. Two boxes with the same Pokemon have the same ETag.
+        """
+        return hashlib.sha256(",".join(sorted(pkmn.lower() for pkmn in self.pkmn)).encode("utf-8")).hexdigest()[:32]
+
+class BoxChanged(Exception):
+    """
+    Raised by BoxStore.update() when the Box does not have the expected ETag, because another request changed it first.
+    """
+
+class BoxStore:
+    def __init__(self, path=":memory:", max_size=10000):
+        """
+        Docstring for __init__
+
+        :param self: BoxStore object.
+        :param path: Path of the SQLite database file the boxes are kept in. If ":memory:", they are kept in the memory of this process only.
+        :param max_size: Integer object, the most boxes kept before the least recently created or changed one is dropped.
+
+        Holds the Box of every session by its ID. A session whose Box was dropped has to create a new one from its box text.
+        The Pokemon names, dupes, and family_counts of each Box are stored with the family_key of the Pokedex they were found with (see Pokedex),
+        so a Box is loaded without finding the family of every Pokemon again. They are only found again if the Pokedex being served has other family IDs.
+        Boxes are dropped in the order they were last created or changed; reading a Box does not write to the store.
+
+        Several server processes (see serve.py) share their boxes by using the same file, so a box ID works whichever process answers.
+        Every process opens its own connection the first time it uses the store, since a connection cannot be shared with a forked process.
+        """
+        self.path = path
+        self.max_size = max_size
+        self.connection = None
+        self.pid = None # Process that opened the connection
+        self.lock = threading.Lock()
+
+    def connect(self):
+        """
+        Docstring for connect
+
+        :param self: BoxStore object.
+
+        Returns the connection of this process, and opens it (creating the table if needed) if this process has none yet.
+        """
+        if self.pid != os.getpid():
+            # Transactions are started explicitly, see update()
+            connection = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+            if self.path != ":memory:":
+                connection.execute("PRAGMA journal_mode=WAL") # Readers do not wait for writers in other processes
+            connection.execute("CREATE TABLE IF NOT EXISTS boxes (box_id TEXT PRIMARY KEY, pkmn TEXT NOT NULL, used INTEGER NOT NULL)")
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(boxes)")]
+            for column in ["dupes", "families", "family_key"]: # Missing from stores made before they were saved; such boxes are loaded from pkmn
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE boxes ADD COLUMN {column} TEXT")
+            connection.execute("CREATE INDEX IF NOT EXISTS boxes_used ON boxes (used)")
+            self.connection = connection
+            self.pid = os.getpid()
+        return self.connection
+
+    def load(pokedex: Pokedex, box_id: str, row: tuple):
+        """
+        Docstring for load
+
+        :param pokedex: Pokedex object, see Box.
+        :param box_id: String object that is the ID of the Box.
+        :param row: Tuple of the pkmn, dupes, families, and family_key columns stored for the Box, see row().
+
+        Returns a Box holding the stored Pokemon. The stored dupes and family_counts are used if they were found with the same family IDs as pokedex.
+        """
+        pkmn_text, dupes_text, families_text, family_key = row
+        pkmn_names = json.loads(pkmn_text)
+        box = Box(pokedex, box_id)
+        if family_key == pokedex.family_key:
+            family_counts = {int(family): count for family, count in json.loads(families_text).items()}
+            box.load_state(pkmn_names, int(dupes_text), family_counts)
+        else:
+            box.load_state(pkmn_names, pokedex.family_bitset(pkmn_names))
+        return box
+
+    def row(box: Box):
+        """
+        Docstring for row
+
+        :param box: Box object.
+
+        Returns the tuple of the pkmn, dupes, families, and family_key columns to store for the Box.
+        dupes is stored as text, since a bitset of every family does not fit in an SQLite integer.
+        """
+        return (json.dumps(box.pkmn), str(box.dupes), json.dumps(box.family_counts), box.pokedex.family_key)
+
+    def create(self, pokedex: Pokedex, global_text: str):
+        """
+        Docstring for create
+
+        :param self: BoxStore object.
+        :param pokedex: Pokedex object, see Box.
+        :param global_text: String object of Pokemon names separated by ",", see Box.parse().
+
+        Returns a new Box holding the Pokemon in global_text.
+        """
+        box = Box(pokedex)
+        box.add(global_text)
+        with self.lock:
+            connection = self.connect()
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("INSERT INTO boxes (box_id, pkmn, dupes, families, family_key, used) VALUES (?, ?, ?, ?, ?, ?)",
+                               (box.box_id, *BoxStore.row(box), time.time_ns()))
+            # Drops the least recently used boxes beyond max_size
+            connection.execute("DELETE FROM boxes WHERE box_id IN (SELECT box_id FROM boxes ORDER BY used DESC LIMIT -1 OFFSET ?)", (self.max_size,))
+            connection.execute("COMMIT")
+        return box
+
+    def get(self, pokedex: Pokedex, box_id: str):
+        """
+        Docstring for get
+
+        :param self: BoxStore object.
+        :param pokedex: Pokedex object, see Box.
+        :param box_id: String object that is the ID of a Box.
+
+        Returns the Box, or None if there is no Box with that ID.
+        """
+        with self.lock:
+            row = self.connect().execute("SELECT pkmn, dupes, families, family_key FROM boxes WHERE box_id = ?", (box_id,)).fetchone()
+        if row is None:
+            return None
+        return BoxStore.load(pokedex, box_id, row)
+
+    def update(self, pokedex: Pokedex, box_id: str, remove_text: str, add_text: str, if_match=None):
+        """
+        Docstring for update
+
+        :param self: BoxStore object.
+        :param pokedex: Pokedex object, see Box.
+        :param box_id: String object that is the ID of a Box.
+        :param remove_text: String object of Pokemon names separated by "," to remove, see Box.remove().
+        :param add_text: String object of Pokemon names separated by "," to add, see Box.add().
+        :param if_match: String object, the ETag the Box is expected to have. If None, the Box is changed whatever its ETag is.
+
+        Removes and then adds Pokemon, and returns the changed Box, or None if there is no Box with that ID.
+        Raises BoxChanged if the Box does not have the ETag if_match. Other processes cannot change the Box in between, so no change is lost.
+        """
+        with self.lock:
+            connection = self.connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute("SELECT pkmn, dupes, families, family_key FROM boxes WHERE box_id = ?", (box_id,)).fetchone()
+                if row is None:
+                    return None
+                box = BoxStore.load(pokedex, box_id, row)
+                if if_match is not None and if_match != box.etag():
+                    raise BoxChanged()
+                box.remove(remove_text)
+                box.add(add_text)
+                connection.execute("UPDATE boxes SET pkmn = ?, dupes = ?, families = ?, family_key = ?, used = ? WHERE box_id = ?",
+                                   (*BoxStore.row(box), time.time_ns(), box_id))
+            finally:
+                connection.execute("COMMIT") # Nothing was written unless the update succeeded
+        return box
+
+    def delete(self, box_id: str):
+        """
+        Docstring for delete
+
+        :param self: BoxStore object.
+        :param box_id: String object that is the ID of a Box.
+
+        Returns whether or not there was a Box with that ID.
+        """
+        with self.lock:
+            return self.connect().execute("DELETE FROM boxes WHERE box_id = ?", (box_id,)).rowcount > 0
@@ -0,0 +1,82 @@
+import numpy as np
+from models.area import Area, Wild
+from modules import encounter_tables as et
+
+class DistributionCube:
+    def __init__(self, alphabetical):
+        """
+        Docstring for __init__
+
+        :param self: DistributionCube object.
+        :param alphabetical: Dictionary with the format: K: "Area Name", V: Area object; typically Snapshot.alphabetical.
+
+        Without a box (Dupes Clause) or a specific subset of Pokemon, a distribution only depends on (version, area, daypart, type, Encounter Power).
+        Every one of those distributions is calculated once by Area.distribution(), so a request only has to look it up.
+        With no Encounter Power the type does not change the distribution, so it is stored once per daypart instead of once per type.
+
+        combinations is a dictionary with the format: K: tuple of (daypart, type, Encounter Power), V: Integer index of that combination.
+        tables is a dictionary with the format: K: tuple of ("Scarlet" or "Violet", "Area Name"), V: tuple of (offsets, rows, percentages, truncated percentages).
+        - rows, percentages, and truncated percentages hold the distributions of every combination one after another, in the order Area.distribution() returns them.
+        - The distribution of combination i is found between offsets[i] and offsets[i+1].
+        - rows are the rows of Area.pokemon, so no Pokemon name is stored twice.
+        """
+        self.combinations = {}
+        for daypart in ["Dawn", "Day", "Dusk", "Night"]:
+            self.combinations[(daypart, None, 0)] = len(self.combinations)
+            for type in et.TYPES:
+                for encounter_power in [1, 2, 3]:
+                    self.combinations[(daypart, type, encounter_power)] = len(self.combinations)
+
+        self.alphabetical = alphabetical
+        self.tables = {}
+        for game in ["Scarlet", "Violet"]:
+            for area in alphabetical.values():
+                self.tables[(game, area.name)] = self.build_table(game, area)
+
+    def build_table(self, game: str, area: Area):
+        """
+        Docstring for build_table
+
+        :param self: DistributionCube object.
+        :param game: String object representing game, either "Scarlet" or "Violet".
+        :param area: Area object.
+
+        Calculates the distribution of every combination for the area, and packs them into the arrays described in __init__().
+        """
+        rows = {pkmn: row for row, pkmn in enumerate(area.pokemon)}
+        offsets = [0]
+        pkmn_rows = []
+        percentages = []
+        truncated = []
+        for daypart, type, encounter_power in self.combinations:
+            distribution = area.distribution(game, daypart, type if type is not None else "Normal", encounter_power, 0, False, set(), False)
+            for wild in distribution:
+                pkmn_rows.append(rows[wild.name])
+                percentages.append(wild.percentage)
+                truncated.append(wild.truncated_percentage)
+            offsets.append(len(pkmn_rows))
+        return (np.array(offsets, dtype=np.uint32), np.array(pkmn_rows, dtype=np.uint16), np.array(percentages, dtype=np.float64), np.array(truncated, dtype=np.float64))
+
+    def lookup(self, game: str, area: str, daypart: str, type: str, encounter_power: int):
+        """
+        Docstring for lookup
+
+        :param self: DistributionCube object.
+        :param game: String object representing game, either "Scarlet" or "Violet".
+        :param area: Precleaned String object representing the area, such as "Poco Path".
+        :param daypart: Precleaned String object that represents the daypart, possible values are: "Dawn", "Day", "Dusk", and "Night".
+        :param type: String object that represents a Pokemon Type, possible values are "Grass", "Water", etc.
+        :param encounter_power: Integer object ranging from 0, 1, 2, or 3.
+
+        Returns the same list of Wild objects as Area.distribution() without a box or subset, or None if the combination was not precalculated.
+        """
+        key = (daypart, None, 0) if encounter_power == 0 else (daypart, type, encounter_power)
+        if key not in self.combinations or (game, area) not in self.tables:
+            return None
+
+        index = self.combinations[key]
+        offsets, pkmn_rows, percentages, truncated = self.tables[(game, area)]
+        start = int(offsets[index])
+        end = int(offsets[index + 1])
+        pokemon = self.alphabetical[area].pokemon
+        return [Wild(pokemon[pkmn_rows[i]], float(percentages[i]), float(truncated[i])) for i in range(start, end)]
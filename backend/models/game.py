@@ -1,36 +1,30 @@
 from models.area import Area
-from pathlib import Path
+from models.box import Box
+from models.snapshot import Snapshot
+from modules import rng as rng
 
 class Game:
-    def __init__(self, game):
-        self.game = game.strip().lower().capitalize()
-        self.areas = []
-        self.box = []
-        self.links = {}
-        self.dupes = set()
-        
-        self.alphabetical = {}
-        
-        self.define_links()
-        self.load_areas()
-        
-    def define_links(self):
+    def __init__(self, game, snapshot=None):
         """
-        Docstring for define_links
-        
+        Docstring for __init__
+
         :param self: Game object.
+        :param game: String object representing game version, possible values are: "Scarlet" or "Violet".
+        :param snapshot: Snapshot object holding the loaded links and areas. If None, a new Snapshot is loaded from the data folder.
 
-        This function will read the links.txt, which contain a Pokemon, and the Pokemon it is connected to that are considered "dupes".
-        These links will be parsed and added to a dictionary.
+        A Game object only holds the state of a single request (box, dupes).
+        The links and areas are shared through the Snapshot, and are never modified by a Game object.
         """
-        links = ""
-        with open(r"data/pokedex/links.txt", "r") as f1:
-            links = f1.readlines()
-        for line in links:
-            pkmn_list = line.strip().split(",")
-            header_pkmn = pkmn_list[0]
-            linked_pkmn = pkmn_list[1].split("_")
-            self.links[header_pkmn] = linked_pkmn
+        if snapshot is None:
+            snapshot = Snapshot()
+
+        self.game = game.strip().lower().capitalize()
+        self.snapshot = snapshot
+        self.box = []
+        self.dupes = 0
+
+        self.links = snapshot.links
+        self.alphabetical = snapshot.alphabetical
 
     def populate_dupes(self):
         """
@@ -38,18 +32,18 @@ class Game:
         
         :param self: Game object.
 
-        For every Pokemon in "the box", search its name in the links dictionary, and add all of those linked Pokemon to the dupes dictionary.
+        For every Pokemon in "the box" that is in the links dictionary, set the bit of its family in the dupes bitset.
+        Every Pokemon linked to a boxed Pokemon shares its family, see Pokedex.load_families(), so checking a dupe is a single bit test.
         """
-        self.dupes = set()
+        self.dupes = 0
         for boxed_pkmn in self.box:
-            try:
-                link = self.links[boxed_pkmn]
-            except:
+            if boxed_pkmn not in self.links:
                 continue
-            for pkmn in link:
-                self.dupes.add(pkmn)
+            family = self.snapshot.pokedex.family_id(boxed_pkmn)
+            if family is not None:
+                self.dupes |= 1 << family
 
-    def generate(self, area: str, daypart: str, type: str, encounter_power: str, check_dupes: bool, specific_pkmn=set(), print_boolean=False):
+    def generate(self, area: str, daypart: str, type: str, encounter_power: str, check_dupes: bool, specific_pkmn=set(), print_boolean=False, seed=None):
         """
         Docstring for generate
         
@@ -61,6 +55,9 @@ class Game:
         :param check_dupes: Boolean object that checks whether or not to exclude dupes. Defaults to False later if non-boolean object.
         :param specific_pkmn: Set object that if greater than one signifies that instead of calculating for all Pokemon in an area, only calculate for the ones in the set. Ignores check_dupes if non-empty set.
         :param print_boolean: Boolean object that checks whether or not to print.
+        :param seed: Integer object from 0 to rng.MAX_SEED - 1, so the same arguments give the same Pokemon. If None, a new seed is used.
+
+        The random values come from a Generator that only this call uses, see rng.stream().
         """
         # Making sure that area, daypart, and type are precleaned before checking validation.
         area = area.strip().title()
@@ -70,7 +67,38 @@ class Game:
             print("Generate arguments invalid.")
             return False
         
-        return self.alphabetical[area].generate(self.game, daypart, type, encounter_power, self.dupes, check_dupes, specific_pkmn, print_boolean)
+        seed = seed if seed is not None else rng.new_seed()
+        return self.alphabetical[area].generate(self.game, daypart, type, encounter_power, self.dupes, check_dupes, specific_pkmn, print_boolean, rng.stream(seed))
+
+    def generate_many(self, area: str, daypart: str, type: str, encounter_power: int, n: int, check_dupes: bool, specific_pkmn=set(), seed=None, start=0):
+        """
+        Docstring for generate_many
+        
+        :param self: Game object.
+        :param area: String object representing the area.
+        :param daypart: String object representing the daypart.
+        :param type: String object representing the Pokemon Type (Grass, Water, etc.).
+        :param encounter_power: Integer object related to Encounter Power (Levels 0, 1, 2, or 3).
+        :param n: Integer object, the number of Pokemon to generate.
+        :param check_dupes: Boolean object that checks whether or not to exclude dupes.
+        :param specific_pkmn: Set object that if non-empty, only the Pokemon in the set are generated. Ignores check_dupes if non-empty set.
+        :param seed: Integer object from 0 to rng.MAX_SEED - 1, so the same arguments give the same Pokemon. If None, a new seed is used.
+        :param start: Integer object, the index of the first draw. Draw i of a seed is always the same, so draws start to start + n - 1 can be replayed on their own.
+
+        Generates n Pokemon with one set of filters, and returns a list of n Pokemon names.
+        Returns False if the arguments are invalid.
+        """
+        # Making sure that area, daypart, and type are precleaned before checking validation.
+        area = area.strip().title()
+        daypart = daypart.strip().title()
+        type = type.strip().title()
+        if not Game.validate_generate_distribution_input(area, daypart, type, encounter_power):
+            print("Generate arguments invalid.")
+            return False
+
+        seed = seed if seed is not None else rng.new_seed()
+        uniforms = rng.draws(seed, start, n)
+        return self.alphabetical[area].generate_many(self.game, daypart, type, encounter_power, n, self.dupes, check_dupes, specific_pkmn, uniforms)
 
     def distribution(self, area: str, daypart: str, type: str, encounter_power: str, check_dupes: bool, specific_pkmn=set(), print_boolean=False):
         """
@@ -84,6 +112,9 @@ class Game:
         :param check_dupes: Boolean object that checks whether or not to exclude dupes. Defaults to False later if non-boolean object.
         :param specific_pkmn: Set object that if greater than one signifies that instead of calculating for all Pokemon in an area, only calculate for the ones in the set. Ignores check_dupes if non-empty set.
         :param print_boolean: Boolean object that checks whether or not to print.
+
+        Without a box or a specific subset, the distribution was already calculated by the Snapshot, see DistributionCube.
+        Otherwise it is calculated by Area.distribution().
         """
         # Making sure that area, daypart, and type are precleaned before checking validation.
         area = area.strip().title()
@@ -92,6 +123,14 @@ class Game:
         if not Game.validate_generate_distribution_input(area, daypart, type, encounter_power):
             print("Distribution arguments invalid.")
             return False
+
+        if len(specific_pkmn) == 0 and (check_dupes != True or self.dupes == 0):
+            distribution = self.snapshot.distributions.lookup(self.game, self.alphabetical[area].name, daypart, type, encounter_power)
+            if distribution is not None:
+                if print_boolean:
+                    for wild in distribution:
+                        print(f"{wild.name.split('_')[0]}: {wild.percentage}%")
+                return distribution
         
         return self.alphabetical[area].distribution(self.game, daypart, type, encounter_power, self.dupes, check_dupes, specific_pkmn, print_boolean)
 
@@ -103,68 +142,27 @@ class Game:
         :param pkmn_to_find: String representing name of Pokemon to be found.
         :param print_boolean: Boolean that determines whether to print or not.
 
-        Given a Pokemon name, every area is quickly checked if the Pokemon is listed to exist.
-        If it does, then check every daypart.
+        Given a Pokemon name, the areas and dayparts it can be found in are looked up in the Snapshot's habitats index, see Snapshot.load_habitats().
         Print the areas and its dayparts that a Pokemon can be found in.
         """
 
-        areas = self.alphabetical
         habitats = [] # A list is used instead of a set because a set does not print in the same order every time.
 
-        for area in areas.values():
-            # areas is a dictionary with K: "Area Name", V: Area object.
-            # areas.values() represents Area objects, therefore area is an Area object.
-            # native_pkmn are String objects representing the Pokemon that can be found in an area or its daypart, in format "Pokemon_Type1_Type2" or "Pokemon (Version)_Type1_Type2"
-            # First, immediately rule out areas.
-
-            # String equality is used instead of find because there is currently no logic to transform a diminutive form into a full form.
-            # Additionally there are Pokémon with different various such as Tauros (with various Combat, Blaze, and Aqua Breed).
-            # Logic to transform a diminutive form into a full form would transform into unintended forms. 
-
-            pkmn_to_find = Game.remove_version_exclusive_tag(pkmn_to_find)
-            pkmn_key = False
-            for native_pkmn in area.pokemon:
-                if Game.remove_version_exclusive_tag(native_pkmn.split("_")[0]) == pkmn_to_find:
-                    pkmn_key = native_pkmn
-                    break
-            if not pkmn_key:
-                continue
-
-            # Second, check dayparts.
-            # False if area.dawn[native_pkmn] == 0.0 else True
-            daypart_found = [False, False, False, False]
-            dayparts = [area.dawn, area.day, area.dusk, area.night]
-            for index, dp in enumerate(dayparts):
-                daypart_found[index] = True if dp[pkmn_key] > 0 else False
-
-            dawn_found = daypart_found[0]
-            day_found = daypart_found[1]
-            dusk_found = daypart_found[2]
-            night_found = daypart_found[3]
+        # String equality is used instead of find because there is currently no logic to transform a diminutive form into a full form.
+        # Additionally there are Pokémon with different various such as Tauros (with various Combat, Blaze, and Aqua Breed).
+        # Logic to transform a diminutive form into a full form would transform into unintended forms. 
+        pkmn_to_find = Game.remove_version_exclusive_tag(pkmn_to_find)
 
+        for area_name, daypart_bitmask in self.snapshot.habitats.get(pkmn_to_find, []):
             # If a Pokemon are found in every daypart, then simply the Area is named.
-            if dawn_found and day_found and dusk_found and night_found:
-                habitats.append(area.name)
+            if daypart_bitmask == 0b1111:
+                habitats.append(area_name)
             # If a Pokemon is only found in specific dayparts, then it will list which Area and dayparts it can be found in.
             # Discrepency in code name for dayparts and the display name is due to finding it is called Morning, Day, Evening, and Night later on.
-            elif dawn_found or day_found or dusk_found or night_found:
-                string = f"{area.name} ("
-                if dawn_found:
-                    string = f"{string}Morning, "
-
-                if day_found:
-                    string = f"{string}Day, "
-
-                if dusk_found:
-                    string = f"{string}Evening, "
-
-                if night_found:
-                    string = f"{string}Night, "
-
-                string = string[0:len(string)-2] + ")"
-                habitats.append(string)
             else:
-                pass # Pokemon was not found in this Area.
+                display_names = ["Morning", "Day", "Evening", "Night"]
+                found_in = [display_names[index] for index in range(4) if daypart_bitmask & (1 << index)]
+                habitats.append(f"{area_name} ({', '.join(found_in)})")
 
         # If the print boolean is flagged True, then print
         if print_boolean:
@@ -178,27 +176,20 @@ class Game:
         # Return list of Areas that it can be found in.
         return habitats
 
-    def pkmn_substring(self, query: str):
-        pkmn_list = []
-        for pkmn in self.links.keys():
-            if pkmn.strip().lower().find(query.strip().lower()) != -1:
-                pkmn_list.append(pkmn) 
-        return pkmn_list
-
-    def load_areas(self):
+    def pkmn_substring(self, query: str, limit=None):
         """
-        Docstring for load_areas
+        Docstring for pkmn_substring
         
         :param self: Game object.
+        :param query: String object that is part of a Pokemon name, such as "pik".
+        :param limit: Integer object, the most Pokemon names to return. If None, every match is returned.
 
-        Loads all areas.
+        Returns the Pokemon names that contain query, names starting with query first, see SubstringIndex.search().
         """
-        areas = Area.load_areas()
-        self.alphabetical = areas
+        return self.snapshot.substring_index.search(query, limit)
 
     def validate_pokemon(self, pkmn_name: str):
-        pokedex = list(map(lambda x: Game.remove_version_exclusive_tag(x.split(",")[0]), self.links))
-        return any(Game.remove_version_exclusive_tag(pkmn_name) == pkmn for pkmn in pokedex)
+        return self.snapshot.pokedex.validate(pkmn_name)
 
     def validate_pkmn_is_version_exclusive(self, pkmn_name: str):
         if self.validate_pokemon(pkmn_name) == False:
@@ -316,7 +307,7 @@ class Game:
         # Else if all checks are passed, return True
         return True
 
-    def process_generate_distribution_request(self, request_type: str, global_text: str, area: str, daypart: str, pkmn_type: str, encounter_power_level: int, dupes_clause_enabled_str: str, specific_pkmn_set_enabled: bool, print_enabled: bool):
+    def process_generate_distribution_request(self, request_type: str, global_text: str, area: str, daypart: str, pkmn_type: str, encounter_power_level: int, dupes_clause_enabled_str: str, specific_pkmn_set_enabled: bool, print_enabled: bool, n=1, seed=None, box=None, start=0):
         """
         Docstring for process_distribution_request
         
@@ -330,29 +321,29 @@ class Game:
         :param dupes_clause_enabled_str: Represents whether or not Dupes Clause is to be used, values are "Yes" or "No".
         :param specific_pkmn_set_enabled: Boolean object that represents whether or not a specific subset of Pokémon are to be used instead of all of the Pokémon in an area and time.
         :param print_enabled: Boolean object that represents whether or not to print the result in the console.
+        :param n: Integer object, the number of Pokémon to generate when request_type is "generate_many".
+        :param seed: Integer object used to seed the random number generator when request_type is "generate" or "generate_many", or None for a new seed.
+        :param box: Box object holding the Pokémon the user owns, or None. If given, global_text is not parsed, and the dupes kept by the Box are used.
+        :param start: Integer object, the index of the first draw when request_type is "generate_many", see generate_many().
         
-        This function is used to process both HTTP requests for generate and distribution because the preprocessing steps and variables are identical.
+        This function is used to process HTTP requests for generate, generate_many, and distribution because the preprocessing steps and variables are identical.
         Having two separate functions for processing both would be unnecessary duplication. 
         """
         
-        # For parsing the textbox, the operations are applied in the following order:
-        # 1) Split into an array by "," to get each Pokémon
-        # 2) Remove whitespace from each Pokémon
-        # 3) Check if the Pokémon names are real, if not, replace with False. For the remaining real ones, remove version exclusive tags "(Scarlet)" or "(Violet)"
-        # 4) Remove False values from previous step
-        # 5) For the Pokémon left, add version exclusive tags to applicable Pokémon
-        # 6) Textbox is done parsing and ready to be used 
-        self.box = []
-        pkmn_list = global_text.split(",")
-        pkmn_list = list(map(lambda x: x.strip(), pkmn_list)) # Remove whitespace
-        pkmn_list = list(map(lambda x: Game.remove_version_exclusive_tag(x) if self.validate_pokemon(x) else False, pkmn_list)) # Checks Pokemon name, filters out fake names, and removes version exclusive tags from remaining
-        pkmn_list = [pkmn for pkmn in pkmn_list if pkmn] # Filters out False
-        pkmn_list = list(map(lambda x: Game.add_version_exclusive_tag(x), pkmn_list))
-        self.box = pkmn_list
+        # A Box was already parsed when its Pokémon were added, and already keeps its dupes
+        # Otherwise, the textbox is parsed, see Box.parse()
+        box_dupes = None
+        if box is not None:
+            self.box, box_dupes, etag = box.state()
+        else:
+            self.box = Box.parse(self.snapshot.pokedex, global_text)
         
         dupes_clause_enabled_bool = True if dupes_clause_enabled_str == "Yes" else False
         if dupes_clause_enabled_bool:
-            self.populate_dupes()
+            if box_dupes is not None:
+                self.dupes = box_dupes
+            else:
+                self.populate_dupes()
 
         subset = set()
         if specific_pkmn_set_enabled:
@@ -360,8 +351,11 @@ class Game:
     
         
         if request_type.strip().lower() == "generate":
-            return self.generate(area, daypart, pkmn_type, encounter_power_level, dupes_clause_enabled_bool, subset, print_enabled)
+            return self.generate(area, daypart, pkmn_type, encounter_power_level, dupes_clause_enabled_bool, subset, print_enabled, seed)
         
+        elif request_type.strip().lower() == "generate_many":
+            return self.generate_many(area, daypart, pkmn_type, encounter_power_level, n, dupes_clause_enabled_bool, subset, seed, start)
+
         elif request_type.strip().lower() == "distribution":
             return self.distribution(area, daypart, pkmn_type, encounter_power_level, dupes_clause_enabled_bool, subset, print_enabled)
 
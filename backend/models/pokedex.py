@@ -0,0 +1,183 @@
+import hashlib
+import json
+
+class Pokedex:
+    shared_pokedex = None
+
+    def __init__(self, links=None):
+        """
+        Docstring for __init__
+
+        :param self: Pokedex object.
+        :param links: Dictionary with the format: K: Pokemon name as written in links.txt, V: list of linked Pokemon; typically Snapshot.links. If None, links.txt is read.
+
+        canonical is a dictionary with the format: K: normalized name, V: Pokemon name as written in links.txt, such as K: "Deino", V: "Deino (Scarlet)".
+        Normalized names are made by normalize(), so any spelling of a Pokemon that differs in case, whitespace, or version exclusive tag has the same key.
+        This replaces scanning (and reading) the whole Pokedex every time a name is checked or tagged.
+
+        families is a dictionary with the format: K: lowercase Pokemon name, V: Integer family ID, see load_families().
+        family_count is the number of families; family IDs range from 0 to family_count - 1.
+        family_key is a String hash of families. Pokedex objects loaded from the same links have the same family_key, even in other processes,
+        so a family bitset saved with one of them (see BoxStore) can be checked to still be valid.
+
+        hits and misses count how many lookups found a Pokemon, and how many did not.
+        """
+        if links is None:
+            links = {}
+            with open(r"data/pokedex/links.txt", "r") as f1:
+                for line in f1.readlines():
+                    pkmn_list = line.strip().split(",")
+                    links[pkmn_list[0]] = pkmn_list[1].split("_")
+
+        self.canonical = {}
+        for pkmn in links:
+            self.canonical[Pokedex.normalize(pkmn)] = pkmn
+
+        self.families = {}
+        self.family_count = 0
+        self.load_families(links)
+        self.family_key = hashlib.sha256(json.dumps(sorted(self.families.items())).encode("utf-8")).hexdigest()[:32]
+
+        self.hits = 0
+        self.misses = 0
+
+    def load_families(self, links):
+        """
+        Docstring for load_families
+
+        :param self: Pokedex object.
+        :param links: Dictionary with the format: K: Pokemon name, V: list of Pokemon it is linked to (its evolutionary line).
+
+        Every Pokemon that is linked to another, directly or through other Pokemon, is given the same family ID with a union-find.
+        The Dupes Clause can then be checked by family ID: a Pokemon is a dupe if its family ID is in the box's set of family IDs.
+        Family IDs are numbered in the order their first Pokemon appears in links.txt.
+        """
+        parent = {}
+
+        def find(pkmn):
+            while parent[pkmn] != pkmn:
+                parent[pkmn] = parent[parent[pkmn]] # Path halving
+                pkmn = parent[pkmn]
+            return pkmn
+
+        for header_pkmn, linked_pkmn in links.items():
+            for pkmn in [header_pkmn] + linked_pkmn:
+                parent.setdefault(pkmn.lower(), pkmn.lower())
+            for pkmn in linked_pkmn:
+                root_a = find(header_pkmn.lower())
+                root_b = find(pkmn.lower())
+                if root_a != root_b:
+                    parent[root_b] = root_a
+
+        root_ids = {}
+        for pkmn in parent:
+            root = find(pkmn)
+            if root not in root_ids:
+                root_ids[root] = len(root_ids)
+            self.families[pkmn] = root_ids[root]
+        self.family_count = len(root_ids)
+
+    def family_id(self, pkmn_name: str):
+        """
+        Docstring for family_id
+
+        :param self: Pokedex object.
+        :param pkmn_name: String object that represents the Pokémon's name exactly as in links.txt, apart from case, such as "Armarouge (Scarlet)".
+
+        Returns the Integer family ID of the Pokemon, or None if it has no family in links.txt.
+        """
+        return self.families.get(pkmn_name.strip().lower())
+
+    def family_bitset(self, pkmn_names):
+        """
+        Docstring for family_bitset
+
+        :param self: Pokedex object.
+        :param pkmn_names: Iterable of Strings representing Pokemon names, see family_id().
+
+        Returns an Integer where bit i is set if a Pokemon in pkmn_names has family ID i. Names without a family are ignored.
+        """
+        bitset = 0
+        for pkmn_name in pkmn_names:
+            family = self.family_id(pkmn_name)
+            if family is not None:
+                bitset |= 1 << family
+        return bitset
+
+    def shared():
+        """
+        Docstring for shared
+
+        Returns the Pokedex object used by the static functions Area.add_version_exclusive_tag() and Game.add_version_exclusive_tag().
+        It is loaded the first time it is needed, unless a Snapshot has already set it.
+        """
+        if Pokedex.shared_pokedex is None:
+            Pokedex.shared_pokedex = Pokedex()
+        return Pokedex.shared_pokedex
+
+    def normalize(pkmn_name: str):
+        """
+        Docstring for normalize
+
+        :param pkmn_name: String object that represents the Pokémon's name, in any case, with or without a version exclusive tag.
+
+        This function will transform a value such as " deino (scarlet) " to "Deino".
+        """
+        pkmn_name = pkmn_name.strip().lower()
+        if pkmn_name.find("scarlet") != -1 or pkmn_name.find("violet") != -1:
+            pkmn_name = pkmn_name.replace("(scarlet)", " ")
+            pkmn_name = pkmn_name.replace("(violet)", " ")
+            pkmn_name = pkmn_name.strip()
+        return pkmn_name.title()
+
+    def lookup(self, pkmn_name: str):
+        """
+        Docstring for lookup
+
+        :param self: Pokedex object.
+        :param pkmn_name: String object that represents the Pokémon's name, in any spelling accepted by normalize().
+
+        Returns the Pokemon name as written in links.txt, such as "Deino (Scarlet)" for "deino", or None if it is not a real Pokemon.
+        """
+        pkmn = self.canonical.get(Pokedex.normalize(pkmn_name))
+        if pkmn is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return pkmn
+
+    def validate(self, pkmn_name: str):
+        """
+        Docstring for validate
+
+        :param self: Pokedex object.
+        :param pkmn_name: String object that represents the Pokémon's name.
+
+        Returns whether or not the Pokemon is in the Pokedex.
+        """
+        return self.lookup(pkmn_name) is not None
+
+    def add_version_exclusive_tag(self, pkmn_name: str):
+        """
+        Docstring for add_version_exclusive_tag
+
+        :param self: Pokedex object.
+        :param pkmn_name: String object that represents the Pokémon's name, such as "Deino".
+
+        Returns the name with its version exclusive tag, such as "Deino (Scarlet)", if the Pokemon is version exclusive.
+        Otherwise, simply returns a reformatted name.
+        """
+        pkmn = self.lookup(pkmn_name)
+        if pkmn is not None and (pkmn.find("Scarlet") != -1 or pkmn.find("Violet") != -1):
+            return pkmn
+        return pkmn_name.strip().title()
+
+    def stats(self):
+        """
+        Docstring for stats
+
+        :param self: Pokedex object.
+
+        Returns a dictionary of the lookup counters.
+        """
+        return {"size": len(self.canonical), "families": self.family_count, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,136 @@
+import numpy as np
+from models.area import Area
+
+class Route:
+    def __init__(self, snapshot, game: str, daypart: str, area_names=None):
+        """
+        Docstring for __init__
+
+        :param self: Route object.
+        :param snapshot: Snapshot object holding the loaded areas and Pokedex.
+        :param game: String object representing game, either "Scarlet" or "Violet".
+        :param daypart: Precleaned String object that represents the daypart of every encounter, possible values are: "Dawn", "Day", "Dusk", and "Night".
+        :param area_names: List of area names in the order they are visited, each visited once. If None, Area.route_order() is used.
+
+        Calculates the exact chance of every encounter along a route under the Dupes Clause, where one Pokemon is caught in every area
+        and every capture becomes a dupe for the areas after it. See probabilities().
+
+        areas is a list of tuples of (Area object, eligible rows, weights of those rows, families of those rows), one per area.
+        future_families is a list with, for every area, a boolean vector over family IDs that is True for families that can still be encountered after it.
+        """
+        self.game = game
+        self.family_count = snapshot.pokedex.family_count
+        daypart_index = ["Dawn", "Day", "Dusk", "Night"].index(daypart)
+        area_names = area_names if area_names is not None else Area.route_order()
+
+        self.areas = []
+        for area_name in area_names:
+            area = snapshot.alphabetical[area_name]
+            daypart_selected = area.weights[:, daypart_index]
+            rows = np.flatnonzero(area.version_mask(game) & (daypart_selected > 0))
+            self.areas.append((area, rows, daypart_selected[rows], area.families[rows]))
+
+        # Whether a family has been caught only matters for the areas where it can still be encountered.
+        self.future_families = []
+        future = np.zeros(self.family_count + 1, dtype=bool)
+        for area, rows, weights, families in reversed(self.areas):
+            self.future_families.append(future.copy())
+            future[families] = True
+        self.future_families.reverse()
+        self.first_families = future # Families that can be encountered anywhere on the route
+
+        # Pokemon without a family are never dupes, so their family is never remembered.
+        for future in self.future_families + [self.first_families]:
+            future[self.family_count] = False
+
+    def probabilities(self, box_dupes=0, min_probability=1e-9, max_states=5000):
+        """
+        Docstring for probabilities
+
+        :param self: Route object.
+        :param box_dupes: Integer bitset of the families already owned before the route, see Game.dupes.
+        :param min_probability: Float object; states (sets of caught families) less likely than this are dropped.
+        :param max_states: Integer object, the most states kept after each area; the least likely ones are dropped.
+
+        A state is the set of families caught so far, stored as a row of a boolean matrix, and has the chance of reaching it.
+        For every area, in order:
+        1) In every state, Pokemon whose family was caught are dupes, and the chance of each remaining Pokemon is its weight over the remaining weight.
+        2) Every state splits into one new state per Pokemon that can be caught. If nothing can be caught, the state is kept as is.
+        3) Families that cannot be encountered in any later area are forgotten, then identical states are merged by adding their chances.
+        4) States below min_probability, or beyond the max_states most likely ones, are dropped (pruned).
+
+        The number of states grows quickly with the number of areas: routes of about 8 areas stay exact with the default limits,
+        while longer routes prune more and more of the chance, which is reported so that results can be judged.
+
+        Returns a dictionary with:
+        - areas: list of (area name, list of (Pokemon name, chance of catching it there) from most to least likely, chance of no encounter, expected dupes skipped)
+        - species: list of (Pokemon name, expected number of catches on the route), from most to least likely.
+          A family can only be caught once, so this is the chance of catching the Pokemon, apart from Pokemon without a family in links.txt.
+        - pruned: total chance dropped by pruning, an upper bound on the error of every chance
+        - states: the most states held at once
+        """
+        owned = np.zeros((1, self.family_count + 1), dtype=bool)
+        for family in range(self.family_count):
+            if (box_dupes >> family) & 1:
+                owned[0, family] = True
+        owned[:, ~self.first_families] = False
+        chances = np.ones(1, dtype=np.float64)
+
+        results = []
+        species_chances = {}
+        pruned = 0.0
+        most_states = 1
+        for index, (area, rows, weights, families) in enumerate(self.areas):
+            pkmn_chances = {}
+            if len(rows) == 0:
+                results.append((area.name, [], float(chances.sum()), 0.0))
+                continue
+
+            # 1) Chance of every Pokemon in every state
+            remaining = np.where(owned[:, families], 0.0, weights)
+            total = remaining.sum(axis=1)
+            has_encounter = total > 0
+            transition = np.zeros_like(remaining)
+            transition[has_encounter] = remaining[has_encounter] / total[has_encounter, None] * chances[has_encounter, None]
+
+            no_encounter = float(chances[~has_encounter].sum())
+            # Encounters until a non-dupe follow a geometric distribution, so the expected dupes skipped are (1 - q) / q for a non-dupe chance q.
+            non_dupe_chance = total[has_encounter] / weights.sum()
+            expected_skips = float((chances[has_encounter] * (1 - non_dupe_chance) / non_dupe_chance).sum())
+
+            for column, chance in enumerate(transition.sum(axis=0)):
+                pkmn_name = area.pokemon[rows[column]].split("_")[0]
+                pkmn_chances[pkmn_name] = pkmn_chances.get(pkmn_name, 0.0) + float(chance)
+                species_chances[pkmn_name] = species_chances.get(pkmn_name, 0.0) + float(chance)
+            pkmn_list = sorted(((pkmn_name, chance) for pkmn_name, chance in pkmn_chances.items() if chance > 0), key=lambda x: -x[1])
+            results.append((area.name, pkmn_list, no_encounter, expected_skips))
+
+            # 2) Split every state by the Pokemon caught
+            state_index, column_index = np.nonzero(transition)
+            new_owned = owned[state_index]
+            new_owned[np.arange(len(state_index)), families[column_index]] = True
+            new_chances = transition[state_index, column_index]
+            if no_encounter > 0:
+                new_owned = np.concatenate([new_owned, owned[~has_encounter]])
+                new_chances = np.concatenate([new_chances, chances[~has_encounter]])
+
+            # 3) Forget families that no longer matter, then merge identical states
+            new_owned[:, ~self.future_families[index]] = False
+            packed = np.packbits(new_owned, axis=1)
+            keys = np.ascontiguousarray(packed).view(np.dtype((np.void, packed.shape[1]))).ravel()
+            unique_keys, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            owned = new_owned[first_index]
+            chances = np.bincount(inverse.ravel(), weights=new_chances, minlength=len(unique_keys))
+            most_states = max(most_states, len(chances))
+
+            # 4) Prune unlikely states
+            keep = chances >= min_probability
+            if keep.sum() > max_states:
+                keep = np.zeros(len(chances), dtype=bool)
+                keep[np.argpartition(-chances, max_states)[:max_states]] = True
+            pruned += float(chances[~keep].sum())
+            owned = owned[keep]
+            chances = chances[keep]
+
+        species = sorted(species_chances.items(), key=lambda x: -x[1])
+        return {"areas": results, "species": [(pkmn_name, chance) for pkmn_name, chance in species if chance > 0], "pruned": pruned, "states": most_states}
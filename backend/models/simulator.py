@@ -0,0 +1,167 @@
+import numpy as np
+from models.area import Area
+from modules import encounter_tables as et
+
+class Simulator:
+    def __init__(self, snapshot, game: str, daypart: str, check_dupes: bool, box_dupes=0):
+        """
+        Docstring for __init__
+
+        :param self: Simulator object.
+        :param snapshot: Snapshot object holding the loaded areas and Pokedex.
+        :param game: String object representing game, either "Scarlet" or "Violet".
+        :param daypart: Precleaned String object that represents the daypart of every encounter, possible values are: "Dawn", "Day", "Dusk", and "Night".
+        :param check_dupes: Boolean flag that represents whether or not the Dupes Clause is used.
+        :param box_dupes: Integer bitset of the families already owned when a run starts, see Game.dupes.
+
+        Simulates whole nuzlocke runs: one encounter in every area, in the order of Area.route_order().
+        When the Dupes Clause is used, every capture becomes a dupe for the areas after it, and dupes that are encountered are skipped until a non-dupe is encountered.
+
+        Many runs are simulated at once: every run is a row of a NumPy matrix, so each area is a handful of array operations for every run together.
+
+        route is a list of tuples of (Area object, eligible rows, weights of those rows), one per area.
+        species is a list of Pokemon names without Types, and species_ids maps every eligible row of every area to its index in species.
+        """
+        self.game = game
+        self.check_dupes = check_dupes
+        self.family_count = snapshot.pokedex.family_count
+        self.box_dupes = box_dupes
+        daypart_index = ["Dawn", "Day", "Dusk", "Night"].index(daypart)
+
+        self.route = []
+        self.species = []
+        self.species_ids = []
+        species_index = {}
+        for area_name in Area.route_order():
+            area = snapshot.alphabetical[area_name]
+            daypart_selected = area.weights[:, daypart_index]
+            rows = np.flatnonzero(area.version_mask(game) & (daypart_selected > 0))
+            self.route.append((area, rows, daypart_selected[rows]))
+
+            ids = []
+            for row in rows:
+                pkmn_name = area.pokemon[row].split("_")[0]
+                if pkmn_name not in species_index:
+                    species_index[pkmn_name] = len(self.species)
+                    self.species.append(pkmn_name)
+                ids.append(species_index[pkmn_name])
+            self.species_ids.append(np.array(ids, dtype=np.intp))
+
+    def new_totals(self):
+        """
+        Docstring for new_totals
+
+        :param self: Simulator object.
+
+        Returns a dictionary of zeroed counters, in the format returned by simulate().
+        """
+        return {
+            "runs": 0,
+            "species": np.zeros(len(self.species), dtype=np.int64), # Number of runs where each species was caught
+            "types": np.zeros(len(et.TYPES), dtype=np.int64), # Number of runs where each Type was covered by a catch
+            "type_count": 0, # Sum over runs of the number of Types covered
+            "skips": np.zeros(len(self.route), dtype=np.int64), # Sum over runs of the dupes skipped in each area
+            "no_encounter": np.zeros(len(self.route), dtype=np.int64), # Number of runs where an area had nothing that could be caught
+        }
+
+    def merge(totals, other):
+        """
+        Docstring for merge
+
+        :param totals: Dictionary returned by simulate() or new_totals(); it is updated in place.
+        :param other: Dictionary returned by simulate().
+
+        Adds the counters of other to totals, so runs simulated separately (such as in other processes) can be combined.
+        """
+        for key in totals:
+            totals[key] = totals[key] + other[key]
+        return totals
+
+    def simulate(self, runs: int, seed=None):
+        """
+        Docstring for simulate
+
+        :param self: Simulator object.
+        :param runs: Integer object, the number of runs to simulate at once. Memory grows with runs times the number of Pokemon in an area.
+        :param seed: Seed for NumPy's random number generator (such as an Integer or a SeedSequence), or None.
+
+        For every area, in every run:
+        1) Pokemon whose family has already been caught in the run are dupes, and have their weight set to 0 if the Dupes Clause is used.
+        2) One Pokemon is chosen from the remaining weights, and its family, species, and Types are recorded.
+        3) The number of dupes encountered before it is drawn: each encounter is a non-dupe with probability (remaining weight / total weight).
+        If every Pokemon in the area is a dupe, nothing is caught in that area.
+
+        Returns a dictionary of counters, see new_totals().
+        """
+        rng = np.random.default_rng(seed)
+        totals = self.new_totals()
+        totals["runs"] = runs
+
+        # One extra column for Pokemon without a family, which are never dupes.
+        owned = np.zeros((runs, self.family_count + 1), dtype=bool)
+        for family in range(self.family_count):
+            if (self.box_dupes >> family) & 1:
+                owned[:, family] = True
+        caught = np.zeros((runs, len(self.species)), dtype=bool)
+        type_bits = np.zeros(runs, dtype=np.uint32)
+
+        for index, (area, rows, weights) in enumerate(self.route):
+            if len(rows) == 0:
+                totals["no_encounter"][index] += runs
+                continue
+            families = area.families[rows]
+
+            if self.check_dupes:
+                remaining = np.where(owned[:, families], 0.0, weights)
+            else:
+                remaining = np.broadcast_to(weights, (runs, len(rows)))
+            cumulative = np.cumsum(remaining, axis=1)
+            total = cumulative[:, -1]
+            has_encounter = total > 0
+            totals["no_encounter"][index] += runs - int(has_encounter.sum())
+
+            # The chosen Pokemon is the first one whose cumulative weight is above the random value.
+            values = rng.random(runs) * total
+            choice = np.minimum((cumulative <= values[:, None]).sum(axis=1), len(rows) - 1)
+
+            chosen_runs = np.flatnonzero(has_encounter)
+            chosen = choice[chosen_runs]
+            if self.check_dupes:
+                non_dupe_chance = total[chosen_runs] / weights.sum()
+                totals["skips"][index] += int((rng.geometric(np.minimum(non_dupe_chance, 1.0)) - 1).sum())
+                owned[chosen_runs, families[chosen]] = True
+                owned[:, self.family_count] = False
+            caught[chosen_runs, self.species_ids[index][chosen]] = True
+            type_bits[chosen_runs] |= area.types[rows[chosen]]
+
+        totals["species"] += caught.sum(axis=0)
+        for bit in range(len(et.TYPES)):
+            covered = (type_bits >> bit) & 1
+            totals["types"][bit] += int(covered.sum())
+            totals["type_count"] += int(covered.sum())
+        return totals
+
+    def summary(self, totals):
+        """
+        Docstring for summary
+
+        :param self: Simulator object.
+        :param totals: Dictionary returned by simulate(), or merged by merge().
+
+        Returns a dictionary of the statistics per run:
+        - species: list of (Pokemon name, probability of being caught in a run), from most to least likely, leaving out Pokemon never caught
+        - type_coverage: dictionary of K: Type, V: probability that a run catches a Pokemon with that Type
+        - expected_types: average number of Types covered by a run
+        - expected_skips: average number of dupes skipped in a run
+        - areas: list of (area name, average dupes skipped, probability that nothing can be caught), in route order
+        """
+        runs = max(totals["runs"], 1)
+        order = np.argsort(-totals["species"], kind="stable")
+        return {
+            "runs": totals["runs"],
+            "species": [(self.species[i], float(totals["species"][i] / runs)) for i in order if totals["species"][i] > 0],
+            "type_coverage": {type: float(totals["types"][bit] / runs) for bit, type in enumerate(et.TYPES)},
+            "expected_types": float(totals["type_count"] / runs),
+            "expected_skips": float(totals["skips"].sum() / runs),
+            "areas": [(area.name, float(totals["skips"][i] / runs), float(totals["no_encounter"][i] / runs)) for i, (area, rows, weights) in enumerate(self.route)],
+        }
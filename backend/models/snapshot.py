@@ -0,0 +1,124 @@
+from models.area import Area
+from models.distribution_cube import DistributionCube
+from models.pokedex import Pokedex
+import os
+from modules import encounter_tables as et
+from modules.spatial_index import SpatialIndex
+from modules.substring_index import SubstringIndex
+
+class Snapshot:
+    def __init__(self, version=1):
+        """
+        Docstring for __init__
+
+        :param self: Snapshot object.
+        :param version: Integer object that identifies which load of the data files this Snapshot represents.
+
+        A Snapshot holds all of the encounter data that is read from the data folder: the Pokedex links and every Area.
+        This data does not change between requests and does not depend on the game version (Scarlet or Violet),
+        since version exclusivity is filtered when a generation or distribution is calculated.
+        Therefore a single Snapshot is loaded once and shared by every Game object, which only hold per-request state (box, dupes).
+
+        Nothing should modify a Snapshot after it has been loaded.
+
+        links is a dictionary with the format: K: Pokemon name as str, V: list of Strings representing the Pokemon it is linked to.
+        alphabetical is a dictionary with the format: K: "Area Name", V: Area object.
+        tables is the memory-mapped EncounterTables object the areas were loaded from, or None if they were loaded from the CSV files.
+        habitats is a dictionary with the format: K: Pokemon name without version exclusive tag, V: list of tuples of ("Area Name", daypart bitmask), see load_habitats().
+        substring_index is a SubstringIndex object over the Pokemon names in links, used by Game.pkmn_substring().
+        pokedex is a Pokedex object built from links, used to validate and tag Pokemon names, and given to every Area so their family IDs match it.
+        The first Snapshot of a process also becomes the shared Pokedex (see Pokedex.shared()); a reloaded Snapshot does not replace it until it is served, see swap_snapshot() in main.py.
+        distributions is a DistributionCube object holding every distribution without a box or subset, used by Game.distribution().
+        spatial is a dictionary with the format: K: "Area Name", V: SpatialIndex object of where its biomes are, see load_spatial().
+        """
+        self.version = version
+        self.links = {}
+        self.alphabetical = {}
+        self.tables = None
+        self.habitats = {}
+
+        self.load_links()
+        self.pokedex = Pokedex(self.links)
+        if Pokedex.shared_pokedex is None:
+            Pokedex.shared_pokedex = self.pokedex
+        self.load_areas()
+        self.load_habitats()
+        self.substring_index = SubstringIndex(self.links.keys())
+        self.distributions = DistributionCube(self.alphabetical)
+        self.spatial = {}
+        self.load_spatial()
+
+    def load_links(self):
+        """
+        Docstring for load_links
+
+        :param self: Snapshot object.
+
+        This function will read the links.txt, which contain a Pokemon, and the Pokemon it is connected to that are considered "dupes".
+        These links will be parsed and added to a dictionary.
+        """
+        links = ""
+        with open(r"data/pokedex/links.txt", "r") as f1:
+            links = f1.readlines()
+        for line in links:
+            pkmn_list = line.strip().split(",")
+            header_pkmn = pkmn_list[0]
+            linked_pkmn = pkmn_list[1].split("_")
+            self.links[header_pkmn] = linked_pkmn
+
+    def load_areas(self):
+        """
+        Docstring for load_areas
+
+        :param self: Snapshot object.
+
+        Loads all areas.
+        If the compiled encounter tables built by compile_data.py are present and up to date, they are memory-mapped instead of parsing the CSV files.
+        """
+        if not et.is_stale():
+            try:
+                self.tables = et.EncounterTables()
+            except ValueError as e:
+                print(f"{e} Loading the CSV files instead.")
+        self.alphabetical = Area.load_areas(self.tables, self.pokedex)
+
+    def load_spatial(self):
+        """
+        Docstring for load_spatial
+
+        :param self: Snapshot object.
+
+        Loads the spatial index of every area that has one, written by biome_distribution.py to data/spatial.
+        Areas without biome images (Cabo Poco and Great Crater of Paldea) have none.
+        """
+        for area_name, area in self.alphabetical.items():
+            file_path = f"data/spatial/{area.snake_case_name}.npz"
+            if os.path.exists(file_path):
+                self.spatial[area_name] = SpatialIndex.load(file_path)
+
+    def load_habitats(self):
+        """
+        Docstring for load_habitats
+
+        :param self: Snapshot object.
+
+        Builds an index from every Pokemon to the areas and dayparts that it can be found in, used by Game.locate().
+        Pokemon names are stored as Area.remove_version_exclusive_tag() of the name, such as "Deino" for "Deino (Scarlet)".
+        The daypart bitmask has bit 0 set for Dawn, bit 1 for Day, bit 2 for Dusk, and bit 3 for Night, if the Pokemon has a probability weight above 0 in that daypart.
+        Areas are listed in alphabetical order, and areas where a Pokemon has no probability weight in any daypart are left out.
+        """
+        for area in self.alphabetical.values():
+            found = set()
+            for row, native_pkmn in enumerate(area.pokemon):
+                pkmn_key = Area.remove_version_exclusive_tag(native_pkmn.split("_")[0])
+                # Only the first identifier of a Pokemon in an area is used.
+                if pkmn_key in found:
+                    continue
+                found.add(pkmn_key)
+
+                daypart_bitmask = 0
+                for index in range(4):
+                    if area.weights[row, index] > 0:
+                        daypart_bitmask |= 1 << index
+                if daypart_bitmask != 0:
+                    self.habitats.setdefault(pkmn_key, []).append((area.name, daypart_bitmask))
@@ -0,0 +1,105 @@
+import random
+import threading
+import numpy as np
+from collections import OrderedDict
+
+class AliasTable:
+    def __init__(self, names, weights):
+        """
+        Docstring for __init__
+
+        :param self: AliasTable object.
+        :param names: List of Strings representing what can be sampled, such as Pokemon identifiers.
+        :param weights: List of floats, the probability weight of each name. Weights must not be negative, and must not all be 0.
+
+        Builds a Walker/Vose alias table, so that sample() chooses a name in O(1) regardless of how many names there are.
+        Every column i is chosen uniformly, then kept with probability self.probability[i], otherwise replaced by self.alias[i].
+        """
+        count = len(names)
+        total = sum(weights)
+        self.names = list(names)
+        self.probability = [0.0] * count
+        self.alias = [0] * count
+
+        scaled = [weight * count / total for weight in weights]
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left over is 1.0 apart from floating point error.
+        for i in large + small:
+            self.probability[i] = 1.0
+
+    def sample(self, rng=random):
+        """
+        Docstring for sample
+
+        :param self: AliasTable object.
+        :param rng: Object with a random() method returning a float in [0, 1), such as the random module or a random.Random object.
+        """
+        value = rng.random() * len(self.names)
+        column = int(value)
+        if value - column < self.probability[column]:
+            return self.names[column]
+        return self.names[self.alias[column]]
+
+    def sample_many(self, uniforms):
+        """
+        Docstring for sample_many
+
+        :param self: AliasTable object.
+        :param uniforms: NumPy vector of floats in [0, 1).
+
+        Returns a NumPy vector of the names chosen by uniforms, one per value.
+        Each value chooses the same name as sample() would if rng.random() returned that value, so a batch of draws matches single draws.
+        """
+        values = uniforms * len(self.names)
+        columns = values.astype(np.int64)
+        keep = values - columns < np.asarray(self.probability)[columns]
+        rows = np.where(keep, columns, np.asarray(self.alias)[columns])
+        return np.array(self.names, dtype=object)[rows]
+
+class AliasCache:
+    def __init__(self, max_size=128):
+        """
+        Docstring for __init__
+
+        :param self: AliasCache object.
+        :param max_size: Integer object, the most AliasTable objects kept before the least recently used one is dropped.
+
+        Holds AliasTable objects keyed by the filters they were built with, so that a table is only rebuilt when the filters change.
+        The cache is bounded because boxes differ between users, and each distinct box is a distinct key.
+        """
+        self.max_size = max_size
+        self.tables = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, build):
+        """
+        Docstring for get
+
+        :param self: AliasCache object.
+        :param key: Hashable object describing the filters.
+        :param build: Function with no arguments that returns the AliasTable (or None if nothing is eligible) for key.
+        """
+        with self.lock:
+            if key in self.tables:
+                self.tables.move_to_end(key)
+                return self.tables[key]
+
+        table = build()
+        with self.lock:
+            self.tables[key] = table
+            if len(self.tables) > self.max_size:
+                self.tables.popitem(last=False)
+        return table
@@ -0,0 +1,175 @@
+# Binary format for compiled encounter tables.
+# Written by compile_data.py, and memory-mapped by Snapshot objects at startup so that no CSV text has to be parsed.
+#
+# Layout (little-endian):
+#   Header:           magic (4 bytes), format version (uint32), identifier count (uint32), area count (uint32)
+#   Identifier table: for every identifier, its length (uint16) followed by UTF-8 bytes, e.g. "Larvitar (Scarlet)_Rock_Ground"
+#   Area directory:   for every area, its name, row count (uint32), rows offset (uint32), biome count (uint16), then every biome name and multiplier (float64)
+#   Area rows:        for every area, aligned to 8 bytes:
+#                       identifier IDs (uint32 * rows), type bitmasks (uint32 * rows),
+#                       weights (float64 * rows) for Dawn, then Day, then Dusk, then Night
+# Strings are stored as a uint16 length followed by UTF-8 bytes.
+
+import mmap
+import os
+import struct
+
+MAGIC = b"SVET"
+FORMAT_VERSION = 2
+DAYPARTS = ["Dawn", "Day", "Dusk", "Night"]
+TYPES = ["Normal","Fighting","Flying","Poison","Ground","Rock","Bug","Ghost","Steel","Fire","Water","Grass","Electric","Psychic","Ice","Dragon","Dark","Fairy"]
+DEFAULT_PATH = "data/compiled/encounters.bin"
+SOURCE_FOLDERS = ["data/probability_insert", "data/distribution"]
+
+def type_mask(type_names):
+    """
+    Docstring for type_mask
+
+    :param type_names: Iterable of Strings representing Pokemon Types, such as ["Water", "Flying"].
+    :return: Integer where bit i is set if TYPES[i] is one of the types. Names that are not a Type are ignored.
+
+    A note in parentheses after a Type, such as "Ground (East Sea)", is ignored so that the Type is still recorded.
+    """
+    mask = 0
+    for type_name in type_names:
+        type_name = type_name.split(" (")[0]
+        if type_name in TYPES:
+            mask |= 1 << TYPES.index(type_name)
+    return mask
+
+def _pack_string(string):
+    encoded = string.encode("utf-8")
+    return struct.pack("<H", len(encoded)) + encoded
+
+def _unpack_string(buffer, offset):
+    length, = struct.unpack_from("<H", buffer, offset)
+    offset += 2
+    return bytes(buffer[offset:offset+length]).decode("utf-8"), offset + length
+
+def write_tables(path, areas):
+    """
+    Docstring for write_tables
+
+    :param path: Path of the file to write.
+    :param areas: Dictionary with format K: "Area Name", V: Area object loaded from the CSV files.
+
+    Every identifier (such as "Dugtrio_Ground") is interned once in the identifier table, and each area only stores the integer IDs.
+    The file is written under another name and then renamed, so a server that has the old file memory-mapped keeps reading the old data.
+    """
+    identifiers = []
+    identifier_ids = {}
+    for area in areas.values():
+        for identifier in area.pokemon:
+            if identifier not in identifier_ids:
+                identifier_ids[identifier] = len(identifiers)
+                identifiers.append(identifier)
+
+    header = struct.pack("<4sIII", MAGIC, FORMAT_VERSION, len(identifiers), len(areas))
+    identifier_table = b"".join(_pack_string(identifier) for identifier in identifiers)
+
+    # The directory has to be sized before the row offsets are known, so it is built twice.
+    def build_directory(offsets):
+        directory = b""
+        for index, area in enumerate(areas.values()):
+            directory += _pack_string(area.name)
+            directory += struct.pack("<IIH", len(area.pokemon), offsets[index], len(area.biome_multipliers))
+            for biome, multiplier in area.biome_multipliers.items():
+                directory += _pack_string(biome) + struct.pack("<d", multiplier)
+        return directory
+
+    directory_size = len(build_directory([0] * len(areas)))
+    position = len(header) + len(identifier_table) + directory_size
+    offsets = []
+    row_blocks = []
+    for area in areas.values():
+        padding = (-position) % 8
+        position += padding
+        offsets.append(position)
+
+        ids = [identifier_ids[identifier] for identifier in area.pokemon]
+        masks = area.types.tolist()
+        # Transposing the weights matrix gives one block per daypart.
+        weights = area.weights.T.ravel().tolist()
+
+        count = len(area.pokemon)
+        block = b"\0" * padding + struct.pack(f"<{count}I{count}I{4*count}d", *ids, *masks, *weights)
+        row_blocks.append(block)
+        position += len(block) - padding
+
+    directory = build_directory(offsets)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as f1:
+        f1.write(header + identifier_table + directory + b"".join(row_blocks))
+    os.replace(temporary_path, path)
+
+def is_stale(path=DEFAULT_PATH):
+    """
+    Docstring for is_stale
+
+    :param path: Path of the compiled file.
+
+    Returns True if the compiled file does not exist, or if any CSV file it was compiled from has been modified after it.
+    """
+    if not os.path.exists(path):
+        return True
+    compiled_time = os.path.getmtime(path)
+    for folder in SOURCE_FOLDERS:
+        for entry in os.scandir(folder):
+            if entry.name.endswith(".csv") and entry.stat().st_mtime > compiled_time:
+                return True
+    return False
+
+class EncounterTables:
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Docstring for __init__
+
+        :param self: EncounterTables object.
+        :param path: Path of the compiled file written by write_tables().
+
+        The file is memory-mapped read-only, so the row arrays are never copied out of the page cache.
+        Every process that maps the same file shares those pages.
+
+        identifiers is a list of Strings, indexed by identifier ID.
+        areas is a dictionary with the format: K: standardized area name, V: tuple of (row count, rows offset, biome multipliers dictionary).
+        """
+        with open(path, "rb") as f1:
+            self.buffer = mmap.mmap(f1.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, identifier_count, area_count = struct.unpack_from("<4sIII", self.buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a compiled encounter table of format version {FORMAT_VERSION}.")
+
+        offset = struct.calcsize("<4sIII")
+        self.identifiers = []
+        for x in range(identifier_count):
+            identifier, offset = _unpack_string(self.buffer, offset)
+            self.identifiers.append(identifier)
+
+        self.areas = {}
+        for x in range(area_count):
+            name, offset = _unpack_string(self.buffer, offset)
+            count, rows_offset, biome_count = struct.unpack_from("<IIH", self.buffer, offset)
+            offset += struct.calcsize("<IIH")
+            biome_multipliers = {}
+            for y in range(biome_count):
+                biome, offset = _unpack_string(self.buffer, offset)
+                biome_multipliers[biome], = struct.unpack_from("<d", self.buffer, offset)
+                offset += 8
+            self.areas[name] = (count, rows_offset, biome_multipliers)
+
+    def rows(self, area_name):
+        """
+        Docstring for rows
+
+        :param self: EncounterTables object.
+        :param area_name: String object that is the standardized area name, such as "Alfornada Cavern".
+        :return: Tuple of (identifier IDs, type bitmasks, weights) as memoryviews into the mapped file. weights holds 4 * rows values, one block per daypart in DAYPARTS order.
+        """
+        count, offset, biome_multipliers = self.areas[area_name]
+        view = memoryview(self.buffer)
+        ids = view[offset:offset + 4*count].cast("I")
+        masks = view[offset + 4*count:offset + 8*count].cast("I")
+        weights = view[offset + 8*count:offset + 40*count].cast("d")
+        return ids, masks, weights
@@ -1,9 +1,17 @@
 # Requires use of OpenCV and NumPy
 # Installed with bash command: pip install opencv-python numpy
 
+import struct
+import zlib
 import cv2
 import numpy as np
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Images with more pixels than this are counted in bands by count_colour_pixels_many(), instead of being decoded whole, see count_colour_pixels_streaming().
+STREAMING_PIXELS = 16 * 1024 * 1024
+# Default most bytes of filtered scanlines held at once by count_colour_pixels_streaming().
+BAND_BYTES = 1024 * 1024
+
 def count_colour_pixels(image_path, target_colour_rgb):
     """
     Docstring for count_colour_pixels
@@ -31,3 +39,230 @@ def count_colour_pixels(image_path, target_colour_rgb):
     # Therefore, should be counting non-zero pixels.
     count = cv2.countNonZero(mask)
     return count
+
+
+def colour_bounds(target_colour_rgb, tolerance=5):
+    """
+    Docstring for colour_bounds
+    
+    :param target_colour_rgb: The target colour as an RGB tuple (R,G,B)
+    :param tolerance: Integer object, how far each channel may be from the target colour.
+    :return: Tuple of the lower and upper bounds in BGR order, the same bounds as count_colour_pixels().
+    """
+    target_colour_bgr = (target_colour_rgb[2], target_colour_rgb[1], target_colour_rgb[0])
+    lower_bound_bgr = np.array([channel - tolerance for channel in target_colour_bgr])
+    upper_bound_bgr = np.array([channel + tolerance for channel in target_colour_bgr])
+    return lower_bound_bgr, upper_bound_bgr
+
+def colour_mask(img_bgr, target_colour_rgb):
+    """
+    Docstring for colour_mask
+    
+    :param img_bgr: Image in BGR order, as returned by cv2.imread().
+    :param target_colour_rgb: The target colour as an RGB tuple (R,G,B)
+    :return: Boolean NumPy array of the image's height and width, True for pixels counted by count_colour_pixels().
+    """
+    lower_bound_bgr, upper_bound_bgr = colour_bounds(target_colour_rgb)
+    return cv2.inRange(img_bgr, lower_bound_bgr, upper_bound_bgr) > 0
+
+def content_box(img_bgr, background_level=20):
+    """
+    Docstring for content_box
+    
+    :param img_bgr: Image in BGR order, as returned by cv2.imread().
+    :param background_level: Integer object; pixels with every channel at or below it are background (the black around a map).
+    :return: Tuple of (x, y, width, height) of the smallest rectangle holding every pixel that is not background, or None if every pixel is background.
+    """
+    rows, columns = np.nonzero(img_bgr.max(axis=2) > background_level)
+    if len(rows) == 0:
+        return None
+    return int(columns.min()), int(rows.min()), int(columns.max() - columns.min() + 1), int(rows.max() - rows.min() + 1)
+
+def count_colour_pixels_batch(images, target_colour_rgb):
+    """
+    Docstring for count_colour_pixels_batch
+    
+    :param images: Images in BGR order, either a stacked uint8 NumPy array of shape (number of images, height, width, 3), or a list of (height, width, 3) arrays.
+    :param target_colour_rgb: The target colour as an RGB tuple (R,G,B)
+    :return: List of the count of pixels matching the target colour in every image, in order.
+
+    A stacked array is treated as one tall image, so a single mask is made for every image at once and then counted per image.
+    A list is counted one image at a time, so its images may have different sizes.
+    """
+    if isinstance(images, list):
+        return [count_colour_pixels_batch(img_bgr[None], target_colour_rgb)[0] for img_bgr in images]
+
+    count, height, width = images.shape[:3]
+    lower_bound_bgr, upper_bound_bgr = colour_bounds(target_colour_rgb)
+    mask = cv2.inRange(np.ascontiguousarray(images).reshape(count * height, width, 3), lower_bound_bgr, upper_bound_bgr)
+    return [int(pixels) for pixels in np.count_nonzero(mask.reshape(count, -1), axis=1)]
+
+def count_colour_pixels_many(image_paths, target_colour_rgb):
+    """
+    Docstring for count_colour_pixels_many
+    
+    :param image_paths: List of paths to image files.
+    :param target_colour_rgb: The target colour as an RGB tuple (R,G,B)
+    :return: List of the count of pixels matching the target colour in every image, in order; 0 for an image that could not be read.
+
+    Every image is decoded once. Images of the same size (such as every biome image of one area) are stacked and counted together, see count_colour_pixels_batch().
+    PNG images with more than STREAMING_PIXELS pixels are counted one band at a time instead, see count_colour_pixels_streaming().
+    """
+    counts = [0] * len(image_paths)
+    same_size = {} # K: (height, width), V: list of (index in image_paths, image)
+    for index, image_path in enumerate(image_paths):
+        # Very large images are never held whole in memory
+        header = read_png_header(image_path)
+        if header is not None and header[0] * header[1] > STREAMING_PIXELS:
+            counts[index] = count_colour_pixels_streaming(image_path, target_colour_rgb)
+            continue
+
+        img_bgr = cv2.imread(str(image_path))
+        if img_bgr is None:
+            print(f"Error: Could not open or find the image at {image_path}")
+            continue
+        same_size.setdefault(img_bgr.shape, []).append((index, img_bgr))
+
+    for images in same_size.values():
+        stacked = np.stack([img_bgr for index, img_bgr in images])
+        for (index, img_bgr), count in zip(images, count_colour_pixels_batch(stacked, target_colour_rgb)):
+            counts[index] = count
+    return counts
+
+def read_png_header(image_path):
+    """
+    Docstring for read_png_header
+    
+    :param image_path: Path to the image file.
+    :return: Tuple of (width, height, bit depth, colour type, interlace method) from the IHDR chunk, or None if the file is not a PNG file.
+
+    Only the first 33 bytes of the file are read.
+    """
+    try:
+        with open(image_path, "rb") as f1:
+            start = f1.read(33)
+    except OSError:
+        return None
+    if len(start) < 33 or start[:8] != PNG_SIGNATURE or start[12:16] != b"IHDR":
+        return None
+    width, height, bit_depth, colour_type, compression, filter_method, interlace = struct.unpack(">IIBBBBB", start[16:29])
+    return width, height, bit_depth, colour_type, interlace
+
+def png_chunk(chunk_type: bytes, body: bytes):
+    """
+    Docstring for png_chunk
+    
+    :param chunk_type: Bytes object of the 4 letter chunk type, such as b"IDAT".
+    :param body: Bytes object, the data of the chunk.
+    :return: Bytes object of the whole chunk: length, type, data, and CRC.
+    """
+    return struct.pack(">I", len(body)) + chunk_type + body + struct.pack(">I", zlib.crc32(chunk_type + body))
+
+def png_scanline_bands(f1, row_bytes: int, band_rows: int):
+    """
+    Docstring for png_scanline_bands
+    
+    :param f1: File object of a PNG file opened in binary mode, just after the IHDR chunk.
+    :param row_bytes: Integer object, the bytes in one filtered scanline, including its filter type byte.
+    :param band_rows: Integer object, the most scanlines in a band.
+
+    Yields Bytes objects of whole filtered scanlines, band_rows at a time (the last band may be shorter).
+    The IDAT chunks are read and decompressed in pieces, so no more than about one band of scanlines and one piece of the file are held at once.
+    Raises ValueError if a chunk is cut short or fails its CRC, or if the compressed data is invalid.
+    """
+    band_bytes = row_bytes * band_rows
+    decompressor = zlib.decompressobj()
+    pending = bytearray()
+    while True:
+        start = f1.read(8)
+        if len(start) < 8:
+            raise ValueError("PNG file ended before its IEND chunk.")
+        length, chunk_type = struct.unpack(">I4s", start)
+        if chunk_type == b"IEND":
+            break
+
+        crc = zlib.crc32(chunk_type)
+        remaining = length
+        while remaining > 0:
+            piece = f1.read(min(remaining, 1 << 20))
+            if len(piece) == 0:
+                raise ValueError("PNG chunk is cut short.")
+            remaining -= len(piece)
+            crc = zlib.crc32(piece, crc)
+            if chunk_type != b"IDAT":
+                continue
+
+            # Decompress at most one band at a time, keeping the rest of the piece for later
+            compressed = piece
+            while len(compressed) > 0:
+                pending += decompressor.decompress(compressed, band_bytes)
+                compressed = decompressor.unconsumed_tail
+                while len(pending) >= band_bytes:
+                    yield bytes(pending[:band_bytes])
+                    del pending[:band_bytes]
+        if struct.unpack(">I", f1.read(4))[0] != crc:
+            raise ValueError(f"PNG chunk {chunk_type.decode('latin-1')} failed its CRC.")
+
+    pending += decompressor.flush()
+    usable = len(pending) - len(pending) % row_bytes
+    if usable > 0:
+        yield bytes(pending[:usable])
+
+def count_colour_pixels_streaming(image_path, target_colour_rgb, band_bytes=BAND_BYTES):
+    """
+    Docstring for count_colour_pixels_streaming
+    
+    :param image_path: Path to the image file.
+    :param target_colour_rgb: The target colour as an RGB tuple (R,G,B)
+    :param band_bytes: Integer object, the most bytes of filtered scanlines decoded at once; at least one scanline is always decoded.
+    :return: The count of pixels matching the target colour, the same as count_colour_pixels().
+
+    Decodes and counts the image one band of rows at a time, so memory stays around ten times band_bytes (the copies made to decode a band) however large the image is.
+    Every band is decoded by OpenCV from a small PNG made of its scanlines, so pixels are decoded and masked exactly as count_colour_pixels() does.
+    Scanlines can be filtered against the row above them, so every band after the first starts with the last row of the band before it, stored unfiltered.
+
+    Only 8-bit RGB and RGBA images without interlacing can be read in bands; other images are counted with count_colour_pixels().
+    """
+    header = read_png_header(image_path)
+    if header is None or header[2] != 8 or header[3] not in (2, 6) or header[4] != 0:
+        return count_colour_pixels(image_path, target_colour_rgb)
+    width, height, bit_depth, colour_type, interlace = header
+    channels = 3 if colour_type == 2 else 4
+    row_bytes = width * channels + 1
+    band_rows = max(1, band_bytes // row_bytes)
+    lower_bound_bgr, upper_bound_bgr = colour_bounds(target_colour_rgb)
+    # OpenCV decodes to BGR(A), scanlines are stored as RGB(A)
+    to_rgb = [2, 1, 0] if channels == 3 else [2, 1, 0, 3]
+
+    count = 0
+    rows_read = 0
+    prior = None # Last row of the band before, as unfiltered RGB(A) bytes
+    try:
+        with open(image_path, "rb") as f1:
+            f1.seek(33) # Signature and IHDR chunk
+            for band in png_scanline_bands(f1, row_bytes, band_rows):
+                rows = len(band) // row_bytes
+                if prior is not None:
+                    band = b"\x00" + prior + band # Filter type 0 (None) for the copied row
+                band_height = rows + (prior is not None)
+                band_png = (PNG_SIGNATURE
+                            + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, band_height, 8, colour_type, 0, 0, 0))
+                            + png_chunk(b"IDAT", zlib.compress(band, 0))
+                            + png_chunk(b"IEND", b""))
+                img = cv2.imdecode(np.frombuffer(band_png, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+                if img is None:
+                    raise ValueError("A band could not be decoded.")
+                if prior is not None:
+                    img = img[1:]
+
+                # Alpha is dropped, the same as cv2.imread() without flags
+                mask = cv2.inRange(np.ascontiguousarray(img[:, :, :3]), lower_bound_bgr, upper_bound_bgr)
+                count += cv2.countNonZero(mask)
+                prior = img[-1][:, to_rgb].tobytes()
+                rows_read += rows
+                if rows_read >= height:
+                    break
+    except (OSError, ValueError, zlib.error) as e:
+        print(f"Error: Could not open or find the image at {image_path} ({e})")
+        return 0
+    return count
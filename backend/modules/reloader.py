@@ -0,0 +1,122 @@
+import asyncio
+import os
+import traceback
+from models.snapshot import Snapshot
+from modules import encounter_tables as et
+
+# Every folder a Snapshot is loaded from; a change to any file in them is a change to the data.
+WATCHED_FOLDERS = et.SOURCE_FOLDERS + ["data/pokedex", "data/spatial", os.path.dirname(et.DEFAULT_PATH)]
+
+class Reloader:
+    def __init__(self, version: int, folders=None, interval=5.0):
+        """
+        Docstring for __init__
+
+        :param self: Reloader object.
+        :param version: Integer object, the version of the Snapshot being served. Every reload makes a Snapshot with the next version.
+        :param folders: List of folders to watch. If None, WATCHED_FOLDERS.
+        :param interval: Float object, the number of seconds between checks of the folders, see watch().
+
+        Loads a new Snapshot when the data files change, so a fix to the data can be served without restarting the server.
+        The files are checked by polling their sizes and modification times, which works on every platform without a file-watching library.
+        A new Snapshot is only loaded once the files have stopped changing for one interval, so a file that is still being written is not read.
+
+        The new Snapshot is loaded while the old one is still being served, and is then given to on_swap (see watch()) to replace it.
+        Nothing is changed if the new Snapshot cannot be loaded, such as when a CSV file has a mistake.
+        """
+        self.version = version
+        self.folders = folders if folders is not None else WATCHED_FOLDERS
+        self.interval = interval
+        self.loaded = Reloader.fingerprint(self.folders) # Files the served Snapshot was loaded from
+        self.seen = self.loaded # Files found by the last check
+        self.lock = asyncio.Lock()
+
+    def fingerprint(folders):
+        """
+        Docstring for fingerprint
+
+        :param folders: List of folders.
+
+        Returns a tuple of (path, size, modification time) of every file in the folders, which changes whenever a file is written, added, or removed.
+        Folders that do not exist are left out.
+        """
+        files = []
+        for folder in folders:
+            if not os.path.isdir(folder):
+                continue
+            for entry in os.scandir(folder):
+                if entry.is_file():
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        return tuple(sorted(files))
+
+    def changed(self):
+        """
+        Docstring for changed
+
+        :param self: Reloader object.
+
+        Checks the folders, and returns True if the files are different from the ones the served Snapshot was loaded from,
+        and are the same as at the last check (so they are no longer being written).
+        """
+        current = Reloader.fingerprint(self.folders)
+        stable = current == self.seen
+        self.seen = current
+        return stable and current != self.loaded
+
+    def build(self):
+        """
+        Docstring for build
+
+        :param self: Reloader object.
+
+        Loads and returns a Snapshot of the data files with the next version, or None if it could not be loaded.
+        The Snapshot is not used until it is given to on_swap, so it can be loaded in another thread while the server answers requests.
+        """
+        fingerprint = Reloader.fingerprint(self.folders)
+        try:
+            snapshot = Snapshot(self.version + 1)
+        except Exception:
+            traceback.print_exc()
+            print(f"Could not reload the data, still serving snapshot version {self.version}")
+            self.loaded = fingerprint # Not tried again until the files change again
+            return None
+        if len(snapshot.alphabetical) == 0:
+            print(f"Reloaded data has no areas, still serving snapshot version {self.version}")
+            self.loaded = fingerprint
+            return None
+        self.version = snapshot.version
+        self.loaded = fingerprint
+        return snapshot
+
+    async def reload(self, on_swap):
+        """
+        Docstring for reload
+
+        :param self: Reloader object.
+        :param on_swap: Function that takes the new Snapshot, and replaces the served one with it.
+
+        Loads a new Snapshot in another thread, so requests are still answered from the old one while it loads, then calls on_swap.
+        Returns True if the Snapshot was replaced. Reloads that are asked for while one is running wait for it, so they do not load at the same time.
+        """
+        async with self.lock:
+            snapshot = await asyncio.to_thread(self.build)
+            if snapshot is None:
+                return False
+            on_swap(snapshot)
+            print(f"Reloaded the data as snapshot version {snapshot.version}")
+            return True
+
+    async def watch(self, on_swap):
+        """
+        Docstring for watch
+
+        :param self: Reloader object.
+        :param on_swap: Function that takes the new Snapshot, see reload().
+
+        Checks the folders every interval seconds until cancelled, and reloads when changed() is True.
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.changed():
+                await self.reload(on_swap)
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+class ResponseCache:
+    def __init__(self, max_size=1024, ttl=600.0, version=None):
+        """
+        Docstring for __init__
+
+        :param self: ResponseCache object.
+        :param max_size: Integer object, the most responses kept before the least recently used one is evicted.
+        :param ttl: Float object, the number of seconds a response is kept before it expires.
+        :param version: Version of the data snapshot the responses were calculated from, see check_version().
+
+        Holds responses keyed by a hash of their normalized request, so that a repeated request does not have to be recalculated.
+        hits, misses, evictions (dropped for size), and expirations (dropped for age) are counted for stats().
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.version = version
+        self.responses = OrderedDict() # K: request hash, V: tuple of (time stored, response)
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def key(*parameters):
+        """
+        Docstring for key
+
+        :param parameters: JSON serializable values that describe a request; they should already be normalized.
+
+        Returns a SHA-256 hex digest of the parameters, the same for every request with the same normalized parameters.
+        """
+        return hashlib.sha256(json.dumps(parameters, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+    def check_version(self, version):
+        """
+        Docstring for check_version
+
+        :param self: ResponseCache object.
+        :param version: Version of the data snapshot currently being served.
+
+        If the version has changed, every response was calculated from old data, so the cache is cleared.
+        """
+        with self.lock:
+            if version != self.version:
+                self.responses.clear()
+                self.version = version
+
+    def get(self, key):
+        """
+        Docstring for get
+
+        :param self: ResponseCache object.
+        :param key: String object made by ResponseCache.key().
+
+        Returns the stored response, or None if there is none or it has expired.
+        """
+        with self.lock:
+            if key in self.responses:
+                stored_time, response = self.responses[key]
+                if time.monotonic() - stored_time <= self.ttl:
+                    self.responses.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self.responses[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, response):
+        """
+        Docstring for put
+
+        :param self: ResponseCache object.
+        :param key: String object made by ResponseCache.key().
+        :param response: Object to return for later requests with the same key. It must not be modified after it is stored.
+        """
+        with self.lock:
+            self.responses[key] = (time.monotonic(), response)
+            self.responses.move_to_end(key)
+            while len(self.responses) > self.max_size:
+                self.responses.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        """
+        Docstring for stats
+
+        :param self: ResponseCache object.
+
+        Returns a dictionary of the cache size, limits, and counters.
+        """
+        with self.lock:
+            return {"size": len(self.responses), "max_size": self.max_size, "ttl": self.ttl, "hits": self.hits, "misses": self.misses, "evictions": self.evictions, "expirations": self.expirations}
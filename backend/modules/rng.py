@@ -0,0 +1,46 @@
+import secrets
+import numpy as np
+
+# Every draw reads its random values from one block of the Philox counter, which holds this many values, see draws().
+BLOCK_SIZE = 4
+# Seeds are kept below 2**53 so they stay exact as JavaScript numbers when they are sent back in a response.
+MAX_SEED = 2 ** 53
+
+def new_seed():
+    """
+    Docstring for new_seed
+
+    Returns a random Integer seed from 0 to MAX_SEED - 1, for requests that did not send one.
+    It comes from the operating system, so it does not depend on (or change) any random state of the process.
+    """
+    return secrets.randbelow(MAX_SEED)
+
+def stream(seed: int, start=0):
+    """
+    Docstring for stream
+
+    :param seed: Integer object from 0 to MAX_SEED - 1.
+    :param start: Integer object, the index of the first draw.
+
+    Returns a new NumPy Generator that belongs to a single request, so requests never share (or lock) a random state.
+    Philox is counter-based: the values of draw i are block i of the counter for the seed, so any draw can be reached
+    directly by advancing the counter, without generating the draws before it.
+    """
+    rng = np.random.Generator(np.random.Philox(key=seed))
+    if start > 0:
+        rng.bit_generator.advance(start)
+    return rng
+
+def draws(seed: int, start: int, n: int):
+    """
+    Docstring for draws
+
+    :param seed: Integer object from 0 to MAX_SEED - 1.
+    :param start: Integer object, the index of the first draw.
+    :param n: Integer object, the number of draws.
+
+    Returns an n x BLOCK_SIZE NumPy array of floats in [0, 1); row i holds the values of draw start + i.
+    Every draw has its own row whether or not all of its values are used, so draw i is the same for any start and n that include it:
+    the first 5 draws of a batch of 10 are a batch of 5, and draw 7 alone is draws(seed, 7, 1).
+    """
+    return stream(seed, start).random((n, BLOCK_SIZE))
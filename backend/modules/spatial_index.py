@@ -0,0 +1,165 @@
+import os
+import numpy as np
+
+class SpatialIndex:
+    def __init__(self, biomes, width: int, height: int, row_offsets, run_biome, run_start, run_end):
+        """
+        Docstring for __init__
+
+        :param self: SpatialIndex object.
+        :param biomes: List of Strings, the biome names.
+        :param width: Integer object, the width of the area's map in pixels.
+        :param height: Integer object, the height of the area's map in pixels.
+        :param row_offsets: NumPy array of height + 1 Integers; the runs of row y are run_* [row_offsets[y]:row_offsets[y + 1]].
+        :param run_biome: NumPy array, the index in biomes of every run.
+        :param run_start: NumPy array, the first column of every run.
+        :param run_end: NumPy array, the column after the last column of every run.
+
+        Holds where every biome of an area is, as run-length encoded rows: a run is a horizontal line of pixels of one biome.
+        Runs are sorted by row, so the runs of any range of rows are one slice of the arrays, and a query only reads the runs of the rows it covers.
+        Biomes can overlap, since a pixel of the map can be marked in more than one biome image.
+
+        See from_masks() to build one, and load() to read one written by save().
+        """
+        self.biomes = list(biomes)
+        self.width = width
+        self.height = height
+        self.row_offsets = np.asarray(row_offsets, dtype=np.int64)
+        self.run_biome = np.asarray(run_biome, dtype=np.intp)
+        self.run_start = np.asarray(run_start, dtype=np.int64)
+        self.run_end = np.asarray(run_end, dtype=np.int64)
+        self.run_row = np.repeat(np.arange(height, dtype=np.int64), np.diff(self.row_offsets))
+
+    def from_masks(masks: dict):
+        """
+        Docstring for from_masks
+
+        :param masks: Dictionary of K: biome name, V: boolean NumPy array of shape (height, width), True where the biome is. Every mask must have the same shape.
+
+        Returns a SpatialIndex of the masks.
+        """
+        biomes = list(masks)
+        height, width = masks[biomes[0]].shape if biomes else (0, 0)
+        rows, starts, ends, biome_ids = [], [], [], []
+        for biome_id, biome in enumerate(biomes):
+            # A run starts where a row goes from False to True, and ends where it goes back; np.nonzero lists both in the same order.
+            padded = np.zeros((height, width + 2), dtype=np.int8)
+            padded[:, 1:-1] = masks[biome]
+            edges = np.diff(padded, axis=1)
+            run_rows, run_starts = np.nonzero(edges == 1)
+            end_rows, run_ends = np.nonzero(edges == -1)
+            rows.append(run_rows)
+            starts.append(run_starts)
+            ends.append(run_ends)
+            biome_ids.append(np.full(len(run_rows), biome_id))
+
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.intp)
+        starts = np.concatenate(starts) if starts else np.zeros(0, dtype=np.intp)
+        ends = np.concatenate(ends) if ends else np.zeros(0, dtype=np.intp)
+        biome_ids = np.concatenate(biome_ids) if biome_ids else np.zeros(0, dtype=np.intp)
+        order = np.lexsort((starts, biome_ids, rows))
+        row_offsets = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=height))])
+        return SpatialIndex(biomes, width, height, row_offsets, biome_ids[order], starts[order], ends[order])
+
+    def save(self, path):
+        """
+        Docstring for save
+
+        :param self: SpatialIndex object.
+        :param path: Path of the file to write, ending in ".npz".
+
+        Writes the index as a compressed NumPy archive, with the smallest Integer types that hold its values.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        column_type = np.uint16 if self.width < 2 ** 16 else np.uint32
+        np.savez_compressed(
+            path,
+            biomes=np.array(self.biomes, dtype=str),
+            size=np.array([self.width, self.height], dtype=np.uint32),
+            row_offsets=self.row_offsets.astype(np.uint32),
+            run_biome=self.run_biome.astype(np.uint8),
+            run_start=self.run_start.astype(column_type),
+            run_end=self.run_end.astype(column_type),
+        )
+
+    def load(path):
+        """
+        Docstring for load
+
+        :param path: Path of a file written by save().
+
+        Returns the SpatialIndex in the file.
+        """
+        with np.load(path, allow_pickle=False) as archive:
+            width, height = (int(value) for value in archive["size"])
+            return SpatialIndex([str(biome) for biome in archive["biomes"]], width, height, archive["row_offsets"], archive["run_biome"], archive["run_start"], archive["run_end"])
+
+    def count_rows(self, first_row: int, lows, highs):
+        """
+        Docstring for count_rows
+
+        :param self: SpatialIndex object.
+        :param first_row: Integer object, the first row counted.
+        :param lows: NumPy array of Integers, the first column counted in every row from first_row.
+        :param highs: NumPy array of Integers, the column after the last column counted in every row from first_row.
+
+        Returns a NumPy array with the number of pixels of every biome within the columns of every row.
+        """
+        start = self.row_offsets[first_row]
+        end = self.row_offsets[first_row + len(lows)]
+        rows = self.run_row[start:end] - first_row
+        overlap = np.minimum(self.run_end[start:end], highs[rows]) - np.maximum(self.run_start[start:end], lows[rows])
+        return np.bincount(self.run_biome[start:end], weights=np.maximum(overlap, 0), minlength=len(self.biomes)).astype(np.int64)
+
+    def rectangle(self, x0: int, y0: int, x1: int, y1: int):
+        """
+        Docstring for rectangle
+
+        :param self: SpatialIndex object.
+        :param x0: Integer object, the left column.
+        :param y0: Integer object, the top row.
+        :param x1: Integer object, the right column (included).
+        :param y1: Integer object, the bottom row (included).
+
+        Returns a NumPy array with the number of pixels of every biome within the rectangle. Parts of the rectangle outside the map are ignored.
+        """
+        x0, x1 = max(min(x0, x1), 0), min(max(x0, x1), self.width - 1)
+        y0, y1 = max(min(y0, y1), 0), min(max(y0, y1), self.height - 1)
+        if x0 > x1 or y0 > y1:
+            return np.zeros(len(self.biomes), dtype=np.int64)
+        rows = y1 - y0 + 1
+        return self.count_rows(y0, np.full(rows, x0), np.full(rows, x1 + 1))
+
+    def circle(self, x: int, y: int, radius: int):
+        """
+        Docstring for circle
+
+        :param self: SpatialIndex object.
+        :param x: Integer object, the column of the centre.
+        :param y: Integer object, the row of the centre.
+        :param radius: Integer object, the radius in pixels.
+
+        Returns a NumPy array with the number of pixels of every biome whose centre is within radius of (x, y). Parts of the circle outside the map are ignored.
+        """
+        # A circle wider than the map covers the same pixels as one as wide as it, and keeps the squares below within int64
+        radius = min(radius, self.width + self.height)
+        y0, y1 = max(y - radius, 0), min(y + radius, self.height - 1)
+        if y0 > y1 or x + radius < 0 or x - radius >= self.width:
+            return np.zeros(len(self.biomes), dtype=np.int64)
+        # Half the width of the circle in every row
+        offsets = np.arange(y0, y1 + 1) - y
+        half = np.floor(np.sqrt(radius * radius - offsets * offsets)).astype(np.int64)
+        return self.count_rows(y0, x - half, x + half + 1)
+
+    def weights(self, counts):
+        """
+        Docstring for weights
+
+        :param self: SpatialIndex object.
+        :param counts: NumPy array returned by rectangle() or circle().
+
+        Returns a list of tuples of (biome name, pixels, weight) for every biome with pixels, where weight is its share of every counted pixel,
+        the same as the percentages written by biome_distribution.py for a whole area.
+        """
+        total = int(counts.sum())
+        return [(biome, int(pixels), int(pixels) / total) for biome, pixels in zip(self.biomes, counts) if pixels > 0]
@@ -0,0 +1,60 @@
+class SubstringIndex:
+    def __init__(self, names, gram_length=3):
+        """
+        Docstring for __init__
+
+        :param self: SubstringIndex object.
+        :param names: Iterable of Strings to search, such as Pokemon names. Their order is kept for results that rank the same.
+        :param gram_length: Integer object, the longest n-gram that is indexed.
+
+        For every n-gram of length 1 to gram_length (such as "p", "pi", "pik"), the index stores the set of names that contain it (postings).
+        A query only has to check the names in the intersection of the postings of its own n-grams, instead of every name.
+        Matching is case-insensitive.
+        """
+        self.names = list(names)
+        self.lowered = [name.strip().lower() for name in self.names]
+        self.gram_length = gram_length
+        self.postings = {}
+
+        for index, name in enumerate(self.lowered):
+            for length in range(1, gram_length + 1):
+                for start in range(len(name) - length + 1):
+                    self.postings.setdefault(name[start:start+length], set()).add(index)
+
+    def search(self, query: str, limit=None):
+        """
+        Docstring for search
+
+        :param self: SubstringIndex object.
+        :param query: String object to search for; its case and surrounding whitespace are ignored.
+        :param limit: Integer object, the most names to return. If None, every match is returned.
+
+        Returns the names that contain query, ranked as:
+        1) Names that start with query, such as "Pikachu" for "pik"
+        2) Names where a later word starts with query, such as "Tauros (Blaze Breed)" for "bla"
+        3) Every other name that contains query
+        Names that rank the same are kept in their original order.
+        """
+        query = query.strip().lower()
+        if query == "":
+            matches = list(range(len(self.names)))
+        else:
+            length = min(len(query), self.gram_length)
+            grams = {query[start:start+length] for start in range(len(query) - length + 1)}
+            postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+            candidates = set.intersection(*postings) if postings else set()
+            # n-grams can appear in a different order in a name than in query, so every candidate is checked.
+            matches = [index for index in candidates if query in self.lowered[index]]
+
+        def rank(index):
+            name = self.lowered[index]
+            if name.startswith(query):
+                return (0, index)
+            if any(word.strip("(").startswith(query) for word in name.split(" ")):
+                return (1, index)
+            return (2, index)
+
+        matches.sort(key=rank)
+        if limit is not None:
+            matches = matches[:limit]
+        return [self.names[index] for index in matches]
@@ -0,0 +1,278 @@
+import asyncio
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from models.box import Box
+from models.game import Game
+from models.route import Route
+from models.simulator import Simulator
+from models.snapshot import Snapshot
+
+# The Snapshot of a worker process, see preload() and initialize().
+_snapshot = None
+# Simulator objects of a worker process, reused by simulate_chunk() for every chunk of the same simulation.
+_simulators = {}
+# Pokedex hits and misses of a worker process already sent to the server, see counted().
+_reported = [0, 0]
+
+class PoolFull(Exception):
+    """
+    Raised by WorkerPool.run() when every worker is busy and the queue is full, so the request should be retried later.
+    """
+
+def preload(snapshot: Snapshot):
+    """
+    Docstring for preload
+
+    :param snapshot: Snapshot object already loaded by the server.
+
+    Where worker processes are forked, they start with this Snapshot already in memory (copy-on-write) instead of loading their own.
+    """
+    global _snapshot
+    _snapshot = snapshot
+
+def initialize():
+    """
+    Docstring for initialize
+
+    Runs once in every worker process. Workers that were not forked from a preloaded server (such as on Windows) load their own Snapshot.
+    Generation uses a Generator per request (see modules/rng.py), but forked workers also inherit the server's random module state,
+    so it is reseeded for anything that still uses it.
+    """
+    global _snapshot
+    random.seed()
+    if _snapshot is None:
+        _snapshot = Snapshot()
+    # Lookups made before the fork were counted by the server itself
+    _reported[:] = [_snapshot.pokedex.hits, _snapshot.pokedex.misses]
+
+def counted(function, *args):
+    """
+    Docstring for counted
+
+    :param function: Function defined at module level, such as process_request().
+    :param args: Arguments for function.
+
+    Runs in a worker process, and returns a tuple of (result of function, tuple of (Pokedex hits, Pokedex misses) since the last call).
+    Lookups counted in a worker process are not seen by the server, so WorkerPool.run() adds them up, see WorkerPool.stats().
+    """
+    result = function(*args)
+    pokedex = _snapshot.pokedex
+    lookups = (pokedex.hits - _reported[0], pokedex.misses - _reported[1])
+    _reported[:] = [pokedex.hits, pokedex.misses]
+    return result, lookups
+
+def process_request(game: str, request_type: str, global_text: str, area: str, daypart: str, pkmn_type: str, encounter_power_level: int, dupes_clause_enabled_str: str, specific_pkmn_set_enabled: bool, n=1, seed=None, box_state=None, start=0):
+    """
+    Docstring for process_request
+
+    :param game: String object representing game version, "Scarlet" or "Violet".
+    :param box_state: Tuple of (list of Pokemon names, dupes bitset, family_counts) of a Box, see Box.load_state(), or None if global_text should be parsed instead.
+
+    The other parameters are the same as Game.process_generate_distribution_request().
+    Runs in a worker process, and returns the same value as Game.process_generate_distribution_request().
+    """
+    box = None
+    if box_state is not None:
+        box = Box(_snapshot.pokedex)
+        box.load_state(*box_state)
+    g = Game(game, _snapshot)
+    return g.process_generate_distribution_request(request_type, global_text, area, daypart, pkmn_type, encounter_power_level, dupes_clause_enabled_str, specific_pkmn_set_enabled, False, n, seed, box, start)
+
+def versioned(function, *args):
+    """
+    Docstring for versioned
+
+    :param function: Function defined at module level, such as process_request().
+    :param args: Arguments for function.
+
+    Runs in a worker process, and returns a tuple of (version of the worker's Snapshot, result of function),
+    so a response can report the version of the data it was calculated from, even while the data is being reloaded.
+    """
+    return _snapshot.version, function(*args)
+
+def simulate_chunk(game: str, daypart: str, check_dupes: bool, box_dupes: int, runs: int, seed, version=None):
+    """
+    Docstring for simulate_chunk
+
+    :param runs: Integer object, the number of runs in this chunk.
+    :param seed: SeedSequence object (or Integer) for this chunk, so every chunk draws different random values.
+    :param version: Integer object, the version of the Snapshot the simulation started with. If None, any version is used.
+
+    The other parameters are the same as Simulator.__init__().
+    Runs in a worker process, and returns the counters of Simulator.simulate(), which can be added together with Simulator.merge().
+    Returns None instead if the worker has a different version of the Snapshot, since its counters could not be added to the others.
+    """
+    if version is not None and _snapshot.version != version:
+        return None
+    key = (game, daypart, check_dupes, box_dupes)
+    if key not in _simulators:
+        if len(_simulators) >= 32:
+            _simulators.clear()
+        _simulators[key] = Simulator(_snapshot, game, daypart, check_dupes, box_dupes)
+    return _simulators[key].simulate(runs, seed)
+
+def route_probabilities(game: str, daypart: str, area_names: list, box_dupes: int, min_probability: float, max_states: int):
+    """
+    Docstring for route_probabilities
+
+    The parameters are the same as Route.__init__() and Route.probabilities().
+    Runs in a worker process, and returns the dictionary of Route.probabilities().
+    """
+    return Route(_snapshot, game, daypart, area_names).probabilities(box_dupes, min_probability, max_states)
+
+class WorkerPool:
+    def __init__(self, max_workers=None, max_queue=None):
+        """
+        Docstring for __init__
+
+        :param self: WorkerPool object.
+        :param max_workers: Integer object, the number of worker processes. If None, one per CPU core.
+        :param max_queue: Integer object, the most requests waiting for a worker. If None, two per worker.
+
+        Runs the CPU-bound Game and Area work in worker processes, so an async server is not blocked by it and is not limited by the GIL.
+        The processes are started the first time a request is run.
+
+        Requests beyond max_workers + max_queue are rejected with PoolFull instead of waiting, so a burst of requests cannot build an unbounded backlog.
+        """
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.max_queue = max_queue if max_queue is not None else 2 * self.max_workers
+        self.executor = None
+        self.in_flight = 0
+        self.rejected = 0
+        self.pokedex_hits = 0 # Pokedex lookups counted by the worker processes, see counted()
+        self.pokedex_misses = 0
+
+    def start(self):
+        """
+        Docstring for start
+
+        :param self: WorkerPool object.
+
+        Starts the worker processes. They are forked where possible, so they share the Snapshot given to preload().
+        The executor only forks its processes when it is first given work, so an empty task is sent to fork them now instead of on the next request.
+        """
+        if self.executor is None:
+            context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context, initializer=initialize)
+            self.executor.submit(os.getpid)
+
+    def shutdown(self):
+        """
+        Docstring for shutdown
+
+        :param self: WorkerPool object.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def restart(self):
+        """
+        Docstring for restart
+
+        :param self: WorkerPool object.
+
+        Replaces the worker processes with new ones, forked with the Snapshot last given to preload(), such as after the data is reloaded.
+        Requests already sent to the old workers still finish there with the old Snapshot, and the old workers exit once they are done.
+        The new workers are forked at once with the new Snapshot already in memory, so the next request does not wait for them.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+            self.start()
+
+    async def run(self, function, *args):
+        """
+        Docstring for run
+
+        :param self: WorkerPool object.
+        :param function: Function defined at module level (so it can be sent to a worker), such as process_request().
+        :param args: Arguments for function.
+
+        Returns the result of function once a worker has run it. Raises PoolFull if too many requests are already running or waiting.
+        Raises BrokenProcessPool if the worker process died, see execute().
+        """
+        if not self.accepting():
+            self.rejected += 1
+            raise PoolFull()
+
+        self.in_flight += 1
+        try:
+            return await self.execute(function, *args)
+        finally:
+            self.in_flight -= 1
+
+    def submit(self, function, *args):
+        """
+        Docstring for submit
+
+        :param self: WorkerPool object.
+        :param function: Function defined at module level, see run().
+        :param args: Arguments for function.
+
+        Returns an asyncio Task that runs function in a worker, or None if too many requests are already running or waiting.
+        The place of the Task is taken as soon as it is returned, so several Tasks made in a row cannot take more places than accepting() allowed.
+        The place is given back when the Task is done, even if it is cancelled before it starts.
+        """
+        if not self.accepting():
+            return None
+        self.in_flight += 1
+        task = asyncio.get_running_loop().create_task(self.execute(function, *args))
+        task.add_done_callback(self.release)
+        return task
+
+    def release(self, task):
+        """
+        Docstring for release
+
+        :param self: WorkerPool object.
+        :param task: asyncio Task made by submit() that is done.
+        """
+        self.in_flight -= 1
+
+    async def execute(self, function, *args):
+        """
+        Docstring for execute
+
+        :param self: WorkerPool object.
+        :param function: Function defined at module level, see run().
+        :param args: Arguments for function.
+
+        Returns the result of function once a worker has run it, without checking or taking a place; see run() and submit().
+        If a worker process dies (such as when it runs out of memory), the executor cannot be used again, so new workers are started for later requests.
+        """
+        self.start()
+        executor = self.executor
+        try:
+            result, (hits, misses) = await asyncio.get_running_loop().run_in_executor(executor, counted, function, *args)
+            self.pokedex_hits += hits
+            self.pokedex_misses += misses
+            return result
+        except BrokenProcessPool:
+            if self.executor is executor:
+                self.executor = None
+                self.start()
+            raise
+
+    def accepting(self):
+        """
+        Docstring for accepting
+
+        :param self: WorkerPool object.
+
+        Returns True if a request run now would be accepted, instead of being rejected with PoolFull.
+        """
+        return self.in_flight < self.max_workers + self.max_queue
+
+    def stats(self):
+        """
+        Docstring for stats
+
+        :param self: WorkerPool object.
+
+        Returns a dictionary of the pool limits and counters.
+        """
+        return {"max_workers": self.max_workers, "max_queue": self.max_queue, "in_flight": self.in_flight, "rejected": self.rejected}
@@ -0,0 +1,180 @@
+"""
+Production entry point that runs several server processes sharing one loaded Snapshot.
+
+The master process imports main.py (which loads the Snapshot), freezes every object it created, binds the listening socket,
+and then forks the worker processes. Forked workers share the master's memory pages copy-on-write, so the data is only loaded once.
+Objects moved to the permanent generation by gc.freeze() are never visited by the garbage collector,
+so workers do not write to (and copy) the pages holding the Snapshot just by collecting garbage.
+A worker that exits is replaced by a new fork of the master.
+
+The master also reloads the data when its files change (see modules/reloader.py), or when it is sent SIGHUP.
+It loads the new Snapshot itself, so it is still shared, then forks a new worker for every old one and tells the old one to stop.
+Old workers finish the requests they already have with the old Snapshot, while new requests go to the new workers; no request is refused.
+Boxes (see POST /box) are kept in one SQLite file that every worker uses, so a box ID works whichever worker answers, and boxes are kept when the data is reloaded.
+
+Run with python .\\serve.py
+SV_WORKERS sets the number of server processes (default: one per CPU core), SV_HOST and SV_PORT set the address (default: 0.0.0.0:8000).
+SV_RELOAD_INTERVAL sets the seconds between checks of the data files (default: 5, 0 turns checking off).
+SV_BOX_STORE sets the file the boxes are kept in (default: a file in the temporary folder, deleted when the master stops).
+Every server process also has its own worker pool, see main.py; by default it is sized so that the pools together use every core once.
+
+Where os.fork() is not available (Windows), a single server process is run instead.
+"""
+import gc
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+def run_worker(app, sock):
+    """
+    Docstring for run_worker
+
+    :param app: FastAPI object to serve.
+    :param sock: Socket object already bound by the master process.
+
+    Runs in a forked worker process until it is told to stop.
+    """
+    import uvicorn
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN) # Reloading is done by the master
+    config = uvicorn.Config(app, proxy_headers=True, forwarded_allow_ips="*")
+    uvicorn.Server(config).run(sockets=[sock])
+
+def spawn_worker(app, sock):
+    """
+    Docstring for spawn_worker
+
+    :param app: FastAPI object to serve.
+    :param sock: Socket object already bound by the master process.
+
+    Forks a worker process and returns its process ID.
+    """
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(app, sock)
+        finally:
+            os._exit(0)
+    return pid
+
+def reload_workers(server, sock, children: set):
+    """
+    Docstring for reload_workers
+
+    :param server: The main module, whose Snapshot is replaced.
+    :param sock: Socket object already bound by the master process.
+    :param children: Set of the process IDs of the workers; the old workers are replaced with the new ones in it.
+
+    Loads a new Snapshot, then replaces every worker with a new fork that has it.
+    Returns the set of process IDs of the old workers, which are stopping. If the Snapshot could not be loaded, nothing is changed and the set is empty.
+    """
+    new_snapshot = server.reloader.build()
+    if new_snapshot is None:
+        return set()
+    server.swap_snapshot(new_snapshot)
+    gc.collect()
+    gc.freeze()
+
+    retiring = set(children)
+    children.clear()
+    for pid in retiring:
+        # The new worker is started before the old one stops, so there is always a worker accepting requests
+        children.add(spawn_worker(server.app, sock))
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    print(f"Reloaded the data as snapshot version {new_snapshot.version}, replacing {len(retiring)} workers")
+    return retiring
+
+def main():
+    host = os.environ.get("SV_HOST", "0.0.0.0")
+    port = int(os.environ.get("SV_PORT", "8000"))
+    workers = int(os.environ.get("SV_WORKERS", os.cpu_count() or 1))
+    os.environ.setdefault("SV_POOL_WORKERS", str(max(1, (os.cpu_count() or 1) // workers)))
+    reload_interval = float(os.environ.get("SV_RELOAD_INTERVAL", "5"))
+    box_store = None # Made here, so it is deleted when the master stops
+    if hasattr(os, "fork") and "SV_BOX_STORE" not in os.environ:
+        box_store = os.path.join(tempfile.gettempdir(), f"sv_boxes_{os.getpid()}.sqlite3")
+        os.environ["SV_BOX_STORE"] = box_store
+    if hasattr(os, "fork"):
+        os.environ["SV_RELOAD_INTERVAL"] = "0" # Workers do not reload on their own, the master reloads for all of them
+
+    import main as server # Loads the Snapshot once, in the master process
+
+    if not hasattr(os, "fork"):
+        import uvicorn
+        uvicorn.run(server.app, host=host, port=port, proxy_headers=True, forwarded_allow_ips="*")
+        return
+
+    # Everything loaded so far is kept out of garbage collection, so it stays shared between the workers.
+    gc.collect()
+    gc.freeze()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    stopping = False
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    reload_requested = False
+    def request_reload(signum, frame):
+        nonlocal reload_requested
+        reload_requested = True
+
+    children = set()
+    retiring = set() # Old workers that were told to stop by reload_workers()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGHUP, request_reload)
+    for x in range(workers):
+        children.add(spawn_worker(server.app, sock))
+    print(f"Serving on {host}:{port} with {workers} workers (snapshot version {server.snapshot.version})")
+
+    # Replace any worker that exits, and reload the data when it changes, until the master is told to stop
+    next_check = time.monotonic() + reload_interval
+    while children or retiring:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        if pid == 0: # No worker has exited
+            time.sleep(0.2)
+            check_files = reload_interval > 0 and time.monotonic() >= next_check
+            if check_files:
+                next_check = time.monotonic() + reload_interval
+            if not stopping and (reload_requested or (check_files and server.reloader.changed())):
+                reload_requested = False
+                retiring |= reload_workers(server, sock, children)
+            continue
+        children.discard(pid)
+        if pid in retiring:
+            retiring.discard(pid)
+            continue
+        if not stopping:
+            print(f"Worker {pid} exited, starting a new one")
+            children.add(spawn_worker(server.app, sock))
+    sock.close()
+    if box_store is not None:
+        for file_path in [box_store, box_store + "-wal", box_store + "-shm"]:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Simulates many nuzlocke runs from the command line, and prints the statistics as the runs finish.
+See Simulator in models/simulator.py.
+
+Example: python .\\simulate.py Scarlet Day --runs 1000000 --dupes --box "Pikachu, Lechonk"
+"""
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from models.area import Area
+from models.box import Box
+from models.simulator import Simulator
+from models.snapshot import Snapshot
+from modules import rng as rng
+from modules import worker_pool as wp
+
+def print_summary(summary: dict, top: int):
+    print(f"Runs: {summary['runs']}")
+    print(f"Expected Types covered: {summary['expected_types']:.3f}, expected dupes skipped: {summary['expected_skips']:.3f}")
+    for pkmn_name, probability in summary["species"][:top]:
+        print(f"  {pkmn_name}: {probability * 100:.2f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate nuzlocke runs through every area in route order.")
+    parser.add_argument("game", help="Scarlet or Violet")
+    parser.add_argument("daypart", help="Dawn, Day, Dusk, or Night")
+    parser.add_argument("--runs", type=int, default=100000)
+    parser.add_argument("--dupes", action="store_true", help="Use the Dupes Clause")
+    parser.add_argument("--box", default="", help="Pokemon owned when every run starts, separated by \",\"")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the runs; if not given, a new one is chosen and printed")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=20000, help="Runs simulated by a process at once")
+    parser.add_argument("--top", type=int, default=20, help="Number of Pokemon to print")
+    args = parser.parse_args()
+
+    game = args.game.strip().lower().capitalize()
+    daypart = args.daypart.strip().title()
+    if game not in ["Scarlet", "Violet"] or not Area.validate_daypart(daypart):
+        parser.error("Invalid game or daypart.")
+
+    snapshot = Snapshot()
+    box_dupes = snapshot.pokedex.family_bitset(Box.parse(snapshot.pokedex, args.box))
+    simulator = Simulator(snapshot, game, daypart, args.dupes, box_dupes)
+    wp.preload(snapshot) # Forked processes start with this snapshot
+
+    chunk_runs = [args.chunk] * (args.runs // args.chunk)
+    if args.runs % args.chunk != 0:
+        chunk_runs.append(args.runs % args.chunk)
+    seed = args.seed if args.seed is not None else rng.new_seed()
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_runs))
+    update_every = max(1, len(chunk_runs) // 10)
+
+    context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    totals = simulator.new_totals()
+    with ProcessPoolExecutor(max_workers=args.processes, mp_context=context, initializer=wp.initialize) as executor:
+        futures = [executor.submit(wp.simulate_chunk, game, daypart, args.dupes, box_dupes, runs, seed) for runs, seed in zip(chunk_runs, seeds)]
+        for finished, future in enumerate(as_completed(futures), start=1):
+            Simulator.merge(totals, future.result())
+            if finished % update_every == 0 and finished < len(futures):
+                print(f"{totals['runs']} / {args.runs} runs")
+
+    summary = simulator.summary(totals)
+    print(f"Seed: {seed}")
+    print_summary(summary, args.top)
+    print("Areas (average dupes skipped, chance of no encounter):")
+    for area_name, skips, no_encounter in summary["areas"]:
+        print(f"  {area_name}: {skips:.3f}, {no_encounter * 100:.2f}%")